@@ -0,0 +1,259 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Indlæsning af lyde i baggrunden.
+
+Før blev punch.mp3 afkodet i main(), og menuen forsøgte at indlæse en
+skrifttype og to lyde der ikke findes og startede menumusikken, alt
+sammen før det første billede kunne vises. AssetLoader afkoder i stedet
+lydene på en baggrundstråd mens spillet allerede tegner. En lyd der ikke
+er færdig endnu (eller ikke findes) er bare None, og den spilles ikke.
+
+Den afkodede lyd (PCM i mixerens format) gemmes i CACHE_DIR, så næste
+start kan oprette lyden direkte fra de rå bytes i stedet for at afkode
+mp3 filen igen. Cachen gælder kun så længe kildefilen og mixerens format
+er de samme.
+
+Filer der ikke findes springes over uden undtagelser. Valgfrie filer
+(f.eks. menuens hover.wav og select.wav) giver heller ingen advarsel.
+"""
+import os
+import queue
+import struct
+import threading
+
+import pygame
+
+CACHE_DIR = "cache"
+CACHE_MAGIC = b"SSPC"
+CACHE_VERSION = 1
+
+# magic, version, frekvens, format, kanaler, kildens mtime (ns), kildens størrelse
+CACHE_HEADER = struct.Struct("<4sBihBqQ")
+
+
+def exists(path):
+    """
+    Returnerer om en asset fil findes (så den kan springes over uden undtagelser).
+
+    Parametre:
+        path: Sti til filen
+    """
+    return path is not None and os.path.isfile(path)
+
+
+def cache_path(path, cache_dir=CACHE_DIR):
+    """
+    Returnerer filnavnet hvor den afkodede lyd fra path gemmes.
+
+    Parametre:
+        path: Sti til lydfilen
+        cache_dir: Mappe med cachen
+    """
+    name = os.path.normpath(path).replace(os.sep, "_").replace(":", "_")
+    return os.path.join(cache_dir, name + ".pcm")
+
+
+def cache_header(path):
+    """
+    Returnerer cache-headeren for en lydfil med mixerens nuværende format.
+
+    Parametre:
+        path: Sti til lydfilen
+    """
+    frequency, size, channels = pygame.mixer.get_init()
+    info = os.stat(path)
+    return CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, frequency, size, channels,
+                             info.st_mtime_ns, info.st_size)
+
+
+def read_cached(path, cache_dir=CACHE_DIR):
+    """
+    Returnerer en lyd oprettet fra cachen (None hvis der ikke er en gyldig cache).
+
+    Parametre:
+        path: Sti til lydfilen
+        cache_dir: Mappe med cachen
+    """
+    try:
+        with open(cache_path(path, cache_dir), "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    if data[:CACHE_HEADER.size] != cache_header(path):
+        return None  # Kildefilen eller mixerens format er ændret
+    return pygame.mixer.Sound(buffer=data[CACHE_HEADER.size:])
+
+
+def write_cached(path, sound, cache_dir=CACHE_DIR):
+    """
+    Gemmer en afkodet lyd i cachen.
+
+    Parametre:
+        path: Sti til lydfilen
+        sound: Den afkodede lyd
+        cache_dir: Mappe med cachen
+    """
+    target = cache_path(path, cache_dir)
+    temporary = target + ".tmp"
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(temporary, "wb") as file:
+        file.write(cache_header(path))
+        file.write(sound.get_raw())
+    os.replace(temporary, target)  # En halvt skrevet cache bliver aldrig læst
+
+
+class AssetLoader:
+    """
+    Afkoder lyde på en baggrundstråd og holder dem klar til spillet.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        """
+        Parametre:
+            cache_dir: Mappe med de afkodede lyde (None for ingen cache)
+        """
+        self.cache_dir = cache_dir
+        self.sounds = {}  # navn -> pygame.mixer.Sound (når den er færdig)
+        self.missing = set()  # Navne på lyde der ikke findes eller ikke kunne indlæses
+        self.cached = set()  # Navne på lyde der blev oprettet fra cachen
+        self.jobs = queue.Queue()
+        self.thread = None
+        self.music_path = None
+        self.music_volume = 1.0
+        self.music_loaded = False
+        self.music_wanted = False  # Musikken skal spille så snart den er indlæst
+
+    def load_sound(self, name, path, volume=1.0, optional=False):
+        """
+        Sætter en lyd i kø til afkodning på baggrundstråden.
+
+        Parametre:
+            name: Navnet lyden hentes med
+            path: Sti til lydfilen
+            volume: Lydstyrke mellem 0 og 1
+            optional: Filen må mangle uden advarsel
+        """
+        if not exists(path):
+            self.missing.add(name)
+            if not optional:
+                print(f"Advarsel: {path} findes ikke")
+            return
+        self.jobs.put((name, path, volume))
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.work, name="assetloader", daemon=True)
+            self.thread.start()
+
+    def work(self):
+        """Baggrundstråden: afkoder lydene i køen én ad gangen"""
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self.jobs.task_done()
+                return  # close() er kaldt
+            name, path, volume = job
+            try:
+                self.sounds[name] = self.decode(name, path, volume)
+            except (pygame.error, OSError) as e:
+                self.missing.add(name)
+                print(f"Advarsel: Kunne ikke indlæse {path}: {e}")
+            finally:
+                self.jobs.task_done()
+
+    def decode(self, name, path, volume):
+        """
+        Returnerer lyden fra cachen, eller afkoder filen og gemmer den i cachen.
+
+        Parametre:
+            name: Lydens navn
+            path: Sti til lydfilen
+            volume: Lydstyrke mellem 0 og 1
+        """
+        sound = None
+        if self.cache_dir is not None:
+            sound = read_cached(path, self.cache_dir)
+        if sound is not None:
+            self.cached.add(name)
+        else:
+            sound = pygame.mixer.Sound(path)
+            if self.cache_dir is not None:
+                try:
+                    write_cached(path, sound, self.cache_dir)
+                except OSError as e:
+                    print(f"Advarsel: Kunne ikke gemme {path} i cachen: {e}")
+        sound.set_volume(volume)
+        return sound
+
+    def sound(self, name):
+        """
+        Returnerer lyden (None hvis den ikke er færdig eller ikke findes).
+
+        Parametre:
+            name: Lydens navn
+        """
+        return self.sounds.get(name)
+
+    def play(self, name):
+        """
+        Afspiller lyden hvis den er klar.
+
+        Parametre:
+            name: Lydens navn
+        """
+        sound = self.sounds.get(name)
+        if sound is not None:
+            sound.play()
+
+    def wait(self):
+        """Venter til alle lyde i køen er afkodet"""
+        self.jobs.join()
+
+    def close(self):
+        """Stopper baggrundstråden når lydene i køen er afkodet (uden at vente)"""
+        if self.thread is not None:
+            self.jobs.put(None)
+            self.thread = None
+
+    def set_music(self, path, volume=1.0):
+        """
+        Vælger baggrundsmusikken. Den indlæses først ved næste poll(), så
+        det ikke forsinker det første billede.
+
+        Parametre:
+            path: Sti til musikfilen
+            volume: Lydstyrke mellem 0 og 1
+        """
+        self.music_path = path if exists(path) else None
+        if self.music_path is None:
+            print(f"Advarsel: {path} findes ikke")
+        self.music_volume = volume
+        self.music_loaded = False
+
+    def play_music(self):
+        """Starter baggrundsmusikken forfra (når den er indlæst)"""
+        self.music_wanted = True
+        if self.music_loaded:
+            pygame.mixer.music.play(-1)  # -1 betyder uendelig gentagelse
+
+    def stop_music(self):
+        """Stopper baggrundsmusikken"""
+        self.music_wanted = False
+        if self.music_loaded:
+            pygame.mixer.music.stop()
+
+    def poll(self):
+        """
+        Kaldes én gang per billede i hovedtråden (efter det første billede er
+        vist). Indlæser musikken og starter den hvis den er ønsket.
+        """
+        if self.music_loaded or self.music_path is None:
+            return
+        try:
+            pygame.mixer.music.load(self.music_path)
+            pygame.mixer.music.set_volume(self.music_volume)
+        except pygame.error as e:
+            print(f"Advarsel: Kunne ikke indlæse {self.music_path}: {e}")
+            self.music_path = None
+            return
+        self.music_loaded = True
+        if self.music_wanted:
+            pygame.mixer.music.play(-1)
@@ -5,8 +5,13 @@ import pygame
 import random
 import math
 
+import numpy as np
+
 from constants import *
 
+import simulation
+import stages
+
 # landskab klasse
 
 
@@ -21,13 +26,15 @@ class Bane:
     - Tegne en rød port
     """
     
-    def __init__(self, width, height):
+    def __init__(self, width, height, rng=None, stage="classic"):
         """
         Initialiserer en ny bane med de givne dimensioner.
         
         Parametre:
             width (int): Skærmens bredde i pixels
             height (int): Skærmens højde i pixels
+            rng (random.Random): Kampens seedede tilfældighedsgenerator (valgfri)
+            stage (str): Banens platforme (se stages.STAGE_NAMES)
     
             """
         # Gem banens dimensioner som attributter
@@ -35,6 +42,8 @@ class Bane:
         self.width = width   # Gemmer skærmens bredde
     
         self.height = height # Gemmer skærmens højde
+
+        self.rng = rng if rng is not None else random.Random()  # Bruges til græs og partikler
         
         # Beregn platformens dimensioner og position
     
@@ -44,11 +53,19 @@ class Bane:
         platformY = height * 0.75  # Placerer platformen 75% nede på skærmen
 
 
+        # Simulationens platforme - én hovedplatform med 20 pixels højde på "classic"
+        self.stageName = stage
+        self.stage = stages.make_stage(stage, width, height)
+
         # Opret platform segmenter som rektangler
         self.platformSegments = [
     
-            pygame.Rect(platformX, platformY, platformBredde, 20)  # Hovedplatform med 20 pixels højde
+            pygame.Rect(p.x, p.y, p.width, p.height) for p in stages.static_platforms(self.stage)
         ]
+        self.movingPlatforms = stages.moving_platforms(self.stage)  # Flyttes af simulationen
+
+        # Sorteret x-interval indeks til isOnPlatform og getPlatformY
+        self.platformIndex = simulation.PlatformIndex(self.platformSegments)
 
 
         # Definer afgrunden under platformen
@@ -63,29 +80,218 @@ class Bane:
             {"x": self.width * 0.82, "health": 1.0}   # Højre træ placeret 82% inde fra venstre
         ]
 
+        # Cache til de statiske lag. Træerne ligger mellem himmel, afgrund og
+        # bjerge bag dem og torii-porten, terrænet og platformene foran dem
+        self.staticLayer = None  # Alle statiske lag bagt sammen (uden træer)
+        self.frontLayer = None  # Kun lagene foran træerne, gennemsigtig ellers
+        self.frontRect = None  # Området af frontLayer der ikke er gennemsigtigt
+        self.staticLayerKey = None
+
+        # Baggrund til dirty-rect tegning: det statiske lag med træerne tegnet ind
+        self.background = None
+        self.backgroundLayer = None  # Det statiske lag baggrunden blev bygget af
+        self.treeDamage = [None, None]  # Skaden træerne i baggrunden er tegnet med
+        self.treeRects = [None, None]  # Områderne træerne dækker i baggrunden
+
     
     # Tegn banen med alle elementer 
     
-    def draw(self, surface: pygame.Surface, spiller1=None, spiller2=None):
+    def draw(self, surface: pygame.Surface, spiller1=None, spiller2=None, alpha=1.0):
         """
         Tegner hele banen med alle elementer.
 
-            
+        De statiske lag (himmel, afgrund, bjerge, Mount Fuji, torii-port,
+        terræn og platforme) ligger færdigtegnet i én cachet overflade.
+        Kirsebærtræerne, der afhænger af skaden, tegnes ovenpå hver frame,
+        og lagene foran træerne (porten, terrænet og platformene) tegnes
+        igen kun hvor træerne er.
         
         Parametre:
             surface (pygame.Surface): Overfladen der skal tegnes på
             spiller1 (Spiller): Første spiller objekt, bruges til skadevisning
             spiller2 (Spiller): Anden spiller objekt, bruges til skadevisning
+            alpha (float): Hvor langt mellem de to sidste simulerings-ticks der tegnes (0-1)
+        """
+        # Tegn de statiske lag fra cachen
+        surface.blit(self.getStaticLayer(surface), (0, 0))
+
+        # Opdater og tegn kirsebærtræer med spillernes skadeprocent
+        
+        leftDamage = spiller1.damage if spiller1 else 0
+        rightDamage = spiller2.damage if spiller2 else 0
+
+        # Tegn træerne på hver side - porten, terrænet og platformene ligger foran dem
+        self.drawFrontLayer(surface, self.drawTree(surface, 0, leftDamage))
+        self.drawFrontLayer(surface, self.drawTree(surface, 1, rightDamage))
+
+        # Bevægelige platforme ligger ikke i det statiske lag
+        self.drawMovingPlatforms(surface, alpha)
+
+    def drawMovingPlatforms(self, surface, alpha=1.0):
+        """
+        Tegner de bevægelige platforme hvor simulationen har flyttet dem hen.
+        
+        Parametre:
+            surface (pygame.Surface): Overfladen der skal tegnes på
+            alpha (float): Hvor langt mellem de to sidste simulerings-ticks der tegnes (0-1).
+                           Platformen stod vx, vy tidligere ved forrige tick.
+        
+        Returnerer en liste med de rektangler der er tegnet på.
+        """
+        behind = 1.0 - alpha
+        return [self.drawPlatform(surface, pygame.Rect(round(p.x - p.vx * behind), round(p.y - p.vy * behind),
+                                                       p.width, p.height))
+                for p in self.movingPlatforms]
+
+    def drawFrontLayer(self, surface, area):
+        """
+        Tegner det cachede lag foran træerne (torii-port, terræn og
+        platforme) igen ovenpå et træ.
+        
+        Parametre:
+            surface (pygame.Surface): Overfladen der skal tegnes på
+            area (pygame.Rect): Området træet dækker
+        """
+        rect = self.frontRect.clip(area)
+        if rect.width and rect.height:
+            surface.blit(self.frontLayer, rect, rect)
+
+    def drawTree(self, surface, index, skadeprocent):
+        """
+        Tegner et af kirsebærtræerne. Laget foran træerne skal tegnes
+        ovenpå bagefter.
+        
+        Parametre:
+            surface (pygame.Surface): Overfladen der skal tegnes på
+            index (int): 0 for det venstre træ, 1 for det højre
+            skadeprocent (float): Spillerens skade, som bestemmer træets højde
+        
+        Returnerer rektanglet træet dækker.
+        """
+        tree = self.trePositions[index]
+        return self.drawCherryTree(
+            tree["x"],
+            self.height,
+            tree["health"],
+            skadeprocent=skadeprocent,
+            surface=surface
+        )
+
+    def updateBackground(self, surface, spiller1=None, spiller2=None):
+        """
+        Holder baggrunden til dirty-rect tegning opdateret: de statiske lag
+        med træerne tegnet ind imellem. Et træ tegnes kun om når dets skade
+        ændrer sig.
+        
+        Parametre:
+            surface (pygame.Surface): Overfladen baggrunden skal blittes på
+            spiller1 (Spiller): Første spiller objekt, bruges til skadevisning
+            spiller2 (Spiller): Anden spiller objekt, bruges til skadevisning
+        
+        Returnerer (baggrund, ændrede rektangler). Listen er None hvis hele
+        baggrunden er bygget forfra.
+        """
+        staticLayer = self.getStaticLayer(surface)
+        changed = []
+        if self.background is None or self.backgroundLayer is not staticLayer:
+            self.background = staticLayer.copy()
+            self.backgroundLayer = staticLayer
+            self.treeDamage = [None, None]
+            self.treeRects = [None, None]
+            changed = None
+
+        damages = (spiller1.damage if spiller1 else 0, spiller2.damage if spiller2 else 0)
+        for index, damage in enumerate(damages):
+            if damage == self.treeDamage[index]:
+                continue
+            oldRect = self.treeRects[index]
+            if oldRect is not None:
+                # Fjern det gamle træ ved at kopiere det statiske lag tilbage
+                self.background.blit(staticLayer, oldRect, oldRect)
+            rect = self.drawTree(self.background, index, damage)
+            area = rect.union(oldRect) if oldRect is not None else rect
+            self.drawFrontLayer(self.background, area)
+            self.treeDamage[index] = damage
+            self.treeRects[index] = rect
+            if changed is not None:
+                changed.append(area)
+        return self.background, changed
+
+    def stageKey(self, size):
+        """
+        Nøgle der beskriver alt hvad det statiske lag afhænger af.
+        
+        Parametre:
+            size (tuple): Størrelsen på overfladen der tegnes på
+        """
+        return (size, self.width, self.height, self.voidY,
+                tuple(tuple(platform) for platform in self.platformSegments))
+
+    def getStaticLayer(self, surface):
+        """
+        Returnerer det cachede statiske lag og bygger det (og laget foran
+        træerne) kun om, hvis størrelsen eller banens data er ændret.
+        
+        Parametre:
+            surface (pygame.Surface): Overfladen laget skal blittes på
+        """
+        key = self.stageKey(surface.get_size())
+        if self.staticLayer is None or key != self.staticLayerKey:
+            # Laget får samme pixelformat som målet, så blit ikke skal konvertere
+            self.staticLayer = pygame.Surface(surface.get_size(), 0, surface)
+            self.frontLayer = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+            self.drawStaticLayer(self.staticLayer, self.frontLayer)
+            self.frontRect = self.opaqueRect(self.frontLayer)
+            self.staticLayer.blit(self.frontLayer, self.frontRect, self.frontRect)  # Bag lagene sammen
+            if pygame.display.get_surface() is not None:
+                self.frontLayer = self.frontLayer.convert_alpha()
+            self.staticLayerKey = key
+        return self.staticLayer
+
+    def opaqueRect(self, surface):
+        """
+        Returnerer det mindste rektangel der indeholder alle ikke-gennemsigtige
+        pixels. Giver det samme som get_bounding_rect(), men læser kun
+        alfakanalen, så det er flere gange hurtigere når en ny bane bages.
+        
+        Parametre:
+            surface (pygame.Surface): Overflade med alfakanal
+        """
+        alpha = pygame.surfarray.pixels_alpha(surface)  # Låser overfladen indtil alpha slettes
+        columns = np.flatnonzero(alpha.any(axis=1))
+        rows = np.flatnonzero(alpha.any(axis=0))
+        del alpha
+        if not len(columns):
+            return pygame.Rect(0, 0, 0, 0)
+        return pygame.Rect(columns[0], rows[0], columns[-1] - columns[0] + 1, rows[-1] - rows[0] + 1)
+
+    def invalidateStaticLayer(self):
+        """Tvinger de statiske lag til at blive tegnet om ved næste draw."""
+        self.staticLayer = None
+        self.frontLayer = None
+        self.background = None
+
+    def drawStaticLayer(self, surface, front):
+        """
+        Tegner alle de lag af banen der ikke ændrer sig under en kamp, i
+        samme rækkefølge som de tegnes på skærmen.
+        
+        Parametre:
+            surface (pygame.Surface): Overfladen til laget bag træerne
+            front (pygame.Surface): Gennemsigtig overflade til laget foran træerne
         """
         # Opret gradient baggrund
         
-        for y in range(self.height):
+        # Gradienten når sin største værdi ved y = 60, så resten er én farve
+        gradientEnd = min(self.height, 60)
+        for y in range(gradientEnd):
             # Beregn gradientværdi baseret på y-position
         
             gradient_value = max(0, min(50 + y // 2, 80))
         
             pygame.draw.line(surface, (gradient_value//2, gradient_value//2, gradient_value), 
                           (0, y), (self.width, y))
+        surface.fill((40, 40, 80), (0, gradientEnd, self.width, self.height - gradientEnd))
         
         
         # Tegn afgrunden under platformen
@@ -96,10 +302,10 @@ class Bane:
         # Tilføj partikkeleffekter i afgrunden
         
         for _ in range(20):
-            particleX = random.randint(0, self.width)
+            particleX = self.rng.randint(0, self.width)
         
-            particleY = random.randint(int(self.voidY), self.height)
-            particleSize = random.randint(1, 3)
+            particleY = self.rng.randint(int(self.voidY), self.height)
+            particleSize = self.rng.randint(1, 3)
         
             particleColor = (30, 30, 40)
             pygame.draw.circle(surface, particleColor, (particleX, particleY), particleSize)
@@ -141,47 +347,17 @@ class Bane:
         
         self.drawMountFuji(surface)
         
+        # Kirsebærtræerne tegnes her mellem de to lag (se draw)
 
-        
-        # Opdater og tegn kirsebærtræer med spillernes skadeprocent
-        
-        leftDamage = spiller1.damage if spiller1 else 0
-        rightDamage = spiller2.damage if spiller2 else 0
-        
-
-        # Tegn træerne på hver side
-        self.drawCherryTree(
-        
-            self.trePositions[0]["x"],
-            self.height,
-        
-            self.trePositions[0]["health"],
-            skadeprocent=leftDamage,
-        
-            surface=surface
-        )
-        
-        self.drawCherryTree(
-        
-            self.trePositions[1]["x"],
-        
-            self.height,
-            self.trePositions[1]["health"],
-        
-            skadeprocent=rightDamage,
-            surface=surface
-        
-        )
-        
         # Tegn torii-porten (traditionel japansk portal)
         
-        self.drawTorii(surface)
+        self.drawTorii(front)
         
 
         # Tegn terræn og platform
         
-        self.drawTerrain(surface)
-        self.drawPlatforms(surface)
+        self.drawTerrain(front)
+        self.drawPlatforms(front)
 
     def drawMountFuji(self, surface):
         """
@@ -325,9 +501,9 @@ class Bane:
         
         # Tilføj græsstrå for tekstur
         for _ in range(100):
-            grass_x = random.randint(0, self.width)
+            grass_x = self.rng.randint(0, self.width)
 
-            grass_height = random.randint(2, 5)
+            grass_height = self.rng.randint(2, 5)
             pygame.draw.line(surface, (50, 70, 50), 
 
                           (grass_x, self.height * 0.7), 
@@ -343,49 +519,70 @@ class Bane:
             surface (pygame.Surface): Overfladen der skal tegnes på
         """
         for platform in self.platformSegments:
-            # Tegn hovedplatformen
-            pygame.draw.rect(surface, (120, 80, 40), platform)
-            
-            # Tilføj dekorative træårer
-            lineSpacing = 20
+            self.drawPlatform(surface, platform)
+
+    def drawPlatform(self, surface, platform):
+        """
+        Tegner én platform med træårer, kanter og skygge.
         
-            for y in range(platform.top, platform.bottom, lineSpacing):
+        Parametre:
+            surface (pygame.Surface): Overfladen der skal tegnes på
+            platform (pygame.Rect): Platformen
         
-                pygame.draw.line(surface, (90, 60, 30),
-                               (platform.left, y),
+        Returnerer rektanglet der er tegnet på.
+        """
+        # Tegn hovedplatformen
+        pygame.draw.rect(surface, (120, 80, 40), platform)
         
-                               (platform.right, y), 2)
+        # Tilføj dekorative træårer
+        lineSpacing = 20
+    
+        for y in range(platform.top, platform.bottom, lineSpacing):
+    
+            pygame.draw.line(surface, (90, 60, 30),
+                           (platform.left, y),
+    
+                           (platform.right, y), 2)
 
 
+    
+        # Tilføj platformkanter
+        capBredde = 8
+    
+    
+        pygame.draw.rect(surface, (140, 90, 40), 
+                      (platform.left - capBredde//2, platform.top - 5,
+    
+                       platform.width + capBredde, 10))
         
-            # Tilføj platformkanter
-            capBredde = 8
-        
-        
-            pygame.draw.rect(surface, (140, 90, 40), 
-                          (platform.left - capBredde//2, platform.top - 5,
-        
-                           platform.width + capBredde, 10))
-            
-            # Tilføj skyggeeffekter
-            pygame.draw.rect(surface, (80, 50, 25), 
-        
-                           (platform.left, platform.bottom, platform.width, 3))
-            pygame.draw.rect(surface, (100, 65, 35), 
-        
-                           (platform.left - 2, platform.top, 2, platform.height))
-        
-            pygame.draw.rect(surface, (100, 65, 35), 
-                           (platform.right, platform.top, 2, platform.height))
+        # Tilføj skyggeeffekter
+        pygame.draw.rect(surface, (80, 50, 25), 
+    
+                       (platform.left, platform.bottom, platform.width, 3))
+        pygame.draw.rect(surface, (100, 65, 35), 
+    
+                       (platform.left - 2, platform.top, 2, platform.height))
+    
+        pygame.draw.rect(surface, (100, 65, 35), 
+                       (platform.right, platform.top, 2, platform.height))
+
+        return pygame.Rect(platform.left - capBredde//2, platform.top - 5,
+                           platform.width + capBredde, platform.height + 8)
 
 
     def isOnPlatform(self, x, y):
         """Tjekker om en given position er på en platform."""
 
-        for platform in self.platformSegments:
-            if (platform.left <= x <= platform.right and
+        # Indekset giver kun de platforme der dækker x
+        for platform in self.platformIndex.at(x, inclusive=True):
+            if platform.top <= y <= platform.bottom:
 
-                platform.top <= y <= platform.bottom):
+                return True
+
+        for platform in self.movingPlatforms:
+            if (platform.x <= x <= platform.x + platform.width and
+
+                platform.y <= y <= platform.y + platform.height):
 
                 return True
 
@@ -396,11 +593,17 @@ class Bane:
 
         minY = float('inf')
 
-        for platform in self.platformSegments:
+        # Indekset har platformene ved x sorteret med den højeste først
+        covering = self.platformIndex.at(x, inclusive=True)
+        if covering:
 
-            if platform.left <= x <= platform.right:
+            minY = covering[0].top
 
-                minY = min(minY, platform.top)
+        for platform in self.movingPlatforms:
+
+            if platform.x <= x <= platform.x + platform.width:
+
+                minY = min(minY, platform.y)
 
         return minY if minY != float('inf') else None
 
@@ -411,7 +614,7 @@ class Bane:
     def drawCherryTree(self, x, height, health, skadeprocent=0, flip=False, surface=None):
 
         if surface is None:
-            return
+            return None
             
 
         # Beregn træets højde baseret på skadeprocent
@@ -438,7 +641,7 @@ class Bane:
 
         # Tegn stammen med mørkebrun farve og outline
 
-        pygame.draw.rect(surface, (45, 30, 20), trunk)  # Indre del af stammen
+        rect = pygame.draw.rect(surface, (45, 30, 20), trunk)  # Indre del af stammen
         pygame.draw.rect(surface, (35, 20, 15), trunk, 2)  # Outline af stammen
 
 
@@ -480,4 +683,9 @@ class Bane:
         # Tegn alle blade
         for pos_x, pos_y in foliagePositions:
 
-            pygame.draw.circle(surface, baseColor, (int(pos_x), int(pos_y)), int(foliageRadius))
\ No newline at end of file
+            circle = pygame.draw.circle(surface, baseColor, (int(pos_x), int(pos_y)), int(foliageRadius))
+            if circle.width and circle.height:  # Blade der er klippet helt væk tæller ikke med
+                rect.union_ip(circle)
+
+        # Returner området træet dækker (bruges af dirty-rect tegningen)
+        return rect
\ No newline at end of file
@@ -0,0 +1,540 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+NumPy simulator der kører mange kampe på én gang.
+
+Hver spillers tilstand ligger som arrays med formen (N, 2) - én række per
+kamp og én kolonne per spiller - og kampens tællere som arrays med formen
+(N,). step() anvender de samme regler som simulation.step, bare som
+vektoriserede operationer over alle kampe.
+
+Kun baner med én Platform understøttes (som "classic") - en Stage med
+flere eller bevægelige platforme afvises. Kør filen direkte for at
+sammenligne med simulation.py og måle hastighed (benchmark.py kører også
+sammenligningen med assert_parity):
+
+    python batchsim.py
+"""
+import numpy as np
+from config import *
+import simulation
+
+NO_WINNER = -2  # Svarer til None i MatchState.round_winner og winner
+NO_FALL = -1  # Svarer til None i MatchState.first_to_fall
+
+BODY_SIZE = PLAYER_SIZE * 2
+
+
+def round_position(value):
+    """
+    Afrunder positioner som pygame.Rect (halve væk fra nul), se
+    simulation.round_position.
+
+    Parametre:
+        value: Array med nye positioner som kommatal
+    """
+    result = np.trunc(value)
+    frac = value - result
+    return (result + (frac >= 0.5) - (frac <= -0.5)).astype(np.int64)
+
+
+class BatchState:
+    """
+    Tilstanden for N kampe som struct-of-arrays.
+    """
+
+    def __init__(self, n, platform=None, rules=None):
+        """
+        Opretter N nye kampe med spillerne på deres startpositioner.
+
+        Parametre:
+            n: Antal kampe
+            platform: Fælles Platform for alle kampe (standard er banens hovedplatform).
+                      En simulation.Stage understøttes ikke.
+            rules: Fælles simulation.Rules for alle kampe (standard er config.py)
+        """
+        if platform is not None and not isinstance(platform, simulation.Platform):
+            raise ValueError(f"BatchState understøtter kun én simulation.Platform, ikke "
+                             f"{type(platform).__name__} (brug simulation.MatchState til baner med flere platforme)")
+        self.n = n
+        self.platform = platform if platform is not None else simulation.default_platform()
+        self.rules = rules if rules is not None else simulation.DEFAULT_RULES
+
+        # Spillernes tilstand (N, 2)
+        shape = (n, 2)
+        self.x = np.zeros(shape, np.int64)
+        self.y = np.zeros(shape, np.int64)
+        self.prev_x = np.zeros(shape, np.int64)  # Positionen før sidste update (swept kollision)
+        self.prev_y = np.zeros(shape, np.int64)
+        self.speed_x = np.zeros(shape)
+        self.speed_y = np.zeros(shape)
+        self.facing_right = np.ones(shape, bool)
+        self.on_ground = np.zeros(shape, bool)
+        self.air_dash = np.full(shape, self.rules.MAX_AIR_DASH, np.int64)
+        self.damage = np.zeros(shape)
+        self.points = np.zeros(shape, np.int64)
+        self.stunned = np.zeros(shape, bool)
+        self.stun_time = np.zeros(shape, np.int64)
+        self.is_dead = np.zeros(shape, bool)
+        self.recovery_frames = np.zeros(shape, np.int64)
+        self.invincible = np.zeros(shape, bool)
+        self.invincible_timer = np.zeros(shape, np.int64)
+        self.can_dash = np.ones(shape, bool)
+        self.dash_timer = np.zeros(shape, np.int64)
+        self.is_dashing = np.zeros(shape, bool)
+        self.dash_direction = np.ones(shape, np.int64)
+        self.combo_timer = np.zeros(shape, np.int64)
+        self.combo_count = np.zeros(shape, np.int64)
+        self.last_attacker = np.full(shape, -1, np.int64)
+        self.events = np.zeros(shape, np.int64)
+
+        # Kampenes tællere (N,)
+        self.tick = np.zeros(n, np.int64)
+        self.round_num = np.ones(n, np.int64)
+        self.round_start_tick = np.zeros(n, np.int64)
+        self.waiting_for_respawn = np.zeros(n, bool)
+        self.respawn_tick = np.zeros(n, np.int64)
+        self.showing_round_start = np.zeros(n, bool)
+        self.round_start_display_tick = np.zeros(n, np.int64)
+        self.first_to_fall = np.full(n, NO_FALL, np.int64)
+        self.round_winner = np.full(n, NO_WINNER, np.int64)
+        self.game_over = np.zeros(n, bool)
+        self.winner = np.full(n, NO_WINNER, np.int64)
+
+        (x1, y1), (x2, y2) = simulation.spawn_points(self.platform)
+        self.spawn_x = np.array([simulation.round_position(x1), simulation.round_position(x2)])
+        self.spawn_y = np.array([simulation.round_position(y1), simulation.round_position(y2)])
+        self.x[:] = self.spawn_x
+        self.y[:] = self.spawn_y
+        self.prev_x[:] = self.spawn_x
+        self.prev_y[:] = self.spawn_y
+
+    # Spillerregler
+
+    def move(self, mask, bits):
+        """
+        Vektoriseret simulation.move for de spillere hvor mask er sand.
+
+        Parametre:
+            mask: (N, 2) bool - spillere der skal bevæges
+            bits: (N, 2) input bitfelter
+        """
+        # Håndter lammelsestilstand
+        stunned = mask & self.stunned
+        self.stun_time -= stunned
+        self.stunned &= ~(stunned & (self.stun_time <= 0))
+        mask = mask & ~stunned
+
+        left = (bits & simulation.INPUT_LEFT) != 0
+        right = (bits & simulation.INPUT_RIGHT) != 0
+
+        # Normal bevægelse
+        walking = mask & ~self.is_dashing
+        np.copyto(self.speed_x, 0.0, where=walking & ~left & ~right)
+        go_left = walking & left
+        np.copyto(self.speed_x, -self.rules.MOVEMENT_SPEED, where=go_left)
+        np.copyto(self.facing_right, False, where=go_left)
+        np.copyto(self.dash_direction, -1, where=go_left)
+        go_right = walking & ~left & right
+        np.copyto(self.speed_x, self.rules.MOVEMENT_SPEED, where=go_right)
+        np.copyto(self.facing_right, True, where=go_right)
+        np.copyto(self.dash_direction, 1, where=go_right)
+
+        # Hop mekanik
+        jump = walking & ((bits & simulation.INPUT_JUMP) != 0) & self.on_ground
+        np.copyto(self.speed_y, self.rules.JUMP_FORCE, where=jump)
+        self.on_ground &= ~jump
+        self.events |= jump * simulation.EVENT_JUMP
+
+        # Opdater dash nedkøling
+        cooling = mask & ~self.can_dash
+        self.dash_timer -= cooling
+        ready = cooling & (self.dash_timer <= 0)
+        self.can_dash |= ready
+        np.copyto(self.dash_timer, 0, where=ready)
+
+        # Dash system
+        dash = (mask & ((bits & simulation.INPUT_DASH) != 0) & self.can_dash & ~self.is_dashing
+                & (self.on_ground | (self.air_dash > 0)))
+        self.is_dashing |= dash
+        np.copyto(self.dash_timer, self.rules.DASH_LENGTH, where=dash)
+        self.can_dash &= ~dash
+        self.air_dash -= dash & ~self.on_ground
+
+        # Dash bevægelse
+        dashing = mask & self.is_dashing
+        np.copyto(self.speed_x, (self.rules.DASH_FORCE * self.dash_direction).astype(float), where=dashing)
+        self.dash_timer -= dashing
+        stop = dashing & (self.dash_timer <= 0)
+        self.is_dashing &= ~stop
+        np.copyto(self.dash_timer, self.rules.DASH_COOLDOWN, where=stop)
+        self.can_dash &= ~stop
+
+        # Luftmodstand
+        np.copyto(self.speed_x, self.speed_x * self.rules.AIR_RESISTANCE, where=mask & ~self.on_ground)
+
+    def update(self, mask):
+        """
+        Vektoriseret simulation.update for levende spillere hvor mask er sand.
+
+        Parametre:
+            mask: (N, 2) bool - spillere der skal opdateres
+        """
+        platform = self.platform
+        np.copyto(self.prev_x, self.x, where=mask)
+        np.copyto(self.prev_y, self.y, where=mask)
+
+        # Anvend tyngdekraft og opdater position
+        np.copyto(self.speed_y, self.speed_y + self.rules.GRAVITY, where=mask)
+        np.copyto(self.x, round_position(self.x + self.speed_x), where=mask)
+        np.copyto(self.y, round_position(self.y + self.speed_y), where=mask)
+
+        # Verdenens grænser
+        too_left = mask & (self.x < WORLD_LEFT_BOUNDARY)
+        np.copyto(self.x, WORLD_LEFT_BOUNDARY, where=too_left)
+        too_right = mask & ~too_left & (self.x > WORLD_RIGHT_BOUNDARY - BODY_SIZE)
+        np.copyto(self.x, WORLD_RIGHT_BOUNDARY - BODY_SIZE, where=too_right)
+        np.copyto(self.speed_x, 0.0, where=too_left | too_right)
+
+        # Platform kollision
+        crossing = mask & (self.y + BODY_SIZE > platform.y) & (self.y < platform.y)
+        centerx = self.x + BODY_SIZE // 2
+        land = crossing & (platform.x < centerx) & (centerx < platform.x + platform.width)
+
+        # Faldet helt igennem platformen i én frame (se simulation.crossing_centerx)
+        through = mask & ~crossing & (self.prev_y + BODY_SIZE <= platform.y) & (platform.y <= self.y)
+        if through.any():
+            fall = np.where(through, self.y - self.prev_y, 1)
+            t = (platform.y - self.prev_y - BODY_SIZE) / fall
+            swept_x = self.prev_x + (self.x - self.prev_x) * t + BODY_SIZE // 2
+            land |= through & (platform.x < swept_x) & (swept_x < platform.x + platform.width)
+            crossing = crossing | land
+
+        np.copyto(self.y, platform.y - BODY_SIZE, where=land)
+        np.copyto(self.speed_y, 0.0, where=land)
+        self.on_ground |= land
+        np.copyto(self.air_dash, self.rules.MAX_AIR_DASH, where=land)
+        self.on_ground &= ~(mask & ~crossing)
+
+        # Opdater tællere
+        self.recovery_frames -= mask & (self.recovery_frames > 0)
+        invincible = mask & self.invincible
+        self.invincible_timer -= invincible
+        self.invincible &= ~(invincible & (self.invincible_timer <= 0))
+        combo_running = self.combo_timer > 0
+        self.combo_timer -= mask & combo_running
+        np.copyto(self.combo_count, 0, where=mask & ~combo_running)
+
+    def hit(self, mask, attacker, target, direction):
+        """
+        Vektoriseret simulation.hit for kampene hvor mask er sand.
+
+        Parametre:
+            mask: (N,) bool - kampe hvor angrebet rammer
+            attacker: Kolonne for angriberen (0 eller 1)
+            target: Kolonne for den der bliver ramt
+            direction: (N,) retning target skubbes i (1 eller -1)
+        """
+        rules = self.rules
+        dashing = self.is_dashing[:, attacker]
+        damage = self.damage[:, target]
+        force = np.where(dashing, rules.BASE_KNOCKBACK * 1.8, rules.BASE_KNOCKBACK) * (1 + damage / 100)
+
+        # Opdater combo system
+        combo = np.where(self.last_attacker[:, target] == attacker, self.combo_count[:, target] + 1, 1)
+        np.copyto(self.combo_count[:, target], combo, where=mask)
+        np.copyto(self.last_attacker[:, target], attacker, where=mask)
+        np.copyto(self.combo_timer[:, target], simulation.COMBO_TICKS, where=mask)
+
+        new_damage = np.minimum(
+            damage + np.where(dashing, rules.DAMAGE_AMOUNT * rules.DASH_DAMAGE_BONUS, rules.DAMAGE_AMOUNT),
+            rules.MAX_DAMAGE)
+        np.copyto(self.damage[:, target], new_damage, where=mask)
+
+        # Knockback (svarer til simulation.apply_knockback)
+        mask = mask & ~self.invincible[:, target]
+        knockback_bonus = 1 + self.damage[:, target] / 75
+        total_force = np.minimum(force * knockback_bonus, rules.MAX_KNOCKBACK)
+        np.copyto(self.speed_x[:, target], direction * total_force * 2.0, where=mask)
+        np.copyto(self.speed_y[:, target], -0.15 * total_force - 3, where=mask)
+        self.stunned[:, target] |= mask
+        np.copyto(self.stun_time[:, target], (8 * knockback_bonus).astype(np.int64), where=mask)
+        np.copyto(self.recovery_frames[:, target], rules.RECOVERY_FRAMES, where=mask)
+        self.events[:, target] |= mask * simulation.EVENT_HIT
+
+    def collide(self, mask):
+        """
+        Vektoriseret simulation.collide for kampene hvor mask er sand.
+
+        Parametre:
+            mask: (N,) bool - kampe hvor begge spillere lever
+
+        Returnerer (N,) bool med de kampe hvor spillerne rørte hinanden.
+        """
+        x1, x2 = self.x[:, 0], self.x[:, 1]
+        dx = x1 - x2
+        dy = self.y[:, 0] - self.y[:, 1]
+        distance = np.sqrt(dx * dx + dy * dy)
+
+        # Swept test (se simulation.contact_time)
+        start_x = self.prev_x[:, 0] - self.prev_x[:, 1]
+        start_y = self.prev_y[:, 0] - self.prev_y[:, 1]
+        c = start_x * start_x + start_y * start_y - BODY_SIZE * BODY_SIZE
+        move_x = (x1 - self.prev_x[:, 0]) - (x2 - self.prev_x[:, 1])
+        move_y = (self.y[:, 0] - self.prev_y[:, 0]) - (self.y[:, 1] - self.prev_y[:, 1])
+        a = move_x * move_x + move_y * move_y
+        b = start_x * move_x + start_y * move_y
+        disc = b * b - a * c
+        approaching = mask & (c >= 0) & (a != 0) & (b < 0) & (disc > 0)
+        t = np.where(approaching, (-b - np.sqrt(np.where(approaching, disc, 0))) / np.where(approaching, a, 1), 2.0)
+        swept = approaching & (t < 1)
+        # Overlap ved framens start tæller kun hvis de stadig overlapper ved slutningen
+        touch = mask & (swept | (distance < BODY_SIZE))
+        if not touch.any():
+            return touch
+
+        # Siden de ramte hinanden fra (t = 0 betyder at de allerede rørte hinanden)
+        moved = swept & (t > 0)
+        contact_x = start_x + move_x * t
+        left_first = np.where(moved, contact_x < 0, x1 < x2)
+
+        # Passeret igennem hinanden - sæt x tilbage hvor de ramte
+        rewind = moved & ((distance >= BODY_SIZE) | (left_first != (x1 < x2)))
+        if rewind.any():
+            np.copyto(self.x[:, 0], round_position(self.prev_x[:, 0] + (x1 - self.prev_x[:, 0]) * t), where=rewind)
+            np.copyto(self.x[:, 1], round_position(self.prev_x[:, 1] + (x2 - self.prev_x[:, 1]) * t), where=rewind)
+            x1, x2 = self.x[:, 0], self.x[:, 1]
+            dx = x1 - x2
+            distance = np.where(rewind, np.sqrt(dx * dx + dy * dy), distance)
+
+        direction = np.where(left_first, 1, -1)
+        sx1, sx2 = self.speed_x[:, 0], self.speed_x[:, 1]
+        dash1, dash2 = self.is_dashing[:, 0], self.is_dashing[:, 1]
+        f1_force = np.abs(sx1) * np.where(dash1, 1.5, 1)
+        f2_force = np.abs(sx2) * np.where(dash2, 1.5, 1)
+        hit_2 = touch & (dash1 | (f1_force > 2)) & (self.recovery_frames[:, 1] == 0)
+        hit_1 = touch & (dash2 | (f2_force > 2)) & (self.recovery_frames[:, 0] == 0)
+        if hit_2.any():
+            self.hit(hit_2, 0, 1, direction)
+        if hit_1.any():
+            self.hit(hit_1, 1, 0, -direction)
+
+        self.events |= touch[:, None] * simulation.EVENT_CONTACT
+
+        # Skub spillerne fra hinanden så de ikke overlapper
+        half = (BODY_SIZE - distance) / 2
+        push = touch & (half > 0)
+        shift = np.where(left_first, -half, half)
+        np.copyto(self.x[:, 0], round_position(x1 + shift), where=push)
+        np.copyto(self.x[:, 1], round_position(x2 - shift), where=push)
+        return touch
+
+    # Runder og point
+
+    def award_round(self, mask, winner):
+        """
+        Vektoriseret simulation.award_round.
+
+        Parametre:
+            mask: (N,) bool - kampe hvor runden slutter
+            winner: (N,) index på vinderen eller -1 ved uafgjort
+        """
+        self.points[:, 0] += mask & (winner != 1)
+        self.points[:, 1] += mask & (winner != 0)
+        np.copyto(self.round_winner, winner, where=mask)
+        self.waiting_for_respawn |= mask
+        np.copyto(self.respawn_tick, self.tick, where=mask)
+
+        p1, p2 = self.points[:, 0], self.points[:, 1]
+        over = mask & ((p1 >= MAX_POINTS) | (p2 >= MAX_POINTS))
+        self.game_over |= over
+        np.copyto(self.winner, np.where(p1 > p2, 0, np.where(p2 > p1, 1, -1)), where=over)
+
+    def reset_round(self, mask):
+        """
+        Vektoriseret simulation.reset_round.
+
+        Parametre:
+            mask: (N,) bool - kampe der starter en ny runde
+        """
+        fighters = mask[:, None]
+        np.copyto(self.x, self.spawn_x, where=fighters)
+        np.copyto(self.y, self.spawn_y, where=fighters)
+        for name, value in (("is_dead", False), ("damage", 0.0), ("combo_count", 0),
+                            ("combo_timer", 0), ("last_attacker", -1), ("speed_x", 0.0),
+                            ("speed_y", 0.0), ("stunned", False), ("stun_time", 0),
+                            ("is_dashing", False), ("can_dash", True), ("dash_timer", 0),
+                            ("air_dash", self.rules.MAX_AIR_DASH)):
+            np.copyto(getattr(self, name), value, where=fighters)
+        self.round_num += mask
+        np.copyto(self.round_start_tick, self.tick, where=mask)
+        np.copyto(self.round_winner, NO_WINNER, where=mask)
+        self.showing_round_start |= mask
+        np.copyto(self.round_start_display_tick, self.tick, where=mask)
+
+
+def step(batch, inputs):
+    """
+    Simulerer én frame i alle kampe (svarer til simulation.step).
+
+    Parametre:
+        batch: BatchState der opdateres
+        inputs: (N, 2) input bitfelter
+
+    Returnerer (N,) med ROUND_RING_OUT, ROUND_TIMEOUT eller ROUND_CONTINUES.
+    """
+    inputs = np.asarray(inputs)
+    active = ~batch.game_over
+    tick = batch.tick
+    result = np.zeros(batch.n, np.int8)
+
+    # Tjek om tiden er udløbet - spilleren med mindst skade vinder
+    timeout = (active & (tick - batch.round_start_tick >= simulation.ROUND_TICKS)
+               & ~batch.waiting_for_respawn & ~batch.showing_round_start)
+    if timeout.any():
+        d1, d2 = batch.damage[:, 0], batch.damage[:, 1]
+        batch.award_round(timeout, np.where(d1 < d2, 0, np.where(d2 < d1, 1, -1)))
+        result[timeout] = simulation.ROUND_TIMEOUT
+
+    playing = active & ~batch.showing_round_start
+    batch.events[playing] = 0
+    batch.move(playing[:, None] & ~batch.is_dead, inputs)
+
+    # Tjek for fald i afgrunden
+    falls = (playing & ~batch.waiting_for_respawn)[:, None] & ~batch.is_dead & (batch.y > batch.platform.y)
+    batch.is_dead |= falls
+    first = batch.first_to_fall
+    np.copyto(first, 0, where=(first == NO_FALL) & falls[:, 0])
+    np.copyto(first, 1, where=(first == NO_FALL) & falls[:, 1])
+
+    batch.update(playing[:, None] & ~batch.is_dead)
+    batch.collide(playing & ~batch.is_dead[:, 0] & ~batch.is_dead[:, 1])
+
+    # Tjek for rundens afslutning - den der faldt først taber
+    ring_out = playing & ~batch.waiting_for_respawn & (batch.is_dead[:, 0] | batch.is_dead[:, 1])
+    if ring_out.any():
+        winner = np.where(first != NO_FALL, 1 - first, np.where(batch.is_dead[:, 0], 1, 0))
+        batch.award_round(ring_out, winner)
+        np.copyto(first, NO_FALL, where=ring_out)
+        result[ring_out] = simulation.ROUND_RING_OUT
+
+    # Håndter respawn timing
+    respawn = active & batch.waiting_for_respawn & (tick - batch.respawn_tick >= simulation.RESPAWN_TICKS)
+    if respawn.any():
+        batch.waiting_for_respawn &= ~respawn
+        batch.reset_round(respawn)
+
+    # Skjul rundenummeret når tiden er gået
+    batch.showing_round_start &= ~(active & (tick - batch.round_start_display_tick >= simulation.ROUND_START_TICKS))
+
+    batch.tick += active
+    return result
+
+
+# Sammenligning med den objektbaserede simulering
+
+FIGHTER_FIELDS = ("x", "y", "prev_x", "prev_y", "speed_x", "speed_y", "facing_right", "on_ground", "air_dash",
+                  "damage", "points", "stunned", "stun_time", "is_dead", "recovery_frames",
+                  "can_dash", "dash_timer", "is_dashing", "dash_direction",
+                  "combo_timer", "combo_count", "last_attacker", "events")
+MATCH_FIELDS = ("tick", "round_num", "round_start_tick", "waiting_for_respawn", "respawn_tick",
+                "showing_round_start", "round_start_display_tick", "game_over")
+
+
+def compare(batch, states):
+    """
+    Finder forskelle mellem en BatchState og en liste af MatchState.
+
+    Parametre:
+        batch: BatchState
+        states: Liste med N MatchState objekter
+
+    Returnerer en liste af (kamp, spiller, felt, batch værdi, objekt værdi).
+    """
+    differences = []
+    for i, state in enumerate(states):
+        for name in MATCH_FIELDS:
+            if getattr(batch, name)[i] != getattr(state, name):
+                differences.append((i, None, name, getattr(batch, name)[i], getattr(state, name)))
+        for name, none, value in (("first_to_fall", NO_FALL, state.first_to_fall),
+                                  ("round_winner", NO_WINNER, state.round_winner),
+                                  ("winner", NO_WINNER, state.winner)):
+            expected = none if value is None else value
+            if getattr(batch, name)[i] != expected:
+                differences.append((i, None, name, getattr(batch, name)[i], value))
+        for j, fighter in enumerate(state.fighters):
+            for name in FIGHTER_FIELDS:
+                if getattr(batch, name)[i, j] != getattr(fighter, name):
+                    differences.append((i, j, name, getattr(batch, name)[i, j], getattr(fighter, name)))
+    return differences
+
+
+def parity_check(n=64, ticks=20000, seed=0, hold=7, rules=None):
+    """
+    Kører de samme tilfældige input gennem BatchState og simulation.MatchState
+    og stopper ved første forskel.
+
+    Parametre:
+        n: Antal kampe
+        ticks: Antal frames
+        seed: Seed til input generatoren
+        hold: Antal frames hvert input holdes
+        rules: simulation.Rules for kampene (standard er config.py)
+
+    Returnerer None hvis alt stemmer, ellers (tick, forskelle).
+    """
+    rng = np.random.default_rng(seed)
+    batch = BatchState(n, rules=rules)
+    states = [simulation.MatchState(rules=rules) for _ in range(n)]
+    inputs = np.zeros((n, 2), np.int64)
+    for t in range(ticks):
+        if t % hold == 0:
+            inputs = rng.integers(0, 16, size=(n, 2))
+        step(batch, inputs)
+        for i, state in enumerate(states):
+            simulation.step(state, (int(inputs[i, 0]), int(inputs[i, 1])))
+        differences = compare(batch, states)
+        if differences:
+            return t, differences
+        if batch.game_over.all():
+            break
+    return None
+
+
+def assert_parity(n=64, ticks=20000, seed=0, hold=7, rules=None):
+    """
+    Som parity_check, men rejser AssertionError ved første forskel, så en
+    ændring i simulation.py der ikke er lavet her også fejler synligt.
+
+    Parametre:
+        Som parity_check
+    """
+    mismatch = parity_check(n, ticks, seed, hold, rules)
+    if mismatch is not None:
+        tick, differences = mismatch
+        raise AssertionError(f"batchsim.py afviger fra simulation.py ved tick {tick} ({rules!r}): "
+                             + "; ".join(str(difference) for difference in differences[:5]))
+
+
+if __name__ == "__main__":
+    import time
+
+    mismatch = parity_check()
+    if mismatch is None:
+        print("Paritet med simulation.py: OK")
+    else:
+        tick, differences = mismatch
+        print(f"Forskel ved tick {tick}:")
+        for difference in differences[:10]:
+            print("  ", difference)
+
+    # Hastighedstest
+    n = 4096
+    batch = BatchState(n)
+    rng = np.random.default_rng(1)
+    inputs = rng.integers(0, 16, size=(64, n, 2))
+    start = time.perf_counter()
+    ticks = 2000
+    for t in range(ticks):
+        step(batch, inputs[t % 64])
+    elapsed = time.perf_counter() - start
+    print(f"{n * ticks / elapsed:,.0f} kamp-ticks/sekund ({n} kampe)")
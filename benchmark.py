@@ -0,0 +1,522 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Headless benchmarks af de varme dele af spillet.
+
+Hver benchmark måler én funktion (eller et helt BATTLE billede) under
+SDL's dummy driver, så den kan køre uden skærm. Resultaterne skrives som
+JSON og sammenlignes med gemte baselines: en benchmark fejler hvis dens
+hurtigste måling er mere end sin tærskel (f.eks. 1.30 = 30 %) langsommere
+end baselinen. Den hurtigste måling bruges fordi den er mindst påvirket af
+andre processer på maskinen; medianen gemmes også.
+
+    python benchmark.py                      # kør alt og sammenlign
+    python benchmark.py --json resultat.json # gem resultaterne
+    python benchmark.py --only bane_draw menu_draw
+    python benchmark.py --save-baseline      # gem nye baselines
+
+Baselines afhænger af maskinen. Gem nye baselines på den maskine der
+sammenlignes på, før tærsklerne bruges.
+
+Før målingerne tjekkes det at batchsim.py stadig giver præcis de samme
+kampe som simulation.py (med config.py's regler og med ændrede regler),
+så en optimering der ændrer reglerne ét sted fejler her. --skip-parity
+springer tjekket over.
+"""
+import argparse
+import json
+import os
+import platform as host
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from config import *
+import batchsim
+import simulation
+import stages
+from bots import make_bot
+
+BASELINE_PATH = os.path.join("benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 1.30  # Tilladt forhold mellem hurtigste måling og baseline
+MIN_TIME = 0.5  # Sekunder hver benchmark måles i
+SAMPLES = 7  # Antal målinger medianen tages over
+RETRIES = 2  # Nye målinger af en benchmark der er over sin tærskel
+BASELINE_ROUNDS = 3  # Målerunder når baselines gemmes
+
+BENCHMARKS = {}  # navn -> (setup funktion, tærskel)
+
+# Paritetstjek af batchsim.py mod simulation.py: (kampe, frames, seed, regler)
+PARITY_CHECKS = (
+    (32, 6000, 0, None),
+    (32, 6000, 1, simulation.Rules(BASE_KNOCKBACK=12, MAX_KNOCKBACK=30, DASH_COOLDOWN=60, RECOVERY_FRAMES=10)),
+)
+
+
+def benchmark(name, threshold=DEFAULT_THRESHOLD):
+    """
+    Registrerer en benchmark. Den dekorerede funktion får vinduet og
+    returnerer funktionen der måles (uden argumenter).
+
+    Parametre:
+        name: Benchmarkens navn
+        threshold: Tilladt forhold mellem hurtigste måling og baseline
+    """
+    def register(setup):
+        BENCHMARKS[name] = (setup, threshold)
+        return setup
+    return register
+
+
+def make_fighters(particles=None):
+    """Opretter to spillere på deres startpositioner"""
+    from talhaspiller import Spiller
+    platform = simulation.default_platform()
+    rng = random.Random(1)
+    spiller1 = Spiller(0, 0, RED, "Rød Spiller", rng, particles)
+    spiller2 = Spiller(0, 0, BLUE, "Blå Spiller", rng, particles)
+    simulation.reset_fighters([spiller1, spiller2], platform)
+    return spiller1, spiller2, platform
+
+
+@benchmark("bane_draw")
+def bench_bane_draw(window):
+    from bane2 import Bane
+    bane = Bane(WIDTH, HEIGHT, random.Random(1))
+    spiller1, spiller2, _ = make_fighters()
+    spiller1.damage = 40
+    spiller2.damage = 120
+    return lambda: bane.draw(window, spiller1, spiller2)
+
+
+def cherry_tree(damage):
+    def setup(window):
+        from bane2 import Bane
+        bane = Bane(WIDTH, HEIGHT, random.Random(1))
+        tree = bane.trePositions[0]
+        return lambda: bane.drawCherryTree(tree["x"], bane.height, tree["health"],
+                                           skadeprocent=damage, surface=window)
+    return setup
+
+
+for _damage in (0, 100, 300):
+    benchmark(f"bane_cherry_tree_{_damage}")(cherry_tree(_damage))
+
+
+@benchmark("spiller_draw_idle")
+def bench_spiller_draw_idle(window):
+    spiller, _, _ = make_fighters()
+    return lambda: spiller.draw(window)
+
+
+@benchmark("spiller_draw_dashing")
+def bench_spiller_draw_dashing(window):
+    spiller, _, _ = make_fighters()
+    spiller.is_dashing = True
+    spiller.dash_direction = 1
+    spiller.can_dash = False
+    spiller.dash_timer = DASH_COOLDOWN
+    return lambda: spiller.draw(window)
+
+
+@benchmark("spiller_draw_cooldown")
+def bench_spiller_draw_cooldown(window):
+    spiller, _, _ = make_fighters()
+    spiller.can_dash = False
+    spiller.combo_count = 3
+    spiller.damage = 87
+
+    def run():
+        # Gå gennem hele nedkølingen, så alle trin af ringen tegnes
+        spiller.dash_timer = spiller.dash_timer - 1 if spiller.dash_timer > 1 else DASH_COOLDOWN
+        spiller.draw(window)
+    return run
+
+
+@benchmark("particles_burst", threshold=1.50)
+def bench_particles_burst(window):
+    spiller, _, _ = make_fighters()
+
+    def run():
+        # Et stort slag hver frame giver omkring 3000 levende partikler
+        spiller.particles.emit(spiller.centerx, spiller.centery, 100, (-8, 8), (-8, 8), 30,
+                               spiller.color, spiller.rng)
+        spiller.update_particles()
+    return run
+
+
+@benchmark("particles_draw", threshold=1.50)
+def bench_particles_draw(window):
+    spiller, _, _ = make_fighters()
+    for _ in range(30):
+        spiller.particles.emit(spiller.centerx, spiller.centery, 100, (-8, 8), (-8, 8), 30,
+                               spiller.color, spiller.rng)
+        spiller.update_particles()
+    return lambda: spiller.particles.draw(window)
+
+
+@benchmark("handle_collision")
+def bench_handle_collision(window):
+    from talhamain import handle_collision
+    spiller1, spiller2, platform = make_fighters()
+
+    def run():
+        # Spillerne nulstilles og stilles oven i hinanden, så hver kørsel giver et slag
+        simulation.reset_fighters([spiller1, spiller2], platform)
+        spiller2.recovery_frames = 0
+        spiller1.x = spiller2.x - 30
+        spiller1.is_dashing = True
+        spiller1.dash_direction = 1
+        handle_collision(spiller1, spiller2)
+        spiller1.particles.clear()
+        spiller2.particles.clear()
+    return run
+
+
+@benchmark("menu_draw", threshold=1.50)
+def bench_menu_draw(window):
+    from main import Menu
+    menu = Menu(WIDTH, HEIGHT, random.Random(1))
+    return lambda: menu.draw(window)
+
+
+@benchmark("hud_points")
+def bench_hud_points(window):
+    from talhamain import display_points
+    spiller1, spiller2, _ = make_fighters()
+    clock = [ROUND_TIME * 60.0]
+
+    def run():
+        clock[0] = clock[0] - 1 / FRAME_RATE if clock[0] > 0 else ROUND_TIME * 60.0
+        display_points(window, spiller1, spiller2, clock[0])
+    return run
+
+
+@benchmark("hud_round_winner", threshold=1.60)
+def bench_hud_round_winner(window):
+    from talhamain import display_round_winner
+    return lambda: display_round_winner(window, "Blå Spiller", BLUE)
+
+
+@benchmark("sim_step", threshold=1.60)
+def bench_sim_step(window):
+    state = simulation.MatchState(seed=1)
+    bots = (make_bot("rusher", 1), make_bot("keeper", 2))
+
+    def run():
+        if state.game_over:
+            state.__init__(seed=1)
+        simulation.step(state, (bots[0](state, 0), bots[1](state, 1)))
+    return run
+
+
+@benchmark("sim_step_islands", threshold=1.60)
+def bench_sim_step_islands(window):
+    """Som sim_step, men på en bane med hundredvis af platforme (tester platformindekset)"""
+    state = simulation.MatchState(platform=stages.make_stage("islands"), seed=1)
+    bots = (make_bot("rusher", 1), make_bot("jumper", 2))
+
+    def run():
+        if state.game_over:
+            state.__init__(platform=state.platform, seed=1)
+        simulation.step(state, (bots[0](state, 0), bots[1](state, 1)))
+    return run
+
+
+@benchmark("match_snapshot", threshold=1.60)
+def bench_match_snapshot(window):
+    """Et snapshot og en restore af en hel kamp (bruges til søgning og tilbagespoling)"""
+    state = simulation.MatchState(seed=1)
+
+    def run():
+        state.restore(state.snapshot())
+    return run
+
+
+@benchmark("battle_frame")
+def bench_battle_frame(window):
+    """Et helt BATTLE billede: én simulerings-tick, bane, partikler, spillere, HUD og display.update"""
+    from bane2 import Bane
+    from particles import ParticlePool
+    from talhamain import display_points
+    bane = Bane(WIDTH, HEIGHT, random.Random(1))
+    particles = ParticlePool()
+    spiller1, spiller2, platform = make_fighters(particles)
+    state = simulation.MatchState([spiller1, spiller2], platform, seed=1)
+    bots = (make_bot("rusher", 1), make_bot("jumper", 2))
+
+    def run():
+        if state.game_over:
+            spiller1.points = spiller2.points = 0
+            state.__init__([spiller1, spiller2], platform, seed=1)
+        simulation.step(state, (bots[0](state, 0), bots[1](state, 1)))
+        particles.update()
+        spiller1.spawn_effects()
+        spiller2.spawn_effects()
+        bane.draw(window, spiller1, spiller2)
+        particles.draw(window)
+        spiller1.draw(window)
+        spiller2.draw(window)
+        display_points(window, spiller1, spiller2, state.time_left())
+        pygame.display.update()
+    return run
+
+
+@benchmark("battle_frame_dirty")
+def bench_battle_frame_dirty(window):
+    """Som battle_frame, men tegnet med DirtyRenderer"""
+    from bane2 import Bane
+    from dirtyrects import DirtyRenderer
+    from particles import ParticlePool
+    from talhamain import display_points
+    bane = Bane(WIDTH, HEIGHT, random.Random(1))
+    particles = ParticlePool()
+    spiller1, spiller2, platform = make_fighters(particles)
+    state = simulation.MatchState([spiller1, spiller2], platform, seed=1)
+    state.showing_round_start = False
+    bots = (make_bot("rusher", 1), make_bot("jumper", 2))
+    renderer = DirtyRenderer(window)
+
+    def run():
+        if state.game_over or state.waiting_for_respawn:
+            spiller1.points = spiller2.points = 0
+            state.__init__([spiller1, spiller2], platform, seed=1)
+            state.showing_round_start = False
+        simulation.step(state, (bots[0](state, 0), bots[1](state, 1)))
+        particles.update()
+        spiller1.spawn_effects()
+        spiller2.spawn_effects()
+        renderer.begin(*bane.updateBackground(window, spiller1, spiller2))
+        renderer.add(particles.draw(window))
+        renderer.add(spiller1.draw(window))
+        renderer.add(spiller2.draw(window))
+        renderer.add(display_points(window, spiller1, spiller2, state.time_left()))
+        renderer.present()
+    return run
+
+
+@benchmark("startup_first_frame")
+def bench_startup_first_frame(window):
+    """
+    Det talhamain.main gør før det første billede (efter pygame.init og
+    vinduet): lyde sættes i kø, menu, bane og spillere oprettes, og det
+    første menubillede tegnes og vises. Lydene afkodes i baggrunden.
+    """
+    import assetloader
+    from bane2 import Bane
+    from main import Menu
+    from particles import ParticlePool
+
+    def run():
+        assets = assetloader.AssetLoader()
+        assets.load_sound("punch", "assets/punch.mp3", 0.4)
+        menu = Menu(WIDTH, HEIGHT, random.Random(1), assets)
+        Bane(WIDTH, HEIGHT, random.Random(1))
+        make_fighters(ParticlePool())
+        menu.draw(window, FRAME_RATE / MENU_FRAME_RATE)
+        pygame.display.update()
+        assets.close()  # Ellers ville hver måling efterlade en baggrundstråd
+    return run
+
+
+@benchmark("restart_first_frame")
+def bench_restart_first_frame(window):
+    """
+    Ny kamp i samme proces (talhamain.start_match som når SPACE trykkes
+    på slutskærmen) og det første BATTLE billede, hvor banens lag bages
+    igen fra det nye seed.
+    """
+    from bane2 import Bane
+    from particles import ParticlePool
+    from talhamain import start_match, display_points, display_round_start
+    rng = random.Random(1)
+    bane = Bane(WIDTH, HEIGHT, rng)
+    particles = ParticlePool()
+    spiller1, spiller2, _ = make_fighters(particles)
+    seeds = iter(range(1, 1 << 30))
+
+    def run():
+        match = start_match(next(seeds), rng, bane, [spiller1, spiller2], particles)
+        bane.draw(window, spiller1, spiller2)
+        spiller1.draw(window)
+        spiller2.draw(window)
+        display_points(window, spiller1, spiller2, match.time_left())
+        display_round_start(window, match.round_num)
+        pygame.display.update()
+    return run
+
+
+def measure(function, min_time=MIN_TIME, samples=SAMPLES):
+    """
+    Måler en funktion og returnerer (median, minimum, iterationer per måling)
+    med tiderne i mikrosekunder per kald.
+
+    Parametre:
+        function: Funktionen der måles (uden argumenter)
+        min_time: Samlet tid målingerne skal tage
+        samples: Antal målinger
+    """
+    # Opvarmning og kalibrering: find et antal iterationer der tager min_time / samples
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / samples / 4:
+            break
+        iterations *= 2
+    iterations = max(1, int(iterations * (min_time / samples) / max(elapsed, 1e-9)))
+
+    times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        times.append((time.perf_counter() - start) / iterations * 1e6)
+    return statistics.median(times), min(times), iterations
+
+
+def machine_info():
+    """Beskriver maskinen, så baselines fra en anden maskine kan genkendes"""
+    return {
+        "machine": host.machine(),
+        "processor": host.processor(),
+        "system": host.system(),
+        "python": host.python_version(),
+        "pygame": pygame.version.ver,
+    }
+
+
+def load_baseline(path):
+    """Indlæser baselines (tom hvis filen ikke findes)"""
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {"machine": None, "benchmarks": {}}
+
+
+def run(names, baseline, min_time=MIN_TIME, rounds=1):
+    """
+    Kører benchmarks og sammenligner med baselines. En benchmark der er
+    over sin tærskel måles igen op til RETRIES gange, før den fejler, så
+    enkelte forstyrrelser på maskinen ikke giver falske fejl.
+
+    Parametre:
+        names: Navnene på de benchmarks der skal køres
+        baseline: Baselines fra load_baseline()
+        min_time: Sekunder hver benchmark måles i
+        rounds: Antal gange hver benchmark måles (resultatet er medianen af
+                rundernes hurtigste målinger - bruges når baselines gemmes)
+
+    Returnerer resultaterne som en dict der kan skrives som JSON.
+    """
+    pygame.init()
+    window = pygame.display.set_mode((WIDTH, HEIGHT))
+    results = {}
+    passed = True
+    for name in names:
+        setup, threshold = BENCHMARKS[name]
+        function = setup(window)
+        measurements = sorted((measure(function, min_time) for _ in range(rounds)), key=lambda m: m[1])
+        median, fastest, iterations = measurements[len(measurements) // 2]
+        stored = baseline["benchmarks"].get(name)
+        result = {"median_us": round(median, 3), "min_us": round(fastest, 3),
+                  "iterations": iterations, "threshold": threshold}
+        if stored is None:
+            result["status"] = "no-baseline"
+        else:
+            threshold = stored.get("threshold", threshold)
+            retries = 0
+            while fastest / stored["min_us"] > threshold and retries < RETRIES:
+                retries += 1
+                again = measure(function, min_time)
+                if again[1] < fastest:
+                    median, fastest, iterations = again
+            ratio = fastest / stored["min_us"]
+            result.update(median_us=round(median, 3), min_us=round(fastest, 3), iterations=iterations,
+                          baseline_us=stored["min_us"], ratio=round(ratio, 3), threshold=threshold,
+                          retries=retries, status="pass" if ratio <= threshold else "fail")
+            passed = passed and ratio <= threshold
+        results[name] = result
+        print(f"{name:<24} {fastest:10.1f} us (median {median:10.1f})  {result['status']}"
+              + (f" ({result['ratio']:.2f}x af baseline)" if "ratio" in result else ""))
+    pygame.quit()
+    return {"machine": machine_info(), "passed": passed, "benchmarks": results}
+
+
+def check_parity():
+    """
+    Kører PARITY_CHECKS. Rejser AssertionError ved første forskel.
+    """
+    for n, ticks, seed, rules in PARITY_CHECKS:
+        batchsim.assert_parity(n, ticks, seed, rules=rules)
+    print("Paritet mellem batchsim.py og simulation.py: OK")
+
+
+def save_baseline(path, report):
+    """Gemmer resultaterne som nye baselines (med deres tærskler)"""
+    baseline = load_baseline(path)
+    baseline["machine"] = report["machine"]
+    for name, result in report["benchmarks"].items():
+        baseline["benchmarks"][name] = {"min_us": result["min_us"], "median_us": result["median_us"],
+                                        "threshold": result["threshold"]}
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks af spillets varme dele")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help="Benchmarks der skal køres")
+    parser.add_argument("--json", default=None, metavar="FIL", help="Skriv resultaterne som JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Fil med baselines")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Gem resultaterne som nye baselines i stedet for at sammenligne")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME,
+                        help="Sekunder hver benchmark måles i")
+    parser.add_argument("--skip-parity", action="store_true",
+                        help="Spring tjekket af batchsim.py mod simulation.py over")
+    args = parser.parse_args()
+
+    if not args.skip_parity:
+        try:
+            check_parity()
+        except AssertionError as e:
+            print(f"FEJL: {e}")
+            return 1
+
+    baseline = load_baseline(args.baseline)
+    if not args.save_baseline and baseline["machine"] not in (None, machine_info()):
+        print("Advarsel: baselines er målt på en anden maskine - gem nye med --save-baseline")
+    if args.save_baseline:
+        report = run(args.only, {"machine": None, "benchmarks": {}}, args.min_time, BASELINE_ROUNDS)
+    else:
+        report = run(args.only, baseline, args.min_time)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+    if args.save_baseline:
+        save_baseline(args.baseline, report)
+        print(f"Baselines gemt i {args.baseline}")
+        return 0
+    if not report["passed"]:
+        print("FEJL: mindst én benchmark er langsommere end sin tærskel")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Scriptede bots til headless kampe.
+
+En bot laves med make_bot(navn, seed) og er en funktion
+controller(state, index) der returnerer et input bitfelt til
+simulation.step (eller freeforall.step). Bots bruger kun simulation.py
+og aldrig pygame.
+"""
+import random
+import searchai
+from simulation import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP, INPUT_DASH
+
+
+def opponent(state, index):
+    """
+    Returnerer den modstander botten skal gå efter: den anden spiller i
+    en kamp med to, ellers den nærmeste levende spiller.
+
+    Parametre:
+        state: Kampens tilstand
+        index: Bottens index i state.fighters
+    """
+    fighters = state.fighters
+    if len(fighters) == 2:
+        return fighters[1 - index]
+    me = fighters[index]
+    nearest = None
+    best = None
+    for i, other in enumerate(fighters):
+        if i == index or other.is_dead:
+            continue
+        distance = abs(other.x - me.x) + abs(other.y - me.y)
+        if best is None or distance < best:
+            nearest = other
+            best = distance
+    return nearest if nearest is not None else me
+
+
+def idle_bot(seed):
+    """Står helt stille"""
+    def controller(state, index):
+        return 0
+    return controller
+
+
+def random_bot(seed):
+    """Trykker tilfældige taster og holder dem i nogle frames"""
+    rng = random.Random(seed)
+    current = [0, 0]  # [input, frames tilbage]
+
+    def controller(state, index):
+        if current[1] <= 0:
+            current[0] = rng.randrange(16)
+            current[1] = rng.randint(3, 20)
+        current[1] -= 1
+        return current[0]
+    return controller
+
+
+def rusher_bot(seed):
+    """Løber direkte mod modstanderen og dasher når den er tæt på"""
+    rng = random.Random(seed)
+
+    def controller(state, index):
+        me = state.fighters[index]
+        other = opponent(state, index)
+        dx = other.x - me.x
+        bits = INPUT_RIGHT if dx > 0 else INPUT_LEFT
+        if abs(dx) < 160 and me.can_dash and rng.random() < 0.5:
+            bits |= INPUT_DASH
+        if other.y < me.y - 40 and rng.random() < 0.1:
+            bits |= INPUT_JUMP
+        return bits
+    return controller
+
+
+def keeper_bot(seed):
+    """Holder sig nær midten af platformen og dasher mod modstanderen når den nærmer sig"""
+    rng = random.Random(seed)
+
+    def controller(state, index):
+        me = state.fighters[index]
+        other = opponent(state, index)
+        platform = state.platform
+        center = platform.x + platform.width // 2 - me.w // 2
+        dx = other.x - me.x
+        if abs(dx) < 130 and me.can_dash and rng.random() < 0.35:
+            # Vend mod modstanderen og dash
+            return (INPUT_RIGHT if dx > 0 else INPUT_LEFT) | INPUT_DASH
+        if me.x < center - 40:
+            return INPUT_RIGHT
+        if me.x > center + 40:
+            return INPUT_LEFT
+        return 0
+    return controller
+
+
+def jumper_bot(seed):
+    """Hopper over modstanderen og dasher i luften"""
+    rng = random.Random(seed)
+
+    def controller(state, index):
+        me = state.fighters[index]
+        other = opponent(state, index)
+        dx = other.x - me.x
+        bits = INPUT_RIGHT if dx > 0 else INPUT_LEFT
+        if abs(dx) < 200 and me.on_ground:
+            bits |= INPUT_JUMP
+        if not me.on_ground and me.speed_y > 0 and abs(dx) < 150 and rng.random() < 0.3:
+            bits |= INPUT_DASH
+        return bits
+    return controller
+
+
+def search_bot(seed, rollouts=64):
+    """
+    Planlægger ved at simulere fremad (se searchai.py). Kører i samme
+    proces med et fast antal rollouts, så kampen kan gentages. Den
+    planlægger kun for kampe med to spillere - med flere spillere (se
+    freeforall.py) løber den bare mod den nærmeste modstander.
+
+    Parametre:
+        seed: Seed til rollouterne
+        rollouts: Rollouts per beslutning
+    """
+    planners = {}  # index -> Planner
+    current = [0, None]  # [handling, tick for beslutningen]
+    fallback = rusher_bot(seed)
+
+    def controller(state, index):
+        if len(state.fighters) != 2:
+            return fallback(state, index)
+        if not searchai.can_act(state, index):
+            current[1] = None
+            return 0
+        if current[1] is None or not 0 <= state.tick - current[1] < searchai.DECISION_TICKS:
+            planner = planners.get(index)
+            if planner is None:
+                planner = planners[index] = searchai.Planner(state.platform, index, seed, state.rules)
+            # Modstanderens input gættes ud fra dens bevægelse
+            other = state.fighters[1 - index]
+            if other.speed_x > 0.5:
+                opponent_input = INPUT_RIGHT
+            elif other.speed_x < -0.5:
+                opponent_input = INPUT_LEFT
+            else:
+                opponent_input = 0
+            totals, counts = planner.plan(state.snapshot(), opponent_input, rollouts=rollouts)
+            current[0] = searchai.best_action(totals, counts)
+            current[1] = state.tick
+        return current[0]
+    return controller
+
+
+BOTS = {
+    "idle": idle_bot,
+    "random": random_bot,
+    "rusher": rusher_bot,
+    "keeper": keeper_bot,
+    "jumper": jumper_bot,
+    "search": search_bot,
+}
+
+
+def make_bot(name, seed=0):
+    """
+    Opretter en bot controller.
+
+    Parametre:
+        name: Navnet på botten (se BOTS)
+        seed: Seed til bottens tilfældige valg
+    """
+    if name not in BOTS:
+        raise ValueError(f"Ukendt bot: {name} (vælg mellem {', '.join(BOTS)})")
+    return BOTS[name](seed)
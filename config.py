@@ -3,6 +3,9 @@
 WIDTH = 1200  # Skærmbredde i pixels
 HEIGHT = 800  # Skærmhøjde i pixels
 FRAME_RATE = 60  # Opdateringshastighed i billeder per sekund
+RENDER_RATE = 144  # Højeste billedhastighed under kampen (simuleringen kører altid med FRAME_RATE)
+MENU_FRAME_RATE = 30  # Menuens billedhastighed (kun baggrundens cirkler bevæger sig)
+IDLE_TIMEOUT = 500  # Millisekunder pause og slutskærm højst sover mellem hændelser
 
 # Farve konstanter i RGB format
 WHITE = (255, 255, 255)  # Hvid farve
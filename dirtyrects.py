@@ -0,0 +1,82 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Dirty-rect tegning af kampen.
+
+I stedet for at tegne hele banen og opdatere hele skærmen hvert billede
+huskes de rektangler der blev tegnet på sidste gang (spillere, trails,
+skade tekst, nedkølings-ringe og partikler). Næste billede kopieres
+baggrunden (banens statiske lag med træerne, se Bane.updateBackground)
+tilbage under dem, de bevægelige ting tegnes igen, og kun de gamle og nye
+rektangler sendes til pygame.display.update. Det sparer fill-rate på
+skærme der tegnes i software.
+
+Overlag der dækker hele skærmen (rundestart og rundevinder) tegnes med
+den almindelige fulde tegning, og invalidate() sørger for at næste
+dirty-rect billede starter med hele skærmen.
+"""
+import pygame
+
+
+class DirtyRenderer:
+    """
+    Holder styr på hvilke dele af skærmen der skal tegnes og opdateres.
+    """
+
+    def __init__(self, window):
+        """
+        Parametre:
+            window: Skærmens overflade
+        """
+        self.window = window
+        self.previous = []  # Rektangler der blev tegnet på i sidste billede
+        self.current = []  # Rektangler der er tegnet på i dette billede
+        self.changed = []  # Dele af baggrunden der er ændret i dette billede
+        self.full = True  # Næste billede tegnes og opdateres helt
+
+    def invalidate(self):
+        """Næste billede tegner hele baggrunden og opdaterer hele skærmen"""
+        self.full = True
+
+    def begin(self, background, changed):
+        """
+        Starter et billede ved at kopiere baggrunden tilbage under sidste
+        billedes rektangler og de ændrede dele af baggrunden.
+
+        Parametre:
+            background: Baggrunden (samme størrelse som skærmen)
+            changed: Ændrede rektangler i baggrunden (None hvis hele
+                     baggrunden er ny)
+        """
+        window = self.window
+        self.current = []
+        if self.full or changed is None:
+            window.blit(background, (0, 0))
+            self.full = True
+            self.changed = []
+            return
+        for rect in self.previous:
+            window.blit(background, rect, rect)
+        for rect in changed:
+            window.blit(background, rect, rect)
+        self.changed = changed
+
+    def add(self, rect):
+        """
+        Tilføjer et rektangel der er tegnet på i dette billede.
+
+        Parametre:
+            rect: pygame.Rect (None ignoreres)
+        """
+        if rect is not None:
+            self.current.append(rect)
+
+    def present(self):
+        """Opdaterer skærmen med dette billedes ændringer"""
+        if self.full:
+            pygame.display.update()
+            self.full = False
+        else:
+            pygame.display.update(self.previous + self.current + self.changed)
+        self.previous = self.current
+        self.current = []
+        self.changed = []
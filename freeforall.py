@@ -0,0 +1,361 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Alle-mod-alle kampe med mange spillere på samme platform.
+
+Reglerne for bevægelse, slag, knockback, combo og skade er de samme som i
+simulation.py, og kollisionerne afgøres parvis med simulation.collide_all,
+der bruger sweep-and-prune, så antallet af tjek vokser næsten lineært med
+antallet af spillere. En runde slutter når højst én spiller er tilbage på
+platformen (den sidste får et point), eller når tiden løber ud (den
+levende spiller med mindst skade får et point). Falder de sidste spillere
+i samme frame, får de alle et point.
+
+Kør bots mod hinanden headless eller se dem i et vindue:
+    python freeforall.py --fighters 32 --matches 5
+    python freeforall.py --fighters 16 --watch --stage floating
+"""
+import argparse
+import random
+import time
+
+from config import *
+import simulation
+import stages
+from bots import BOTS, make_bot
+
+MIN_FIGHTERS = 2
+MAX_FIGHTERS = 64
+
+
+def spawn_points(platform, count):
+    """
+    Returnerer startpositioner fordelt jævnt over platformen.
+
+    Parametre:
+        platform: Platform eller pygame.Rect
+        count: Antal spillere
+    """
+    if count == 2:
+        return simulation.spawn_points(platform)
+    left = platform.x + SPAWN_DISTANCE
+    right = platform.x + platform.width - SPAWN_DISTANCE
+    y = platform.y - SPAWN_HEIGHT
+    return [(left + (right - left) * i / (count - 1), y) for i in range(count)]
+
+
+def reset_fighters(fighters, platform):
+    """
+    Sætter alle spillere tilbage til deres startpositioner.
+
+    Parametre:
+        fighters: Liste med spillere
+        platform: Platform eller pygame.Rect
+    """
+    for f, (x, y) in zip(fighters, spawn_points(platform, len(fighters))):
+        f.x = simulation.round_position(x)
+        f.y = simulation.round_position(y)
+        simulation.start_position(f)
+
+
+class FreeForAllState:
+    """
+    Tilstanden for en alle-mod-alle kamp. Svarer til simulation.MatchState,
+    men med vilkårligt mange spillere.
+    """
+    __slots__ = (
+        "fighters", "platform", "seed", "tick", "round_num", "round_start_tick",
+        "waiting_for_respawn", "respawn_tick",
+        "showing_round_start", "round_start_display_tick",
+        "round_winner", "game_over", "winner", "rules",
+    )
+
+    def __init__(self, count=8, fighters=None, platform=None, seed=0, rules=None):
+        """
+        Parametre:
+            count: Antal spillere (bruges hvis fighters ikke er givet)
+            fighters: Liste med spillere (valgfri)
+            platform: Platformen (standard er simulation.default_platform())
+            seed: Kampens seed
+            rules: Kampens simulation.Rules (som i simulation.MatchState)
+        """
+        self.platform = platform if platform is not None else simulation.default_platform()
+        self.seed = seed
+        if rules is None:
+            rules = fighters[0].rules if fighters else simulation.DEFAULT_RULES
+        self.rules = rules
+        if fighters is None:
+            if not MIN_FIGHTERS <= count <= MAX_FIGHTERS:
+                raise ValueError(f"Antal spillere skal være mellem {MIN_FIGHTERS} og {MAX_FIGHTERS}")
+            fighters = [simulation.Fighter(0, 0, rules=rules) for _ in range(count)]
+        for index, f in enumerate(fighters):
+            f.index = index
+            f.rules = rules
+        self.fighters = fighters
+        reset_fighters(fighters, self.platform)
+
+        self.tick = 0
+        self.round_num = 1
+        self.round_start_tick = 0
+        self.waiting_for_respawn = False
+        self.respawn_tick = 0
+        self.showing_round_start = False
+        self.round_start_display_tick = 0
+        self.round_winner = None  # Index på rundens vinder, -1 hvis flere delte runden
+        self.game_over = False
+        self.winner = None  # Index på kampens vinder, -1 ved uafgjort
+
+    def time_left(self):
+        """Resterende tid af runden i sekunder"""
+        return max(0, simulation.ROUND_TICKS - (self.tick - self.round_start_tick)) / FRAME_RATE
+
+    def alive(self):
+        """Antal spillere der stadig er på platformen"""
+        return sum(1 for f in self.fighters if not f.is_dead)
+
+
+def award_round(state, winners):
+    """
+    Giver point til rundens vindere og tjekker om kampen er slut.
+
+    Parametre:
+        state: FreeForAllState
+        winners: Liste med index på vinderne (flere ved delt sejr)
+    """
+    for index in winners:
+        state.fighters[index].points += 1
+    state.round_winner = winners[0] if len(winners) == 1 else -1
+    state.waiting_for_respawn = True
+    state.respawn_tick = state.tick
+
+    best = max(f.points for f in state.fighters)
+    if best >= MAX_POINTS:
+        state.game_over = True
+        leaders = [f.index for f in state.fighters if f.points == best]
+        state.winner = leaders[0] if len(leaders) == 1 else -1
+
+
+def reset_round(state):
+    """Starter en ny runde med alle spillere på deres startpositioner"""
+    reset_fighters(state.fighters, state.platform)
+    state.round_num += 1
+    state.round_start_tick = state.tick
+    state.round_winner = None
+    state.showing_round_start = True
+    state.round_start_display_tick = state.tick
+
+
+def step(state, inputs):
+    """
+    Simulerer én frame af kampen i samme rækkefølge som simulation.step.
+
+    Parametre:
+        state: FreeForAllState der opdateres
+        inputs: Input bitfelter, et per spiller
+
+    Returnerer simulation.ROUND_RING_OUT eller ROUND_TIMEOUT når en runde
+    slutter i denne frame, ellers ROUND_CONTINUES.
+    """
+    if state.game_over:
+        return simulation.ROUND_CONTINUES
+
+    fighters = state.fighters
+    platform = state.platform
+    tick = state.tick
+    result = simulation.ROUND_CONTINUES
+    if type(platform) is simulation.Stage:
+        platform.advance(tick)
+    fall_y = simulation.fall_line(platform)
+
+    # Tiden er udløbet - den levende spiller med mindst skade vinder
+    if (tick - state.round_start_tick >= simulation.ROUND_TICKS
+            and not state.waiting_for_respawn and not state.showing_round_start):
+        alive = [f for f in fighters if not f.is_dead] or fighters
+        least = min(f.damage for f in alive)
+        award_round(state, [f.index for f in alive if f.damage == least])
+        result = simulation.ROUND_TIMEOUT
+
+    if not state.showing_round_start:
+        move = simulation.move
+        for f, bits in zip(fighters, inputs):
+            f.events = 0
+            if not f.is_dead:
+                move(f, bits)
+
+        # Tjek for fald i afgrunden
+        fell = []
+        if not state.waiting_for_respawn:
+            for f in fighters:
+                if not f.is_dead and f.y > fall_y:
+                    f.is_dead = True
+                    fell.append(f.index)
+
+        update = simulation.update
+        for f in fighters:
+            if not f.is_dead:
+                update(f, platform)
+
+        simulation.collide_all(fighters)
+
+        # Runden slutter når højst én spiller er tilbage
+        if fell and not state.waiting_for_respawn:
+            alive = [f.index for f in fighters if not f.is_dead]
+            if len(alive) <= 1:
+                award_round(state, alive or fell)
+                result = simulation.ROUND_RING_OUT
+
+    # Håndter respawn timing
+    if state.waiting_for_respawn and tick - state.respawn_tick >= simulation.RESPAWN_TICKS:
+        state.waiting_for_respawn = False
+        reset_round(state)
+
+    # Skjul rundenummeret når tiden er gået
+    if state.showing_round_start and tick - state.round_start_display_tick >= simulation.ROUND_START_TICKS:
+        state.showing_round_start = False
+
+    state.tick = tick + 1
+    return result
+
+
+def run_match(state, controllers, max_ticks=None):
+    """
+    Kører en kamp headless til den er slut.
+
+    Parametre:
+        state: FreeForAllState der skal spilles
+        controllers: En funktion per spiller, controller(state, index) -> input bits
+        max_ticks: Valgfri grænse for antal frames
+
+    Returnerer den færdige FreeForAllState.
+    """
+    indexed = list(enumerate(controllers))
+    while not state.game_over:
+        if max_ticks is not None and state.tick >= max_ticks:
+            break
+        step(state, [controller(state, index) for index, controller in indexed])
+    return state
+
+
+def make_controllers(names, count, seed):
+    """
+    Opretter en bot per spiller. Bottene går på skift gennem names.
+
+    Parametre:
+        names: Navne på bots (se bots.BOTS)
+        count: Antal spillere
+        seed: Seed til bottenes valg
+    """
+    return [make_bot(names[i % len(names)], seed * MAX_FIGHTERS + i) for i in range(count)]
+
+
+def fighter_colors(count):
+    """Returnerer count forskellige farver fordelt rundt om farvehjulet"""
+    import pygame
+    colors = []
+    for i in range(count):
+        color = pygame.Color(0)
+        color.hsva = (360 * i / count, 70, 90, 100)
+        colors.append((color.r, color.g, color.b))
+    return colors
+
+
+def watch(count, names, seed, stage="classic"):
+    """
+    Viser en kamp mellem bots i et vindue.
+
+    Parametre:
+        count: Antal spillere
+        names: Navne på bots
+        seed: Kampens seed
+        stage: Banens platforme (se stages.STAGE_NAMES)
+    """
+    import pygame
+    import hud
+    import textcache
+    from bane2 import Bane
+    from particles import ParticlePool
+    from talhaspiller import Spiller
+
+    pygame.init()
+    window = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Sumo Slammers - alle mod alle")
+    rng = random.Random(seed)
+    bane = Bane(WIDTH, HEIGHT, rng, stage)
+    particles = ParticlePool()
+    platform = bane.stage
+    spillere = [Spiller(0, 0, color, f"Spiller {i + 1}", rng, particles)
+                for i, color in enumerate(fighter_colors(count))]
+    state = FreeForAllState(fighters=spillere, platform=platform, seed=seed)
+    controllers = make_controllers(names, count, seed)
+    clock = pygame.time.Clock()
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+
+        if not state.game_over:
+            round_num = state.round_num
+            step(state, [controller(state, index) for index, controller in enumerate(controllers)])
+            if state.round_num != round_num:
+                particles.clear()
+            elif not state.showing_round_start:
+                particles.update()
+            for spiller in spillere:
+                spiller.spawn_effects()
+
+        bane.draw(window)
+        particles.draw(window)
+        for spiller in spillere:
+            if not spiller.is_dead:
+                spiller.draw(window)
+
+        leader = max(spillere, key=lambda s: s.points)
+        status = (f"Runde {state.round_num}  -  {state.alive()} tilbage  -  "
+                  f"{leader.name} fører med {leader.points}")
+        window.blit(textcache.render_text(status, MEDIUM_FONT, WHITE), (20, 10))
+        if state.game_over:
+            text = "Uafgjort!" if state.winner == -1 else f"{spillere[state.winner].name} vandt!"
+            hud.get_overlay((WIDTH, HEIGHT), (
+                (text, LARGE_FONT, GOLD, (WIDTH//2, HEIGHT//2), "center"),
+            ), dim=BLACK).draw(window)
+
+        pygame.display.update()
+        clock.tick(FRAME_RATE)
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alle-mod-alle kampe mellem bots")
+    parser.add_argument("--fighters", type=int, default=16, help="Antal spillere (2-64)")
+    parser.add_argument("--bots", nargs="+", default=["rusher", "keeper", "jumper", "random"],
+                        choices=list(BOTS), help="Bots der fordeles på spillerne")
+    parser.add_argument("--matches", type=int, default=3, help="Antal kampe headless")
+    parser.add_argument("--seed", type=int, default=1, help="Seed til kampene")
+    parser.add_argument("--stage", default="classic", choices=stages.STAGE_NAMES, help="Banens platforme")
+    parser.add_argument("--watch", action="store_true", help="Vis én kamp i et vindue")
+    args = parser.parse_args()
+    if not MIN_FIGHTERS <= args.fighters <= MAX_FIGHTERS:
+        parser.error(f"--fighters skal være mellem {MIN_FIGHTERS} og {MAX_FIGHTERS}")
+
+    if args.watch:
+        watch(args.fighters, args.bots, args.seed, args.stage)
+        return
+
+    total_ticks = 0
+    start = time.perf_counter()
+    for match in range(args.matches):
+        seed = args.seed + match
+        state = run_match(FreeForAllState(args.fighters, platform=stages.make_stage(args.stage), seed=seed),
+                          make_controllers(args.bots, args.fighters, seed),
+                          max_ticks=simulation.ROUND_TICKS * MAX_POINTS * args.fighters)
+        total_ticks += state.tick
+        winner = "uafgjort" if state.winner in (None, -1) else f"spiller {state.winner + 1}"
+        print(f"Kamp {match + 1}: {winner} efter {state.round_num} runder og {state.tick} ticks")
+    elapsed = time.perf_counter() - start
+    print(f"{total_ticks} ticks med {args.fighters} spillere på {elapsed:.2f} sekunder "
+          f"({total_ticks / elapsed:,.0f} ticks/sekund)")
+
+
+if __name__ == "__main__":
+    main()
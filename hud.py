@@ -0,0 +1,155 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Cachede HUD lag.
+
+- ScoreBar tegner pointbjælken i toppen af skærmen til sin egen overflade
+  og tegner den kun forfra når point eller det viste sekund ændrer sig.
+- get_overlay(...) giver færdige fuldskærms-overlag (mørkt lag plus
+  beskeder), så rundeskift og pause ikke opretter nye overflader og
+  renderer tekst hver frame. Det mørke lag er én delt overflade med
+  overflade-alpha, som er billigere at blitte end per-pixel alpha.
+"""
+import pygame
+
+import textcache
+
+OVERLAY_ALPHA = 128  # Gennemsigtighed for det mørke lag bag beskederne
+SCORE_BAR_HEIGHT = 50
+
+_dim_layers = {}
+_overlays = {}
+
+
+def dim_layer(size, color, alpha=OVERLAY_ALPHA):
+    """
+    Returnerer det delte mørke lag i den givne størrelse og farve.
+
+    Parametre:
+        size: (bredde, højde)
+        color: Lagets farve
+        alpha: Lagets gennemsigtighed
+    """
+    key = (size, color, alpha)
+    layer = _dim_layers.get(key)
+    if layer is None:
+        layer = pygame.Surface(size)
+        layer.fill(color)
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert()
+        layer.set_alpha(alpha)
+        _dim_layers[key] = layer
+    return layer
+
+
+class Overlay:
+    """
+    Et færdigt overlag: et valgfrit mørkt lag og placerede tekster.
+    """
+
+    def __init__(self, size, lines, dim=None):
+        """
+        Parametre:
+            size: Skærmens (bredde, højde)
+            lines: Sekvens af (tekst, skriftstørrelse, farve, position, anker),
+                   hvor anker er "center" eller "midtop"
+            dim: Farven skærmen gøres mørkere med bag teksten (None for intet lag)
+        """
+        self.dim = dim_layer(size, dim) if dim is not None else None
+        self.placements = []
+        for text, font_size, color, position, anchor in lines:
+            surface = textcache.render_text(text, font_size, color)
+            rect = surface.get_rect(**{anchor: position})
+            self.placements.append((surface, rect))
+
+    def draw(self, window):
+        if self.dim is not None:
+            window.blit(self.dim, (0, 0))
+        for surface, rect in self.placements:
+            window.blit(surface, rect)
+
+
+def get_overlay(size, lines, dim=None):
+    """
+    Returnerer et delt overlag (bygges kun første gang for de samme beskeder).
+
+    Parametre:
+        size: Skærmens (bredde, højde)
+        lines: Sekvens af (tekst, skriftstørrelse, farve, position, anker)
+        dim: Farven skærmen gøres mørkere med bag teksten (None for intet lag)
+    """
+    key = (size, tuple(lines), dim)
+    overlay = _overlays.get(key)
+    if overlay is None:
+        overlay = Overlay(size, lines, dim)
+        _overlays[key] = overlay
+    return overlay
+
+
+class ScoreBar:
+    """
+    Pointbjælken i toppen af skærmen med begge spilleres point og uret.
+    """
+
+    def __init__(self, width, font_size, background, colors, clock_color):
+        """
+        Parametre:
+            width: Skærmens bredde
+            font_size: Skriftstørrelse
+            background: Bjælkens baggrundsfarve
+            colors: Farverne til (spiller 1, spiller 2)
+            clock_color: Urets farve
+        """
+        self.width = width
+        self.font_size = font_size
+        self.background = background
+        self.colors = colors
+        self.clock_color = clock_color
+        self.surface = None
+        self.key = None
+
+    def draw(self, window, p1_text, p2_text, time_text):
+        """
+        Tegner bjælken og renderer den kun forfra når en af teksterne har ændret sig.
+
+        Parametre:
+            window: Overfladen der tegnes på
+            p1_text, p2_text: Spillernes navn og point
+            time_text: Den resterende tid
+
+        Returnerer bjælkens rektangel hvis den er tegnet forfra, ellers None.
+        """
+        key = (p1_text, p2_text, time_text)
+        changed = key != self.key
+        if changed:
+            self.render(p1_text, p2_text, time_text)
+            self.key = key
+        rect = window.blit(self.surface, (0, 0))
+        return rect if changed else None
+
+    def rect(self):
+        """Området bjælken dækker"""
+        return pygame.Rect(0, 0, self.width, SCORE_BAR_HEIGHT)
+
+    def render(self, p1_text, p2_text, time_text):
+        if self.surface is None:
+            self.surface = pygame.Surface((self.width, SCORE_BAR_HEIGHT))
+            if pygame.display.get_surface() is not None:
+                self.surface = self.surface.convert()
+        surface = self.surface
+        surface.fill(self.background)
+        p1_render = textcache.render_text(p1_text, self.font_size, self.colors[0])
+        p2_render = textcache.render_text(p2_text, self.font_size, self.colors[1])
+        surface.blit(p1_render, (20, 10))
+        surface.blit(p2_render, (self.width - 20 - p2_render.get_width(), 10))
+        time_atlas = textcache.get_atlas(self.font_size, self.clock_color)
+        time_atlas.draw(surface, time_text, topleft=(self.width//2 - time_atlas.width(time_text)//2, 10))
+
+    def invalidate(self):
+        """Tving bjælken til at blive tegnet forfra næste gang"""
+        self.key = None
+
+
+def clear():
+    """Tømmer alle caches (f.eks. efter pygame.quit)"""
+    _dim_layers.clear()
+    _overlays.clear()
@@ -2,26 +2,29 @@
 
 import pygame
 from bane2 import Bane
+import assetloader
 import os
 import math
 import random
 
 class Menu:
-    def __init__(self, width, height):
+    def __init__(self, width, height, rng=None, assets=None):
+        # seedet tilfældighedsgenerator til baggrundens cirkler
+        self.rng = rng if rng is not None else random.Random()
+
         # gem skærmens dimensioner som attributter
         self.width = width
         
         self.height = height
         
         # gammelt forsøg på at indlæse den her skrifttype, men vi bruger bare standard font nu
-        try:
-            self.title_font = pygame.font.Font("assets/fonts/yumin.ttf", 100)
-        except:
-            self.title_font = pygame.font.Font(None, 100)
+        # (filen findes ikke, så den springes over uden at prøve at åbne den)
+        title_font_path = "assets/fonts/yumin.ttf"
+        self.title_font = pygame.font.Font(title_font_path if assetloader.exists(title_font_path) else None, 100)
         self.menu_font = pygame.font.Font(None, 50)
         
         # menu valgmuligheder og knapper
-        self.options = ["Start Game", "Quit"]
+        self.options = ["Start Game", "Play vs CPU", "Quit"]
         self.selected = 0  # indeks for valgt menupunkt
         self.buttons = []  # liste til rektangler for hver menu mulighed
         
@@ -31,75 +34,84 @@ class Menu:
         self.unselected_color = (255, 255, 255)  # hvid farve til ikke valgte punkter
         
         # baggrunds animation
+        self.circle_sprites = {}  # størrelse -> færdigtegnet cirkel
         self.circles = []
         for _ in range(20):
             self.circles.append({
-                'x': random.randint(0, width),  # tilfældig x position
-                'y': random.randint(0, height),  # tilfældig y position
-                'size': random.randint(50, 150),  # tilfældig størrelse
-                'speed': random.uniform(0.5, 2)  # tilfældig hastighed
+                'x': self.rng.randint(0, width),  # tilfældig x position
+                'y': self.rng.randint(0, height),  # tilfældig y position
+                'size': self.rng.randint(50, 150),  # tilfældig størrelse
+                'speed': self.rng.uniform(0.5, 2)  # tilfældig hastighed
             })
+        for circle in self.circles:
+            circle['sprite'] = self.circle_sprite(circle['size'])
         
-        # initialiser lydmixer hvis ikke allerede initialiseret
-        if not pygame.mixer.get_init():
-            pygame.mixer.init()
-            
-        # indlæs og afspil baggrundsmusik
-        try:
-            pygame.mixer.music.load("assets/mainmenu.mp3")
-            pygame.mixer.music.set_volume(0.5)  # lydstyrke sat til 50%
-            pygame.mixer.music.play(-1)  # -1 betyder uendelig gentagelse
-        except Exception as e:
-            print(f"Advarsel: Kunne ikke indlæse mainmenu.mp3: {e}")
-            
-        # lydeffekter
-        self.hover_sound = None  # lyd ved markør over menupunkt
-        self.select_sound = None  # lyd ved valg af menupunkt
-        try:
-            self.hover_sound = pygame.mixer.Sound("assets/hover.wav") # DER ER IKKE NOGEN HOVER SOUND; ELLER SELECT, GAMMEL KODE!!!
-            self.select_sound = pygame.mixer.Sound("assets/select.wav")
-        except:
-            print("Advarsel: Kunne ikke indlæse lydeffekter")
+        # titel og menu tekster renderes én gang
+        self.title = self.title_font.render("Sumo Slammers", True, self.title_color)
+        self.title_rect = self.title.get_rect(center=(self.width//2, self.height//4))
+        self.render_options()
+        
+        # lydeffekter og baggrundsmusik indlæses i baggrunden (se assetloader.py)
+        self.assets = assets
+        if assets is not None:
+            # DER ER IKKE NOGEN HOVER SOUND; ELLER SELECT, GAMMEL KODE!!! (springes over hvis de mangler)
+            assets.load_sound("hover", "assets/hover.wav", optional=True)  # lyd ved markør over menupunkt
+            assets.load_sound("select", "assets/select.wav", optional=True)  # lyd ved valg af menupunkt
+            assets.set_music("assets/mainmenu.mp3", 0.5)  # lydstyrke sat til 50%
+            assets.play_music()  # spiller fra næste billede
+
+    def play_sound(self, name):
+        """afspil en lydeffekt hvis den er indlæst"""
+        if self.assets is not None:
+            self.assets.play(name)
+
+    def circle_sprite(self, size):
+        """returner en gennemsigtig cirkel sprite (tegnes kun første gang for hver størrelse)"""
+        sprite = self.circle_sprites.get(size)
+        if sprite is None:
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (255, 255, 255, 30), (size//2, size//2), size//2)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            self.circle_sprites[size] = sprite
+        return sprite
+
+    def render_options(self):
+        """render menu mulighederne i begge farver og placer knapperne"""
+        button_height = 50
+        start_y = self.height//2
+        self.option_texts = []  # [ikke valgt, valgt] for hver mulighed
+        self.buttons = []  # liste til rektangler for hver menu mulighed
+        for i, option in enumerate(self.options):
+            texts = [self.menu_font.render(option, True, self.unselected_color),
+                     self.menu_font.render(option, True, self.selected_color)]
+            self.option_texts.append(texts)
+            self.buttons.append(texts[0].get_rect(center=(self.width//2, start_y + i * button_height)))
 
-    def draw_background(self, screen):
-        """tegn animeret baggrund med cirkler"""
+    def draw_background(self, screen, frames=1):
+        """tegn animeret baggrund med cirkler (frames er antal billeder ved FRAME_RATE siden sidst)"""
         # update og tegn hver cirkel
         for circle in self.circles:
             # update y position med hastighed
-            circle['y'] = (circle['y'] + circle['speed']) % self.height
+            circle['y'] = (circle['y'] + circle['speed'] * frames) % self.height
             
-            # tegn cirkel med gennemsigtighed
-            surface = pygame.Surface((circle['size'], circle['size']), pygame.SRCALPHA)
-            pygame.draw.circle(surface, (255, 255, 255, 30), 
-                             (circle['size']//2, circle['size']//2), 
-                             circle['size']//2)
-            screen.blit(surface, (circle['x'], circle['y']))
+            # tegn den færdige cirkel med gennemsigtighed
+            screen.blit(circle['sprite'], (circle['x'], circle['y']))
     
-    def draw(self, screen):
-        """tegn hele menuen"""
+    def draw(self, screen, frames=1):
+        """tegn hele menuen (frames er antal billeder ved FRAME_RATE siden sidst)"""
         # tegn sort baggrund
         screen.fill((0, 0, 0))
         
         # tegn animeret baggrund
-        self.draw_background(screen)
+        self.draw_background(screen, frames)
         
         # tegn titel
-        title = self.title_font.render("Sumo Slammers", True, self.title_color)
-        title_rect = title.get_rect(center=(self.width//2, self.height//4))
-        screen.blit(title, title_rect)
+        screen.blit(self.title, self.title_rect)
         
-        # tegn menu muligheder
-        button_height = 50
-        start_y = self.height//2
-        self.buttons = []  # nulstil knapliste
-        
-        # tegn hver menu mulighed
-        for i, option in enumerate(self.options):
-            color = self.selected_color if i == self.selected else self.unselected_color
-            text = self.menu_font.render(option, True, color)
-            rect = text.get_rect(center=(self.width//2, start_y + i * button_height))
-            screen.blit(text, rect)
-            self.buttons.append(rect)
+        # tegn hver menu mulighed (valgt punkt i guld, samme størrelse i begge farver)
+        for i, texts in enumerate(self.option_texts):
+            screen.blit(texts[i == self.selected], self.buttons[i])
     
     def handle_input(self, event):
         """håndter bruger input"""
@@ -107,16 +119,13 @@ class Menu:
             # naviger op/ned i menuen
             if event.key == pygame.K_UP:
                 self.selected = (self.selected - 1) % len(self.options)
-                if self.hover_sound:
-                    self.hover_sound.play()
+                self.play_sound("hover")
             elif event.key == pygame.K_DOWN:
                 self.selected = (self.selected + 1) % len(self.options)
-                if self.hover_sound:
-                    self.hover_sound.play()
+                self.play_sound("hover")
             # vælg menu punkt ved enter/space
             elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                if self.select_sound:
-                    self.select_sound.play()
+                self.play_sound("select")
                 return self.options[self.selected]
         
         # håndter mus input
@@ -126,16 +135,14 @@ class Menu:
                 if rect.collidepoint(event.pos):
                     if self.selected != i:
                         self.selected = i
-                        if self.hover_sound:
-                            self.hover_sound.play()
+                        self.play_sound("hover")
         
         elif event.type == pygame.MOUSEBUTTONDOWN:
             # tjek for klik på menupunkter
             if event.button == 1:  # venstre museklik
                 for i, rect in enumerate(self.buttons):
                     if rect.collidepoint(event.pos):
-                        if self.select_sound:
-                            self.select_sound.play()
+                        self.play_sound("select")
                         return self.options[i]
         
         return None  # ingen handling valgt
\ No newline at end of file
@@ -0,0 +1,513 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Online kampe for to spillere med rollback.
+
+Begge maskiner simulerer hele kampen selv med simulation.step. Den lokale
+spillers input bruges med det samme (efter en lille fast forsinkelse på
+INPUT_DELAY frames), og modstanderens input gættes: det gentager det
+seneste input der er modtaget. Når det rigtige input kommer frem og
+afviger fra gættet, sættes kampen tilbage til et snapshot fra før
+frame'en (MatchState.snapshot/restore) og simuleres frem igen. Kommer en
+maskine mere end MAX_ROLLBACK frames foran den anden, venter den.
+
+Inputtet sendes over UDP. Hver pakke har alle frames modtageren ikke har
+kvitteret for endnu, så et tabt pakke bliver dækket af den næste. En
+kontrolsum af kampen for en bekræftet frame sendes med, så en afvigelse
+mellem de to maskiner opdages. UdpTransport kan forsinke og tabe pakker
+med vilje, så det hele kan prøves på én maskine.
+
+To vinduer på samme maskine (80 ms hver vej og 5% pakketab):
+    python netplay.py --player 1 --port 7001 --peer 127.0.0.1:7002 --latency 80 --loss 0.05
+    python netplay.py --player 2 --port 7002 --peer 127.0.0.1:7001 --latency 80 --loss 0.05
+Begge sider headless i én proces med bots:
+    python netplay.py --selftest --latency 100 --jitter 20 --loss 0.1
+"""
+import argparse
+import heapq
+import random
+import socket
+import struct
+import sys
+import time
+import zlib
+
+from config import *
+import simulation
+import stages
+from bots import BOTS, make_bot
+
+INPUT_DELAY = 2  # Frames det lokale input forsinkes (giver modstanderens input et forspring)
+MAX_ROLLBACK = 12  # Højeste antal frames der gættes før der ventes på modstanderen
+MAX_PACKET_INPUTS = 64  # Højeste antal input frames i én pakke
+CHECKSUM_INTERVAL = 30  # Frames mellem kontrolsummer
+SELFTEST_TIMEOUT = 120  # Sekunder selvtesten højst må køre
+
+MAGIC = b"SSNP"
+
+# magic, seed, kvittering, kontrolsummens frame, kontrolsum, første input frame, antal input
+PACKET = struct.Struct("<4sIiiIiB")
+
+
+class UdpTransport:
+    """
+    UDP forbindelse til den anden spiller. Latens, jitter og pakketab
+    lægges på når der sendes, så begge retninger kan styres hver for sig.
+    """
+
+    def __init__(self, port, peer, latency=0, jitter=0, loss=0.0, seed=None,
+                 host="127.0.0.1", clock=time.perf_counter):
+        """
+        Parametre:
+            port: Lokal UDP port (0 vælger en ledig port)
+            peer: (host, port) for den anden spiller (kan sættes senere)
+            latency: Ekstra forsinkelse i millisekunder hver vej
+            jitter: Tilfældig variation af forsinkelsen i millisekunder
+            loss: Andel af pakkerne der smides væk (0.0 - 1.0)
+            seed: Seed til pakketab og jitter
+            host: Lokal adresse
+            clock: Funktion der giver tiden i sekunder
+        """
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.peer = peer
+        self.latency = latency / 1000
+        self.jitter = jitter / 1000
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.clock = clock
+        self.outgoing = []  # Heap med (afsendelsestid, nummer, data)
+        self.sequence = 0
+        self.sent = 0
+        self.dropped = 0
+
+    @property
+    def port(self):
+        return self.sock.getsockname()[1]
+
+    def send(self, data):
+        """
+        Sender en pakke efter latens og jitter (eller taber den).
+
+        Parametre:
+            data: Pakkens bytes
+        """
+        if self.loss and self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = self.latency
+        if self.jitter:
+            delay = max(0.0, delay + self.rng.uniform(-self.jitter, self.jitter))
+        self.sequence += 1
+        heapq.heappush(self.outgoing, (self.clock() + delay, self.sequence, data))
+        self.flush()
+
+    def flush(self):
+        """Sender de pakker hvis forsinkelse er udløbet"""
+        now = self.clock()
+        outgoing = self.outgoing
+        while outgoing and outgoing[0][0] <= now:
+            data = heapq.heappop(outgoing)[2]
+            try:
+                self.sock.sendto(data, self.peer)
+                self.sent += 1
+            except OSError:
+                self.dropped += 1  # F.eks. hvis den anden spiller ikke kører endnu
+
+    def receive(self):
+        """Returnerer en liste med de pakker der er kommet"""
+        self.flush()
+        packets = []
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(2048)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            packets.append(data)
+        return packets
+
+    def close(self):
+        self.sock.close()
+
+
+class RollbackSession:
+    """
+    Én spillers side af en online kamp. advance() kaldes én gang per
+    frame med det lokale input og simulerer kampen frem (med rollback når
+    modstanderens rigtige input afviger fra gættet).
+    """
+
+    def __init__(self, state, local_index, transport, input_delay=INPUT_DELAY, max_rollback=MAX_ROLLBACK):
+        """
+        Parametre:
+            state: MatchState der spilles (samme seed og bane på begge maskiner)
+            local_index: 0 hvis den lokale spiller er spiller 1, ellers 1
+            transport: UdpTransport til den anden spiller
+            input_delay: Frames det lokale input forsinkes
+            max_rollback: Højeste antal frames der gættes før der ventes
+        """
+        self.state = state
+        self.local_index = local_index
+        self.transport = transport
+        self.max_rollback = max_rollback
+        self.frame = 0  # Antal simulerede frames
+
+        self.local_inputs = bytearray(input_delay)  # Lokalt input for hver frame
+        self.remote_inputs = bytearray()  # Modstanderens bekræftede input (uden huller)
+        self.predicted = bytearray()  # Modstanderens input som det blev brugt i simuleringen
+        self.remote_ack = 0  # Antal lokale input frames modstanderen har modtaget
+        self.rollback_frame = None  # Første frame der skal simuleres igen
+
+        self.snapshots = [None] * (max_rollback + 2)  # Kampen før hver af de seneste frames
+        self.checksums = {}  # Frame -> kontrolsum af kampen før den frame
+        self.next_checksum = CHECKSUM_INTERVAL
+        self.remote_checksum = None  # (frame, kontrolsum) fra modstanderen
+        self.desync_frame = None  # Første frame hvor maskinerne var uenige
+
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.stalls = 0
+
+    @property
+    def remote_confirmed(self):
+        """Antal frames hvor modstanderens input er kendt"""
+        return len(self.remote_inputs)
+
+    def advance(self, local_bits):
+        """
+        Simulerer én frame med det lokale input.
+
+        Parametre:
+            local_bits: Den lokale spillers input bitfelt
+
+        Returnerer True hvis der blev simuleret en frame, False hvis der
+        ventes på modstanderen.
+        """
+        self.poll()
+        if self.rollback_frame is not None:
+            self.rollback(self.rollback_frame)
+        self.finish_checksums()
+
+        # Vent hvis vi er for langt foran modstanderen
+        if self.frame - self.remote_confirmed >= self.max_rollback:
+            self.stalls += 1
+            self.send()
+            return False
+
+        self.local_inputs.append(local_bits & 0x0F)
+        self.simulate()
+        self.send()
+        return True
+
+    def poll(self):
+        """Modtager modstanderens pakker og finder ud af om der skal rulles tilbage"""
+        for data in self.transport.receive():
+            if len(data) < PACKET.size:
+                continue
+            magic, seed, ack, checksum_frame, checksum, start, count = PACKET.unpack_from(data)
+            if magic != MAGIC:
+                continue
+            if seed != self.state.seed:
+                raise ValueError(f"Modstanderen spiller med seed {seed}, forventede {self.state.seed}")
+            self.remote_ack = max(self.remote_ack, ack)
+            if checksum_frame >= 0:
+                self.remote_checksum = (checksum_frame, checksum)
+
+            inputs = data[PACKET.size:PACKET.size + count]
+            for frame in range(self.remote_confirmed, start + len(inputs)):
+                if frame < start:
+                    break  # Hul - de manglende frames kommer med en senere pakke
+                bits = inputs[frame - start]
+                self.remote_inputs.append(bits)
+                if frame < self.frame and bits != self.predicted[frame]:
+                    if self.rollback_frame is None or frame < self.rollback_frame:
+                        self.rollback_frame = frame
+        self.check_desync()
+
+    def remote_input(self, frame):
+        """Modstanderens input for en frame - bekræftet eller gættet"""
+        remote = self.remote_inputs
+        if frame < len(remote):
+            return remote[frame]
+        return remote[-1] if remote else 0  # Gæt: samme taster som sidst
+
+    def simulate(self):
+        """Simulerer næste frame og gemmer et snapshot fra før den"""
+        frame = self.frame
+        state = self.state
+        self.snapshots[frame % len(self.snapshots)] = state.snapshot()
+        remote = self.remote_input(frame)
+        if frame < len(self.predicted):
+            self.predicted[frame] = remote
+        else:
+            self.predicted.append(remote)
+        local = self.local_inputs[frame]
+        simulation.step(state, (local, remote) if self.local_index == 0 else (remote, local))
+        self.frame = frame + 1
+
+    def rollback(self, frame):
+        """
+        Sætter kampen tilbage til før frame og simulerer frem igen med det
+        input der kendes nu.
+
+        Parametre:
+            frame: Første frame med et forkert gæt
+        """
+        self.rollback_frame = None
+        if frame >= self.frame:
+            return
+        self.state.restore(self.snapshots[frame % len(self.snapshots)])
+        target = self.frame
+        self.frame = frame
+        while self.frame < target:
+            self.simulate()
+        self.rollbacks += 1
+        self.resimulated += target - frame
+
+    def finish_checksums(self):
+        """Beregner kontrolsummer for frames hvor alt input nu er bekræftet"""
+        last = min(self.remote_confirmed, self.frame - 1)
+        while self.next_checksum <= last:
+            frame = self.next_checksum
+            self.checksums[frame] = zlib.crc32(self.snapshots[frame % len(self.snapshots)])
+            self.checksums.pop(frame - CHECKSUM_INTERVAL * 8, None)  # Gem kun de seneste
+            self.next_checksum += CHECKSUM_INTERVAL
+        self.check_desync()
+
+    def check_desync(self):
+        """Sammenligner modstanderens seneste kontrolsum med vores egen"""
+        if self.remote_checksum is None or self.desync_frame is not None:
+            return
+        frame, checksum = self.remote_checksum
+        if frame in self.checksums and self.checksums[frame] != checksum:
+            self.desync_frame = frame
+
+    def settle(self):
+        """
+        Kaldes i stedet for advance() når der ikke simuleres flere frames
+        (f.eks. når kampen er slut). Sender og modtager input og ruller
+        tilbage hvis modstanderens rigtige input afviger fra gættet - et
+        gættet ring-out kan altså stadig blive lavet om.
+
+        Returnerer True når modstanderens input er bekræftet for alle frames
+        i kampen, så resultatet er det samme på begge maskiner.
+        """
+        self.poll()
+        if self.rollback_frame is not None:
+            self.rollback(self.rollback_frame)
+        self.finish_checksums()
+        self.send()
+        # Efter game over tæller kampen ikke flere frames, så kun frames til og med slutningen skal bekræftes
+        last = self.state.tick if self.state.game_over else self.frame
+        return self.remote_confirmed >= last
+
+    def send(self):
+        """
+        Sender alle de lokale input modstanderen ikke har kvitteret for,
+        delt i flere pakker hvis der er mere end MAX_PACKET_INPUTS.
+        """
+        if self.checksums:
+            checksum_frame = max(self.checksums)
+            checksum = self.checksums[checksum_frame]
+        else:
+            checksum_frame, checksum = -1, 0
+        start = self.remote_ack
+        end = len(self.local_inputs)
+        while True:
+            inputs = self.local_inputs[start:start + MAX_PACKET_INPUTS]
+            header = PACKET.pack(MAGIC, self.state.seed, self.remote_confirmed,
+                                 checksum_frame, checksum, start, len(inputs))
+            self.transport.send(header + bytes(inputs))
+            start += len(inputs)
+            if start >= end:
+                break
+
+    def stats(self):
+        """Returnerer en tekst med rollbacks, ventetid og pakker"""
+        return (f"frame {self.frame}, {self.rollbacks} rollbacks ({self.resimulated} frames simuleret igen), "
+                f"{self.stalls} ventede frames, {self.transport.sent} pakker sendt, "
+                f"{self.transport.dropped} tabt")
+
+
+def parse_peer(text):
+    """Omsætter "host:port" til (host, port)"""
+    host, _, port = text.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+def selftest(frames, latency, jitter, loss, seed, stage, bots):
+    """
+    Spiller en kamp mellem to bots over UDP på localhost i én proces med
+    et simuleret ur (så testen kører hurtigere end realtid) og tjekker at
+    begge sider ender med samme kamp som en almindelig simulering.
+
+    Returnerer 0 hvis alt stemmer, ellers 1.
+    """
+    now = [0.0]
+    clock = lambda: now[0]
+    transports = [UdpTransport(0, None, latency, jitter, loss, seed + i, clock=clock) for i in range(2)]
+    transports[0].peer = ("127.0.0.1", transports[1].port)
+    transports[1].peer = ("127.0.0.1", transports[0].port)
+    sessions = [RollbackSession(simulation.MatchState(platform=stages.make_stage(stage), seed=seed), i, transports[i])
+                for i in range(2)]
+    controllers = [make_bot(bots[i], seed + i) for i in range(2)]
+
+    # Kør til begge sider har simuleret alle frames, og send de sidste input
+    # til de er bekræftet. Antallet af runder afhænger af latens og pakketab,
+    # så der er kun en grænse i sekunder (hvis noget hænger).
+    deadline = time.perf_counter() + SELFTEST_TIMEOUT
+    while not all(session.frame >= frames and session.remote_confirmed >= frames for session in sessions):
+        if time.perf_counter() > deadline:
+            print(f"Selvtesten nåede ikke {frames} frames på {SELFTEST_TIMEOUT} sekunder")
+            for index, session in enumerate(sessions):
+                print(f"Spiller {index + 1}: {session.stats()}")
+            for transport in transports:
+                transport.close()
+            return 1
+        now[0] += 1 / FRAME_RATE
+        for index, session in enumerate(sessions):
+            if session.frame < frames:
+                session.advance(controllers[index](session.state, index))
+            else:
+                session.settle()
+        time.sleep(0)  # Giv styresystemet lov til at levere pakkerne
+
+    # Den samme kamp uden netværk
+    reference = simulation.MatchState(platform=stages.make_stage(stage), seed=seed)
+    inputs = list(zip(sessions[0].local_inputs, sessions[1].local_inputs))
+    for frame in range(frames):
+        simulation.step(reference, inputs[frame])
+
+    failed = False
+    for index, session in enumerate(sessions):
+        same = session.state.snapshot() == reference.snapshot()
+        failed |= not same or session.desync_frame is not None
+        print(f"Spiller {index + 1}: {'OK' if same else 'AFVIGER'} - {session.stats()}")
+        if session.desync_frame is not None:
+            print(f"  Kontrolsum afveg ved frame {session.desync_frame}")
+    f1, f2 = reference.fighters
+    print(f"{frames} frames med {latency} ms latens, {jitter} ms jitter og {loss:.0%} pakketab - "
+          f"stilling {f1.points}-{f2.points}")
+    for transport in transports:
+        transport.close()
+    return 1 if failed else 0
+
+
+def play(player, port, peer, latency, jitter, loss, seed, stage):
+    """
+    Spiller en online kamp i et vindue. Den lokale spiller styres med
+    A/D/W/S eller piletasterne.
+
+    Parametre:
+        player: 1 eller 2
+        port: Lokal UDP port
+        peer: (host, port) for den anden spiller
+        latency, jitter, loss: Kunstig forsinkelse og pakketab (til test)
+        seed: Kampens seed (skal være det samme på begge maskiner)
+        stage: Banens platforme (skal være den samme på begge maskiner)
+    """
+    import pygame
+    import hud
+    import textcache
+    from bane2 import Bane
+    from particles import ParticlePool
+    from talhaspiller import Spiller, read_input
+    from talhamain import display_points, display_round_start, display_round_winner
+
+    pygame.init()
+    window = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(f"Sumo Slammers - online (spiller {player})")
+    rng = random.Random(seed)
+    bane = Bane(WIDTH, HEIGHT, rng, stage)
+    particles = ParticlePool()
+    platform = bane.stage
+    spiller1 = Spiller(platform.x + SPAWN_DISTANCE, platform.y - SPAWN_HEIGHT, RED, "Rød Spiller", rng, particles)
+    spiller2 = Spiller(platform.x + platform.width - SPAWN_DISTANCE, platform.y - SPAWN_HEIGHT,
+                       BLUE, "Blå Spiller", rng, particles)
+    state = simulation.MatchState([spiller1, spiller2], platform, seed)
+    transport = UdpTransport(port, peer, latency, jitter, loss, seed=seed + player)
+    session = RollbackSession(state, player - 1, transport)
+    clock = pygame.time.Clock()
+
+    running = True
+    final = False  # Kampen er slut og modstanderens input er bekræftet til slutningen
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+
+        keys = pygame.key.get_pressed()
+        bits = (read_input(keys, pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s) |
+                read_input(keys, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN))
+        round_num = state.round_num
+        if not state.game_over and session.advance(bits):
+            # Effekter kun for den nyeste frame (frames der simuleres igen giver ingen partikler)
+            if state.round_num != round_num:
+                particles.clear()
+            elif not state.showing_round_start:
+                particles.update()
+            spiller1.spawn_effects()
+            spiller2.spawn_effects()
+        elif state.game_over:
+            # Bliv ved med at sende og rulle tilbage til modstanderens sidste input er
+            # bekræftet - et gættet ring-out kan vise sig ikke at være sket
+            final = session.settle()
+
+        bane.draw(window, spiller1, spiller2)
+        particles.draw(window)
+        spiller1.draw(window)
+        spiller2.draw(window)
+        display_points(window, spiller1, spiller2, state.time_left())
+
+        if state.game_over and final:
+            text = "Uafgjort!" if state.winner == -1 else f"{(spiller1, spiller2)[state.winner].name} vandt spillet!"
+            hud.get_overlay((WIDTH, HEIGHT), (
+                (text, LARGE_FONT, GOLD, (WIDTH//2, HEIGHT//2), "center"),
+            ), dim=BLACK).draw(window)
+        elif state.showing_round_start:
+            display_round_start(window, state.round_num)
+        elif state.waiting_for_respawn:
+            if state.round_winner in (0, 1):
+                winner = (spiller1, spiller2)[state.round_winner]
+                display_round_winner(window, winner.name, winner.color)
+            else:
+                display_round_winner(window, "Uafgjort!", WHITE)
+        if session.remote_confirmed == 0 or (state.game_over and not final):
+            window.blit(textcache.render_text("Venter på modstanderen...", MEDIUM_FONT, WHITE), (20, 60))
+        if session.desync_frame is not None:
+            window.blit(textcache.render_text(f"Ude af sync ved frame {session.desync_frame}", MEDIUM_FONT, RED),
+                        (20, 100))
+
+        pygame.display.update()
+        clock.tick(FRAME_RATE)
+
+    print(session.stats())
+    transport.close()
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Online kampe med rollback")
+    parser.add_argument("--player", type=int, choices=(1, 2), default=1, help="Hvilken spiller du er")
+    parser.add_argument("--port", type=int, default=7001, help="Lokal UDP port")
+    parser.add_argument("--peer", default="127.0.0.1:7002", help="Den anden spillers host:port")
+    parser.add_argument("--seed", type=int, default=1, help="Kampens seed (det samme på begge maskiner)")
+    parser.add_argument("--stage", default="classic", choices=stages.STAGE_NAMES, help="Banens platforme")
+    parser.add_argument("--latency", type=float, default=0, help="Kunstig forsinkelse hver vej i ms")
+    parser.add_argument("--jitter", type=float, default=0, help="Tilfældig variation af forsinkelsen i ms")
+    parser.add_argument("--loss", type=float, default=0.0, help="Andel af pakkerne der tabes (0-1)")
+    parser.add_argument("--selftest", action="store_true", help="Spil begge sider headless med bots")
+    parser.add_argument("--frames", type=int, default=3600, help="Frames i selvtesten")
+    parser.add_argument("--bots", nargs=2, default=["rusher", "jumper"], choices=list(BOTS),
+                        help="Bots i selvtesten")
+    args = parser.parse_args()
+    if not 0 <= args.seed < simulation.SEED_LIMIT:
+        parser.error(f"--seed skal være mellem 0 og {simulation.SEED_LIMIT - 1}")
+
+    if args.selftest:
+        sys.exit(selftest(args.frames, args.latency, args.jitter, args.loss, args.seed, args.stage, args.bots))
+    play(args.player, args.port, parse_peer(args.peer), args.latency, args.jitter, args.loss, args.seed, args.stage)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Partikelsystem med fast kapacitet.
+
+Alle partikler ligger i NumPy arrays (position, hastighed, levetid og
+farve), og de levende partikler holdes samlet forrest i arrays'ene, så
+bevægelse og udløb klares med få vektoriserede operationer. Partiklerne
+tegnes som cachede sprites med præmultipliceret alpha i ét blits-kald.
+"""
+import numpy as np
+import pygame
+
+PARTICLE_CAPACITY = 4096  # Højeste antal partikler på én gang
+PARTICLE_RADIUS = 3
+FULL_ALPHA_TTL = 10  # Levetid der svarer til fuld alpha (som i den gamle tegning)
+
+
+class ParticlePool:
+    """
+    En pulje af partikler der deles af alle spillere.
+    """
+
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        """
+        Parametre:
+            capacity: Højeste antal partikler
+        """
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.ttl = np.zeros(capacity, np.int32)
+        self.color = np.zeros(capacity, np.int32)  # Index i self.palette
+        self.count = 0  # Partiklerne [0, count) er levende
+
+        self.palette = []  # Farver der er brugt
+        self.color_index = {}  # Farve -> index i palette
+        self.sprites = {}  # (farve index, levetid) -> sprite
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Fjerner alle partikler"""
+        self.count = 0
+
+    def emit(self, x, y, amount, vel_x, vel_y, ttl, color, rng):
+        """
+        Tilføjer partikler. Er puljen fuld, droppes de partikler der ikke er plads til.
+
+        Parametre:
+            x, y: Startposition
+            amount: Antal partikler
+            vel_x: (min, max) for den vandrette hastighed
+            vel_y: (min, max) for den lodrette hastighed
+            ttl: Levetid i frames
+            color: RGB farve
+            rng: random.Random der trækker hastighederne
+        """
+        index = self.color_index.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self.color_index[color] = index
+
+        start = self.count
+        end = min(start + amount, self.capacity)
+        for i in range(start, end):
+            self.pos[i] = (x, y)
+            self.vel[i] = (rng.uniform(*vel_x), rng.uniform(*vel_y))
+        self.ttl[start:end] = ttl
+        self.color[start:end] = index
+        self.count = end
+
+    def update(self):
+        """Flytter alle partikler én frame og fjerner dem der er udløbet"""
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n]
+        self.ttl[:n] -= 1
+        alive = self.ttl[:n] > 0
+        if alive.all():
+            return
+
+        # Saml de levende partikler forrest
+        keep = np.flatnonzero(alive)
+        k = len(keep)
+        self.pos[:k] = self.pos[keep]
+        self.vel[:k] = self.vel[keep]
+        self.ttl[:k] = self.ttl[keep]
+        self.color[:k] = self.color[keep]
+        self.count = k
+
+    def sprite(self, color_index, ttl):
+        """
+        Returnerer en cirkel sprite med præmultipliceret alpha for farve og levetid.
+
+        Parametre:
+            color_index: Index i self.palette
+            ttl: Partiklens levetid (bestemmer alpha)
+        """
+        key = (color_index, ttl)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            alpha = max(0, min(255, int(255 * (ttl / FULL_ALPHA_TTL))))
+            r, g, b = self.palette[color_index][:3]
+            size = PARTICLE_RADIUS * 2 + 1
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (r * alpha // 255, g * alpha // 255, b * alpha // 255, alpha),
+                               (PARTICLE_RADIUS, PARTICLE_RADIUS), PARTICLE_RADIUS)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            self.sprites[key] = sprite
+        return sprite
+
+    def draw(self, window, offset=(0, 0), alpha=1.0):
+        """
+        Tegner alle partikler i ét blits-kald.
+
+        Parametre:
+            window: Overfladen der tegnes på
+            offset: Valgfri forskydning af alle partikler
+            alpha: Hvor langt mellem de to sidste opdateringer der tegnes (0-1).
+                   Partiklerne bevæger sig lige ud, så ved forrige opdatering
+                   stod de én hastighed tilbage.
+
+        Returnerer rektanglet partiklerne dækker (None hvis der ingen er).
+        """
+        n = self.count
+        if n == 0:
+            return None
+        pos = self.pos[:n]
+        if alpha < 1.0:
+            pos = pos - self.vel[:n] * (1.0 - alpha)
+        xs = pos[:, 0].astype(np.int32) - PARTICLE_RADIUS + offset[0]
+        ys = pos[:, 1].astype(np.int32) - PARTICLE_RADIUS + offset[1]
+        sprite = self.sprite
+        flags = pygame.BLEND_PREMULTIPLIED
+        window.blits([(sprite(c, t), (x, y), None, flags)
+                      for x, y, c, t in zip(xs.tolist(), ys.tolist(),
+                                            self.color[:n].tolist(), self.ttl[:n].tolist())],
+                     doreturn=False)
+
+        # Rektanglet alle partikler dækker (bruges af dirty-rect tegningen)
+        size = PARTICLE_RADIUS * 2 + 1
+        left, top = int(xs.min()), int(ys.min())
+        return pygame.Rect(left, top, int(xs.max()) - left + size, int(ys.max()) - top + size).clip(window.get_clip())
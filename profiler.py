@@ -0,0 +1,288 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Tidsmåling af hver fase i spilløkken.
+
+Spilløkken kalder lap(fase) efter hver fase, og end_frame() når billedet
+er færdigt. Tiden siden sidste lap lægges på fasen. Reglerne i
+simulation.py (move, update og collide) måles ved at pakke funktionerne
+ind mens profileringen kører, så simulation.step ikke bliver langsommere
+når der ikke profileres.
+
+For hver fase holdes et rullende vindue med de seneste frames, som giver
+p50/p95/p99. Hver frame kan skrives som en række i en CSV fil, og draw()
+tegner en graf og en tabel ovenpå spillet.
+
+Start spillet med profilering:
+    python talhamain.py --profile [--profile-csv frames.csv]
+F3 viser og skjuler grafen.
+"""
+import csv
+import time
+from collections import deque
+
+import pygame
+
+from config import *
+import simulation
+import textcache
+
+# Faserne i den rækkefølge de sker i et billede
+PHASES = ("events", "move", "update", "collision", "sim", "bane", "fighters", "hud", "display", "wait")
+
+# Regel-funktioner i simulation.py der måles hver for sig (funktion -> fase)
+SIM_PHASES = {"move": "move", "update": "update", "collide": "collision"}
+
+PHASE_COLORS = {
+    "events": (200, 200, 200),
+    "move": (255, 120, 120),
+    "update": (255, 170, 60),
+    "collision": (255, 230, 60),
+    "sim": (150, 90, 60),
+    "bane": (90, 200, 90),
+    "fighters": (60, 200, 220),
+    "hud": (90, 120, 255),
+    "display": (200, 100, 255),
+    "wait": (70, 70, 70),
+}
+
+ROLLING_FRAMES = 600  # Antal frames percentilerne beregnes over (10 sekunder ved 60 FPS)
+GRAPH_WIDTH = 300  # En pixel per frame
+GRAPH_HEIGHT = 100
+GRAPH_MS = 25.0  # Millisekunder grafen kan vise
+TABLE_INTERVAL = 30  # Frames mellem opdateringer af tabellen
+TABLE_FONT = 20
+
+
+def percentile(sorted_values, fraction):
+    """
+    Returnerer percentilen (nærmeste rang) af en sorteret liste.
+
+    Parametre:
+        sorted_values: Sorterede værdier
+        fraction: F.eks. 0.95 for p95
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """
+    Måler tiden for hver fase i hvert billede.
+    """
+
+    def __init__(self, csv_path=None, rolling=ROLLING_FRAMES, show_graph=True):
+        """
+        Parametre:
+            csv_path: Fil hvor hver frame skrives som en række (None for ingen fil)
+            rolling: Antal frames i det rullende vindue
+            show_graph: Om grafen skal vises fra start
+        """
+        self.samples = {phase: deque(maxlen=rolling) for phase in PHASES + ("total",)}
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame = 0
+        self.frame_start = time.perf_counter()
+        self.last = self.frame_start
+        self.nested = 0.0  # Tid målt af de indpakkede regel-funktioner siden sidste lap
+        self.show_graph = show_graph
+        self.first_frame = None  # Sekunder fra main() startede til det første billede var vist
+        self.restart = None  # Sekunder den seneste nye kamp tog at starte
+        self.graph = None
+        self.table = None
+        self.originals = {}
+
+        self.csv_file = None
+        self.writer = None
+        if csv_path is not None:
+            self.csv_file = open(csv_path, "w", newline="")
+            self.writer = csv.writer(self.csv_file)
+            self.writer.writerow(("frame", "state", "total_ms") + tuple(f"{phase}_ms" for phase in PHASES))
+
+    def lap(self, phase):
+        """
+        Lægger tiden siden sidste lap på fasen (minus det regel-funktionerne har målt).
+
+        Parametre:
+            phase: Navnet på fasen der lige er afsluttet
+        """
+        now = time.perf_counter()
+        self.current[phase] += now - self.last - self.nested
+        self.nested = 0.0
+        self.last = now
+
+    def end_frame(self, state=""):
+        """
+        Afslutter billedet: gemmer tiderne i det rullende vindue og CSV filen.
+
+        Parametre:
+            state: Spillets tilstand (skrives i CSV filen)
+        """
+        now = time.perf_counter()
+        total = now - self.frame_start
+        current = self.current
+        samples = self.samples
+        for phase in PHASES:
+            samples[phase].append(current[phase])
+        samples["total"].append(total)
+
+        if self.writer is not None:
+            self.writer.writerow([self.frame, state, f"{total * 1000:.3f}"] +
+                                 [f"{current[phase] * 1000:.3f}" for phase in PHASES])
+        if self.show_graph and self.graph is not None:
+            self.add_graph_column()
+
+        self.frame += 1
+        self.frame_start = now
+        self.last = now
+        self.nested = 0.0
+        for phase in PHASES:
+            current[phase] = 0.0
+
+    def percentiles(self, phase):
+        """
+        Returnerer (p50, p95, p99) i millisekunder for fasen (eller "total").
+
+        Parametre:
+            phase: Navnet på fasen
+        """
+        values = sorted(self.samples[phase])
+        return tuple(percentile(values, fraction) * 1000 for fraction in (0.50, 0.95, 0.99))
+
+    def summary(self):
+        """Returnerer en tekst med percentilerne for alle faser"""
+        lines = [f"{'fase':<10} {'p50':>7} {'p95':>7} {'p99':>7}  (ms, {len(self.samples['total'])} frames)"]
+        for phase in PHASES + ("total",):
+            p50, p95, p99 = self.percentiles(phase)
+            lines.append(f"{phase:<10} {p50:7.3f} {p95:7.3f} {p99:7.3f}")
+        if self.first_frame is not None:
+            lines.append(f"første billede efter {self.first_frame * 1000:.1f} ms")
+        if self.restart is not None:
+            lines.append(f"ny kamp startet på {self.restart * 1000:.2f} ms")
+        return "\n".join(lines)
+
+    def instrument(self):
+        """Pakker regel-funktionerne i simulation.py ind, så de måles hver for sig"""
+        if self.originals:
+            return
+        for name, phase in SIM_PHASES.items():
+            function = getattr(simulation, name)
+            self.originals[name] = function
+            setattr(simulation, name, self.timed(function, phase))
+
+    def restore(self):
+        """Sætter de oprindelige regel-funktioner tilbage"""
+        for name, function in self.originals.items():
+            setattr(simulation, name, function)
+        self.originals = {}
+
+    def timed(self, function, phase):
+        current = self.current
+        perf_counter = time.perf_counter
+
+        def wrapper(*args):
+            start = perf_counter()
+            result = function(*args)
+            elapsed = perf_counter() - start
+            current[phase] += elapsed
+            self.nested += elapsed
+            return result
+        return wrapper
+
+    def toggle_graph(self):
+        """Viser eller skjuler grafen"""
+        self.show_graph = not self.show_graph
+        self.graph = None  # Grafen starter forfra når den vises igen
+
+    def add_graph_column(self):
+        """Ruller grafen én pixel og tegner den seneste frame som en stablet søjle"""
+        graph = self.graph
+        graph.scroll(-1, 0)
+        x = GRAPH_WIDTH - 1
+        graph.fill((0, 0, 0), (x, 0, 1, GRAPH_HEIGHT))
+        scale = GRAPH_HEIGHT / GRAPH_MS
+        y = GRAPH_HEIGHT
+        for phase in PHASES:
+            height = self.samples[phase][-1] * 1000 * scale
+            top = y - height
+            if height >= 0.5 and y > 0:
+                pygame.draw.line(graph, PHASE_COLORS[phase], (x, max(0, int(top))), (x, int(y) - 1))
+            y = top
+        # Punkt for ét billedes budget ved FRAME_RATE
+        budget_y = GRAPH_HEIGHT - int(1000 / FRAME_RATE * scale)
+        graph.set_at((x, budget_y), (255, 255, 255))
+
+    def render_table(self):
+        """Renderer tabellen med percentiler (kun hvert TABLE_INTERVAL frame)"""
+        font = textcache.get_font(TABLE_FONT)
+        rows = [("fase", "p50", "p95", "p99")]
+        for phase in PHASES + ("total",):
+            rows.append((phase,) + tuple(f"{value:.2f}" for value in self.percentiles(phase)))
+        line_height = font.get_linesize()
+        table = pygame.Surface((GRAPH_WIDTH, line_height * len(rows) + 4))
+        table.fill((0, 0, 0))
+        columns = (4, 120, 180, 240)
+        for row, values in enumerate(rows):
+            color = PHASE_COLORS.get(values[0], (255, 255, 255))
+            for column, value in zip(columns, values):
+                table.blit(font.render(value, True, color), (column, 2 + row * line_height))
+        table.set_alpha(200)
+        self.table = table
+
+    def draw(self, window, position=(10, 60)):
+        """
+        Tegner grafen og tabellen.
+
+        Parametre:
+            window: Overfladen der tegnes på
+            position: Øverste venstre hjørne
+
+        Returnerer rektanglet der er tegnet på (None hvis grafen er skjult).
+        """
+        if not self.show_graph:
+            return None
+        if self.graph is None:
+            self.graph = pygame.Surface((GRAPH_WIDTH, GRAPH_HEIGHT))
+            self.graph.fill((0, 0, 0))
+            self.graph.set_alpha(200)
+        if self.table is None or self.frame % TABLE_INTERVAL == 0:
+            self.render_table()
+        x, y = position
+        rect = window.blit(self.graph, (x, y))
+        return rect.union(window.blit(self.table, (x, y + GRAPH_HEIGHT + 2)))
+
+    def close(self):
+        """Sætter regel-funktionerne tilbage og lukker CSV filen"""
+        self.restore()
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
+            self.writer = None
+
+
+class NullProfiler:
+    """Profiler der ikke gør noget (bruges når der ikke profileres)"""
+    show_graph = False
+    first_frame = None
+    restart = None
+
+    def lap(self, phase):
+        pass
+
+    def end_frame(self, state=""):
+        pass
+
+    def instrument(self):
+        pass
+
+    def toggle_graph(self):
+        pass
+
+    def draw(self, window, position=(10, 60)):
+        return None
+
+    def summary(self):
+        return ""
+
+    def close(self):
+        pass
@@ -0,0 +1,184 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Optagelse og afspilning af kampe.
+
+En optagelse gemmer kun kampens seed, banen og de to spilleres input for hver
+simulerings-tick (én byte per tick: spiller 1 i de nederste fire bits og
+spiller 2 i de øverste fire), komprimeret med zlib. Da simulation.step er
+deterministisk, kan kampen genskabes præcist uden grafik, og resultatet
+sammenlignes med de point og den skade der blev gemt sammen med inputtet.
+
+Afspil og tjek en eller flere optagelser:
+    python replay.py replays/*.ssr
+"""
+import os
+import struct
+import sys
+import time
+import zlib
+
+import simulation
+import stages
+
+MAGIC = b"SSRP"
+VERSION = 4  # Version 3 fik swept kollision og version 4 rettede overlap ved framens start - ældre optagelser spiller anderledes
+
+# magic, version, seed, antal ticks, point 1, point 2, skade 1, skade 2, vinder, bane
+HEADER = struct.Struct("<4sBIIHHddbB")
+PREFIX = struct.Struct("<4sB")
+
+REPLAY_DIR = "replays"
+
+
+class InputRecorder:
+    """
+    Samler input for hver tick i en kamp og kan gemme dem som en optagelse.
+    """
+
+    def __init__(self, seed, stage="classic"):
+        """
+        Parametre:
+            seed: Kampens seed
+            stage: Banens navn (se stages.STAGE_NAMES)
+        """
+        self.seed = seed
+        self.stage = stage
+        self.inputs = bytearray()
+
+    def record(self, inputs):
+        """
+        Gemmer én ticks input.
+
+        Parametre:
+            inputs: Input bitfelter for de to spillere
+        """
+        self.inputs.append((inputs[0] & 0x0F) | ((inputs[1] & 0x0F) << 4))
+
+    def save(self, state, path=None):
+        """
+        Skriver optagelsen til disk sammen med kampens resultat.
+
+        Parametre:
+            state: MatchState efter den sidste optagede tick
+            path: Filnavn (standard er en ny fil i REPLAY_DIR)
+
+        Returnerer filnavnet.
+        """
+        if path is None:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            path = os.path.join(REPLAY_DIR, time.strftime("%Y%m%d-%H%M%S") + f"-{self.seed:08x}.ssr")
+        f1, f2 = state.fighters
+        winner = -2 if state.winner is None else state.winner
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.seed, len(self.inputs),
+                                   f1.points, f2.points, f1.damage, f2.damage, winner,
+                                   stages.STAGE_NAMES.index(self.stage)))
+            file.write(zlib.compress(bytes(self.inputs), 9))
+        return path
+
+
+class Recording:
+    """En indlæst optagelse"""
+
+    def __init__(self, seed, inputs, points, damage, winner, stage="classic"):
+        self.seed = seed
+        self.stage = stage
+        self.inputs = inputs  # bytes med én byte per tick
+        self.points = points  # (spiller 1, spiller 2) ved optagelsens slutning
+        self.damage = damage
+        self.winner = winner
+
+
+def load(path):
+    """
+    Indlæser en optagelse.
+
+    Parametre:
+        path: Filnavn
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version = PREFIX.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} er ikke en Sumo Slammers optagelse")
+    if version != VERSION:
+        raise ValueError(f"{path} har version {version}, forventede {VERSION} "
+                         f"(optaget med ældre regler)")
+    magic, version, seed, ticks, p1, p2, d1, d2, winner, stage = HEADER.unpack_from(data)
+    if stage >= len(stages.STAGE_NAMES):
+        raise ValueError(f"{path} har en ukendt bane ({stage})")
+    inputs = zlib.decompress(data[HEADER.size:])
+    if len(inputs) != ticks:
+        raise ValueError(f"{path} er beskadiget ({len(inputs)} af {ticks} ticks)")
+    return Recording(seed, inputs, (p1, p2), (d1, d2), None if winner == -2 else winner,
+                     stages.STAGE_NAMES[stage])
+
+
+def replay(recording):
+    """
+    Simulerer en optagelse headless så hurtigt som muligt.
+
+    Parametre:
+        recording: Recording fra load()
+
+    Returnerer den færdige MatchState.
+    """
+    state = simulation.MatchState(platform=stages.make_stage(recording.stage), seed=recording.seed)
+    step = simulation.step
+    # Slå alle 256 input bytes op én gang i stedet for at pakke ud hver tick
+    table = [(byte & 0x0F, byte >> 4) for byte in range(256)]
+    for byte in recording.inputs:
+        step(state, table[byte])
+    return state
+
+
+def verify(recording, state):
+    """
+    Sammenligner en afspillet kamp med det gemte resultat.
+
+    Returnerer en liste med forskelle (tom hvis alt stemmer).
+    """
+    f1, f2 = state.fighters
+    differences = []
+    if (f1.points, f2.points) != recording.points:
+        differences.append(f"point {f1.points}-{f2.points}, forventede "
+                           f"{recording.points[0]}-{recording.points[1]}")
+    if (f1.damage, f2.damage) != recording.damage:
+        differences.append(f"skade {f1.damage}/{f2.damage}, forventede "
+                           f"{recording.damage[0]}/{recording.damage[1]}")
+    if state.winner != recording.winner:
+        differences.append(f"vinder {state.winner}, forventede {recording.winner}")
+    return differences
+
+
+def main(paths):
+    failed = 0
+    total_ticks = 0
+    start = time.perf_counter()
+    for path in paths:
+        try:
+            recording = load(path)
+        except (OSError, ValueError, zlib.error, struct.error) as error:
+            print(f"{path}: FEJL - {error}")
+            failed += 1
+            continue
+        state = replay(recording)
+        total_ticks += len(recording.inputs)
+        differences = verify(recording, state)
+        if differences:
+            failed += 1
+            print(f"{path}: AFVIGER - " + "; ".join(differences))
+        else:
+            f1, f2 = state.fighters
+            print(f"{path}: OK ({len(recording.inputs)} ticks, {f1.points}-{f2.points})")
+    elapsed = time.perf_counter() - start
+    if total_ticks and elapsed > 0:
+        print(f"{total_ticks} ticks på {elapsed:.2f} sekunder ({total_ticks / elapsed:,.0f} ticks/sekund)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Brug: python replay.py <optagelse.ssr> [...]")
+        sys.exit(2)
+    sys.exit(main(sys.argv[1:]))
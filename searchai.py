@@ -0,0 +1,356 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+CPU modstander der planlægger ved at simulere fremad.
+
+Hver beslutning prøver alle ACTIONS som første handling og spiller
+Monte Carlo rollouts af simulation.step fra en kopi af kampen
+(MatchState.snapshot/restore): den første handling holdes i
+DECISION_TICKS frames, derefter vælges tilfældige handlinger, og
+modstanderen antages at holde sit sidste input. Hver rollout får en
+score efter ring-out, skade og afstand til platformens kanter, og den
+handling med den bedste gennemsnitlige score vælges.
+
+Rollouts køres i arbejdsprocesser (én per ledig kerne). De startes med
+"spawn", så de ikke arver spillets SDL-, lyd- og indlæsningstråde (som
+fork ville kopiere midt i det hele). Hovedtråden
+sender kun kampens snapshot og læser svarene uden at vente, så spillets
+billeder aldrig venter på planlægningen. Hver arbejdsproces har et fast
+tidsbudget per beslutning (BUDGET_MS), så flere kerner giver flere
+rollouts og bedre spil i samme tid.
+
+    ai = SearchAI(match.platform, index=1)
+    bits = ai.next_input(match, opponent_input)  # én gang per tick
+    ai.close()
+
+search_bot() i bots.py bruger den samme Planner uden processer og med et
+fast antal rollouts, så turneringer med den er deterministiske.
+"""
+import copy
+import multiprocessing
+import os
+import random
+import time
+
+import simulation
+from simulation import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP, INPUT_DASH
+
+# Handlinger der planlægges over (input bitfelter)
+ACTIONS = (
+    0,
+    INPUT_LEFT,
+    INPUT_RIGHT,
+    INPUT_LEFT | INPUT_JUMP,
+    INPUT_RIGHT | INPUT_JUMP,
+    INPUT_LEFT | INPUT_DASH,
+    INPUT_RIGHT | INPUT_DASH,
+    INPUT_JUMP,
+)
+
+DECISION_TICKS = 6  # Frames en handling holdes før næste beslutning
+ROLLOUT_TICKS = 48  # Frames hver rollout simulerer fremad
+BUDGET_MS = 8.0  # Millisekunder hver arbejdsproces må bruge per beslutning
+STALE_DECISIONS = 4  # Beslutninger der ventes på svar før en ny forespørgsel sendes alligevel
+
+# Vægte i rollouternes score
+RING_OUT_SCORE = 1000.0
+DAMAGE_WEIGHT = 2.0
+EDGE_WEIGHT = 150.0
+
+
+class Planner:
+    """
+    Kører rollouts fra et snapshot af kampen. Har sin egen MatchState og
+    kopi af banen (bevægelige platforme flyttes af rollouterne), så den
+    også kan køre i en anden proces end spillet.
+    """
+
+    def __init__(self, platform, index=1, seed=0, rules=None):
+        """
+        Parametre:
+            platform: Kampens platform eller Stage (kopieres)
+            index: CPU spillerens plads i kampen (0 eller 1)
+            seed: Seed til rollouternes tilfældige handlinger
+            rules: Kampens simulation.Rules (None for config.py's værdier)
+        """
+        self.state = simulation.MatchState(None, copy.deepcopy(platform), rules=rules)
+        self.index = index
+        self.rng = random.Random(seed)
+
+    def plan(self, snapshot, opponent_input, deadline=None, rollouts=None):
+        """
+        Spiller rollouts for alle handlinger på skift til deadline eller
+        til der er spillet det givne antal rollouts.
+
+        Parametre:
+            snapshot: MatchState.snapshot() fra spillet
+            opponent_input: Modstanderens seneste input
+            deadline: time.perf_counter() hvor planlægningen skal stoppe
+            rollouts: Højeste antal rollouts (None for kun deadline)
+
+        Returnerer (totals, counts) med summen af scores og antal rollouts per handling.
+        """
+        totals = [0.0] * len(ACTIONS)
+        counts = [0] * len(ACTIONS)
+        played = 0
+        while True:
+            for a, action in enumerate(ACTIONS):
+                if rollouts is not None and played >= rollouts:
+                    return totals, counts
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return totals, counts
+                totals[a] += self.rollout(snapshot, action, opponent_input)
+                counts[a] += 1
+                played += 1
+
+    def rollout(self, snapshot, action, opponent_input):
+        """
+        Simulerer én rollout og returnerer dens score.
+
+        Parametre:
+            snapshot: MatchState.snapshot() fra spillet
+            action: Første handling (holdes i DECISION_TICKS frames)
+            opponent_input: Modstanderens input (holdes hele vejen)
+        """
+        state = self.state
+        state.restore(snapshot)
+        index = self.index
+        choice = self.rng.choice
+        inputs = [opponent_input, opponent_input]
+        for tick in range(ROLLOUT_TICKS):
+            if tick % DECISION_TICKS == 0:
+                inputs[index] = action if tick == 0 else choice(ACTIONS)
+            if simulation.step(state, inputs) != simulation.ROUND_CONTINUES:
+                break
+        return self.evaluate(state)
+
+    def evaluate(self, state):
+        """
+        Returnerer scoren for en tilstand set fra CPU spilleren.
+
+        Parametre:
+            state: MatchState efter en rollout
+        """
+        me = state.fighters[self.index]
+        other = state.fighters[1 - self.index]
+        if state.round_winner is not None and state.waiting_for_respawn:
+            if state.round_winner == self.index:
+                return RING_OUT_SCORE
+            if state.round_winner == 1 - self.index:
+                return -RING_OUT_SCORE
+        if me.is_dead:
+            return -RING_OUT_SCORE
+        if other.is_dead:
+            return RING_OUT_SCORE
+        platform = state.platform
+        center = platform.x + platform.width / 2
+        half = platform.width / 2
+        score = (other.damage - me.damage) * DAMAGE_WEIGHT
+        # Tæt på midten er sikkert, og modstanderen tæt på kanten er godt
+        score -= EDGE_WEIGHT * abs(me.x + me.w / 2 - center) / half
+        score += EDGE_WEIGHT * abs(other.x + other.w / 2 - center) / half
+        # Under platformens overkant er næsten et ring-out
+        if me.y + me.h > platform.y + platform.height:
+            score -= RING_OUT_SCORE / 2
+        if other.y + other.h > platform.y + platform.height:
+            score += RING_OUT_SCORE / 2
+        return score
+
+
+def best_action(totals, counts):
+    """
+    Returnerer handlingen med den bedste gennemsnitlige score.
+
+    Parametre:
+        totals, counts: Fra Planner.plan (eller summen fra flere processer)
+    """
+    best = None
+    best_score = None
+    for action, total, count in zip(ACTIONS, totals, counts):
+        if count == 0:
+            continue
+        score = total / count
+        if best_score is None or score > best_score:
+            best = action
+            best_score = score
+    return 0 if best is None else best
+
+
+def can_act(state, index):
+    """
+    Returnerer om der er noget at planlægge (ikke under rundestart, respawn
+    eller mens CPU spilleren er død).
+
+    Parametre:
+        state: Kampens tilstand
+        index: CPU spillerens plads i kampen
+    """
+    return not (state.game_over or state.showing_round_start or state.waiting_for_respawn
+                or state.fighters[index].is_dead)
+
+
+def worker(connection, platform, index, seed, budget, rules=None):
+    """
+    Arbejdsprocessen: modtager (id, snapshot, modstanderens input) og
+    svarer med (id, totals, counts) efter højst budget sekunder.
+
+    Parametre:
+        connection: Processens ende af en multiprocessing.Pipe
+        platform: Kampens platform eller Stage
+        index: CPU spillerens plads i kampen
+        seed: Seed til rollouterne
+        budget: Sekunder per beslutning
+        rules: Kampens simulation.Rules
+    """
+    planner = Planner(platform, index, seed, rules)
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        request_id, snapshot, opponent_input = request
+        deadline = time.perf_counter() + budget
+        totals, counts = planner.plan(snapshot, opponent_input, deadline)
+        connection.send((request_id, totals, counts))
+
+
+class SearchAI:
+    """
+    CPU modstander for spilløkken. Fordeler planlægningen på
+    arbejdsprocesser og venter aldrig på dem.
+    """
+
+    def __init__(self, platform, index=1, workers=None, budget_ms=BUDGET_MS, seed=0, rules=None):
+        """
+        Parametre:
+            platform: Kampens platform eller Stage
+            index: CPU spillerens plads i kampen
+            workers: Antal arbejdsprocesser (standard er én per kerne, minus
+                     den spillet kører på)
+            budget_ms: Millisekunder hver arbejdsproces må bruge per beslutning
+            seed: Seed til rollouterne (hver proces får sit eget)
+            rules: Kampens simulation.Rules (None for config.py's værdier)
+        """
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 1) - 1)
+        context = multiprocessing.get_context("spawn")  # Ingen fork af en proces med SDL og lydtråde
+        self.index = index
+        self.connections = []
+        self.processes = []
+        for i in range(workers):
+            parent, child = context.Pipe()
+            process = context.Process(target=worker, name=f"searchai-{i}",
+                                              args=(child, platform, index, seed + i, budget_ms / 1000, rules),
+                                              daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+        self.action = 0  # Handlingen der holdes indtil næste plan er klar
+        self.request_id = 0
+        self.waiting = 0  # Arbejdsprocesser der ikke har svaret på den seneste forespørgsel
+        self.pending = set()  # Deres forbindelser
+        self.sent_tick = None  # Tick den seneste forespørgsel blev sendt ved
+        self.totals = [0.0] * len(ACTIONS)
+        self.counts = [0] * len(ACTIONS)
+        self.decisions = 0
+        self.rollouts = 0
+
+    def poll(self):
+        """Læser de svar der er kommet (uden at vente) og vælger handling når alle har svaret"""
+        for connection in list(self.connections):
+            while True:
+                try:
+                    if not connection.poll():
+                        break
+                    request_id, totals, counts = connection.recv()
+                except (EOFError, OSError):
+                    self.drop(connection)  # Arbejdsprocessen er stoppet - planlæg videre uden den
+                    break
+                if request_id != self.request_id:
+                    continue  # Svar på en forespørgsel der er opgivet
+                for a in range(len(ACTIONS)):
+                    self.totals[a] += totals[a]
+                    self.counts[a] += counts[a]
+                self.pending.discard(connection)
+                self.waiting -= 1
+                if self.waiting == 0:
+                    self.action = best_action(self.totals, self.counts)
+                    self.decisions += 1
+                    self.rollouts += sum(self.counts)
+
+    def drop(self, connection):
+        """
+        Fjerner en arbejdsproces der ikke svarer længere.
+
+        Parametre:
+            connection: Processens ende af forbindelsen
+        """
+        index = self.connections.index(connection)
+        del self.connections[index]
+        self.processes.pop(index).join(timeout=0)
+        connection.close()
+        if connection in self.pending:
+            self.pending.discard(connection)
+            self.waiting -= 1
+            if self.waiting == 0 and any(self.counts):
+                self.action = best_action(self.totals, self.counts)
+
+    def request(self, state, opponent_input):
+        """
+        Sender kampens tilstand til alle arbejdsprocesser.
+
+        Parametre:
+            state: Kampens tilstand
+            opponent_input: Modstanderens seneste input
+        """
+        self.request_id += 1
+        self.totals = [0.0] * len(ACTIONS)
+        self.counts = [0] * len(ACTIONS)
+        snapshot = state.snapshot()
+        for connection in list(self.connections):
+            try:
+                connection.send((self.request_id, snapshot, opponent_input))
+            except OSError:
+                self.drop(connection)
+        self.pending = set(self.connections)
+        self.waiting = len(self.connections)
+        self.sent_tick = state.tick
+
+    def next_input(self, state, opponent_input=0):
+        """
+        Returnerer CPU spillerens input til næste tick. Kaldes én gang per
+        tick før simulation.step og venter aldrig på arbejdsprocesserne.
+
+        Parametre:
+            state: Kampens tilstand
+            opponent_input: Modstanderens input i denne tick
+        """
+        self.poll()
+        if not can_act(state, self.index):
+            self.action = 0
+            return 0
+        since = None if self.sent_tick is None else state.tick - self.sent_tick
+        if since is None or since < 0 or (
+                since >= DECISION_TICKS and (self.waiting == 0 or since >= DECISION_TICKS * STALE_DECISIONS)):
+            self.request(state, opponent_input)
+        return self.action
+
+    def close(self):
+        """Stopper arbejdsprocesserne"""
+        for connection in self.connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        for connection in self.connections:
+            connection.close()
+        self.connections = []
+        self.processes = []
+
@@ -0,0 +1,1172 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Pygame-fri simuleringskerne for Sumo Slammers.
+
+Her ligger spillets regler for bevægelse, dash, knockback, combo og
+ring-out, så en kamp kan køres uden skærm eller SDL. Spiller klassen i
+talhaspiller.py bygger ovenpå Fighter og bruger de samme funktioner, så
+reglerne kun findes ét sted.
+
+Input gives som et bitfelt per spiller (INPUT_LEFT, INPUT_RIGHT,
+INPUT_JUMP og INPUT_DASH), og step(state, inputs) kører én frame.
+MatchState.snapshot() pakker hele kampen i få hundrede bytes med struct,
+og restore() sætter den tilbage, så en kamp kan spoles tilbage eller
+prøves af i forvejen.
+
+Regel-konstanterne (tyngdekraft, knockback, dash osv.) ligger i et Rules
+objekt per kamp, så kampe med forskellige regler kan køres i samme proces.
+"""
+import math
+import struct
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+from config import *
+
+# Input bits - svarer til de fire taster der læses i Spiller.move
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4
+INPUT_DASH = 8
+
+# Hændelser som simuleringen melder tilbage (bruges til partikler og lyd)
+EVENT_JUMP = 1
+EVENT_HIT = 2
+EVENT_CONTACT = 4  # Spillerne rørte hinanden (slag lyd)
+
+# Resultater fra step
+ROUND_CONTINUES = 0
+ROUND_RING_OUT = 1
+ROUND_TIMEOUT = 2
+
+# Tidsgrænser omregnet fra millisekunder og minutter til frames
+RESPAWN_TICKS = 1500 * FRAME_RATE // 1000      # 1.5 sekunder før næste runde
+ROUND_START_TICKS = 2000 * FRAME_RATE // 1000  # 2 sekunder med rundenummer
+ROUND_TICKS = ROUND_TIME * 60 * FRAME_RATE     # Rundens varighed
+COMBO_TICKS = 120                              # Tid hvor et nyt hit tæller som combo
+
+# Regel-konstanter fra config.py som en kamp kan få sine egne værdier for (se Rules)
+RULE_NAMES = (
+    "GRAVITY", "JUMP_FORCE", "MOVEMENT_SPEED", "AIR_RESISTANCE",
+    "BASE_KNOCKBACK", "MAX_KNOCKBACK", "DAMAGE_AMOUNT", "MAX_DAMAGE", "RECOVERY_FRAMES",
+    "DASH_FORCE", "DASH_LENGTH", "DASH_COOLDOWN", "DASH_DAMAGE_BONUS", "MAX_AIR_DASH",
+)
+
+# Regel-konstanter der tæller frames eller gange og derfor skal være heltal
+# (en tæller der går ned med 1 rammer aldrig 0 fra f.eks. 15.5)
+INTEGER_RULES = ("RECOVERY_FRAMES", "DASH_LENGTH", "DASH_COOLDOWN", "MAX_AIR_DASH")
+
+
+def round_position(value):
+    """
+    Afrunder en position på samme måde som pygame.Rect (halve væk fra nul).
+
+    Parametre:
+        value: Ny position som kommatal
+    """
+    result = int(value)
+    if value - result >= 0.5:
+        return result + 1
+    if result - value >= 0.5:
+        return result - 1
+    return result
+
+
+class Rules:
+    """
+    Regel-konstanterne for én kamp. Standardværdierne er dem fra
+    config.py, men hver kamp kan få sine egne, så flere parametersæt kan
+    simuleres i samme proces (se sweep.py). Reglerne læses fra spillerens
+    rules felt, så funktionerne her ikke skal have dem med som argument.
+    """
+    __slots__ = RULE_NAMES
+
+    def __init__(self, **values):
+        """
+        Parametre:
+            values: Konstanter der afviger fra config.py (f.eks. BASE_KNOCKBACK=10)
+        """
+        unknown = set(values) - set(RULE_NAMES)
+        if unknown:
+            raise ValueError(f"Ukendte regel-konstanter: {', '.join(sorted(unknown))} "
+                             f"(vælg mellem {', '.join(RULE_NAMES)})")
+        for name in INTEGER_RULES:
+            value = values.get(name, 0)
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError(f"{name} skal være et heltal, ikke {value!r}")
+        defaults = globals()
+        for name in RULE_NAMES:
+            setattr(self, name, values.get(name, defaults[name]))
+
+    def replace(self, **values):
+        """
+        Returnerer nye regler hvor de givne konstanter er skiftet ud.
+
+        Parametre:
+            values: Konstanter der skal ændres
+        """
+        return Rules(**{**self.as_dict(), **values})
+
+    def as_dict(self):
+        """Returnerer konstanterne som en dict (navn -> værdi)"""
+        return {name: getattr(self, name) for name in RULE_NAMES}
+
+    def __repr__(self):
+        changed = {name: value for name, value in self.as_dict().items() if value != globals()[name]}
+        return f"Rules({', '.join(f'{name}={value!r}' for name, value in changed.items())})"
+
+
+DEFAULT_RULES = Rules()
+
+
+class Platform:
+    """
+    Platform uden pygame. Har de samme x, y, width og height felter som
+    pygame.Rect, så funktionerne her kan bruge begge dele.
+    """
+    __slots__ = ("x", "y", "width", "height")
+
+    def __init__(self, x, y, width, height):
+        self.x = round_position(x)
+        self.y = round_position(y)
+        self.width = round_position(width)
+        self.height = round_position(height)
+
+
+class MovingPlatform(Platform):
+    """
+    Platform der glider frem og tilbage. Positionen afhænger kun af
+    kampens tick, så den kan genskabes præcist (se Stage.advance).
+    """
+    __slots__ = ("base_x", "base_y", "dx", "dy", "period", "vx", "vy")
+
+    def __init__(self, x, y, width, height, dx=0, dy=0, period=240):
+        """
+        Parametre:
+            x, y, width, height: Platformens startposition og størrelse
+            dx, dy: Hvor langt platformen bevæger sig fra starten
+            period: Frames for en hel tur frem og tilbage
+        """
+        Platform.__init__(self, x, y, width, height)
+        self.base_x = self.x
+        self.base_y = self.y
+        self.dx = dx
+        self.dy = dy
+        self.period = period
+        self.vx = 0  # Flytning i sidste frame (spillere på platformen følger med)
+        self.vy = 0
+
+    def move_to(self, tick):
+        """Placerer platformen hvor den er ved det givne tick (trekantbølge)"""
+        phase = (tick % self.period) / self.period
+        amount = 1 - abs(2 * phase - 1)
+        x = round_position(self.base_x + self.dx * amount)
+        y = round_position(self.base_y + self.dy * amount)
+        self.vx = x - self.x
+        self.vy = y - self.y
+        self.x = x
+        self.y = y
+
+
+class PlatformIndex:
+    """
+    Sorteret x-interval indeks over faste platforme. x-aksen deles i
+    stykker mellem alle platformkanter, og hvert stykke husker de
+    platforme der dækker det, sorteret med den højeste øverst. Et opslag
+    er en bisect i kanterne, så det koster det samme uanset hvor mange
+    platforme banen har.
+    """
+    __slots__ = ("platforms", "edges", "slabs", "tops", "by_top")
+
+    def __init__(self, platforms):
+        """
+        Parametre:
+            platforms: Platforme (Platform eller pygame.Rect)
+        """
+        self.platforms = list(platforms)
+        self.edges = sorted({p.x for p in self.platforms} | {p.x + p.width for p in self.platforms})
+        self.slabs = []
+        for left, right in zip(self.edges, self.edges[1:]):
+            covering = [p for p in self.platforms if p.x <= left and p.x + p.width >= right]
+            covering.sort(key=lambda p: p.y)
+            self.slabs.append(tuple(covering))
+        self.by_top = sorted(self.platforms, key=lambda p: p.y)
+        self.tops = [p.y for p in self.by_top]
+
+    def at(self, x, inclusive=False):
+        """
+        Returnerer platformene hvis x-interval dækker x, højeste først.
+
+        Parametre:
+            x: x koordinat
+            inclusive: Tæl også platforme der slutter præcis ved x med
+        """
+        edges = self.edges
+        slabs = self.slabs
+        k = bisect_right(edges, x) - 1
+        found = slabs[k] if 0 <= k < len(slabs) else ()
+        if inclusive and 0 < k <= len(slabs) and x == edges[k]:
+            # Platforme der slutter præcis ved x ligger i stykket før
+            ending = [p for p in slabs[k - 1] if all(p is not q for q in found)]
+            found = tuple(sorted(found + tuple(ending), key=lambda p: p.y))
+        return found
+
+    def between(self, top, bottom):
+        """Platformene hvis overkant ligger fra top til bottom (begge med), højeste først"""
+        tops = self.tops
+        return self.by_top[bisect_left(tops, top):bisect_right(tops, bottom)]
+
+    def straddles(self, top, bottom):
+        """Om en platforms overkant ligger mellem top og bottom (begge eksklusive)"""
+        tops = self.tops
+        i = bisect_right(tops, top)
+        return i < len(tops) and tops[i] < bottom
+
+
+class Stage:
+    """
+    En bane med mange platforme: faste platforme i et PlatformIndex og
+    et par bevægelige platforme der tjekkes direkte. Har x, y og width
+    fra hovedplatformen (den første) eller et spawn område, så spawn
+    virker som med én platform, og fall_y er linjen hvor en spiller er
+    faldet ud.
+    """
+    __slots__ = ("segments", "moving", "index", "x", "y", "width", "height", "fall_y")
+
+    def __init__(self, segments, moving=(), spawn=None):
+        """
+        Parametre:
+            segments: Faste platforme - den første er hovedplatformen
+            moving: Bevægelige platforme (MovingPlatform)
+            spawn: Område spillerne starter over (standard er hovedplatformen)
+        """
+        self.segments = list(segments)
+        self.moving = list(moving)
+        self.index = PlatformIndex(self.segments)
+        main = spawn if spawn is not None else self.segments[0]
+        self.x = main.x
+        self.y = main.y
+        self.width = main.width
+        self.height = main.height
+        lowest = [p.y for p in self.segments] + [p.base_y + max(p.dy, 0) for p in self.moving]
+        self.fall_y = max(lowest)
+
+    def advance(self, tick):
+        """Flytter de bevægelige platforme til deres position ved tick"""
+        for p in self.moving:
+            p.move_to(tick)
+
+    def reset(self):
+        """Sætter de bevægelige platforme tilbage til starten (som en ny bane)"""
+        for p in self.moving:
+            p.x = p.base_x
+            p.y = p.base_y
+            p.vx = 0
+            p.vy = 0
+
+    def land(self, f):
+        """
+        Platform kollision for én spiller med samme regel som for én
+        platform: kroppen lander på den højeste platform hvis overkant
+        den krydser eller er faldet igennem i denne frame, og on_ground
+        slettes kun når kroppen ikke krydser nogen platforms overkant.
+
+        Parametre:
+            f: Fighter der lige er flyttet
+        """
+        cx = f.x + f.w // 2
+        top = f.y
+        bottom = f.y + f.h
+        best = None
+        if top - f.prev_y >= f.h:
+            # Kroppen kan være faldet helt igennem en platform i denne frame
+            for p in self.index.between(f.prev_y + f.h, top):
+                if p.x < crossing_centerx(f, p.y) < p.x + p.width:
+                    best = p
+                    break
+            for p in self.moving:
+                if (f.prev_y + f.h <= p.y <= top and p.x < crossing_centerx(f, p.y) < p.x + p.width
+                        and (best is None or p.y < best.y)):
+                    best = p
+        if best is None:
+            for p in self.index.at(cx):
+                if top < p.y < bottom and p.x < cx < p.x + p.width:
+                    best = p
+                    break
+        straddling = best is not None or self.index.straddles(top, bottom)
+        for p in self.moving:
+            # En platform der synker tager spillere med der stod på den
+            reach = bottom + p.vy + 1 if p.vy > 0 else bottom
+            if top < p.y < reach:
+                straddling = True
+                if p.x < cx < p.x + p.width and (best is None or p.y < best.y):
+                    best = p
+
+        if best is not None:
+            f.y = best.y - f.h
+            f.speed_y = 0
+            f.on_ground = True
+            f.air_dash = f.rules.MAX_AIR_DASH
+            if best in self.moving:
+                f.x += best.vx  # Spilleren følger med platformen
+        elif not straddling:
+            f.on_ground = False
+
+    def platforms(self):
+        """Alle platforme (faste og bevægelige)"""
+        return self.segments + self.moving
+
+
+def crossing_centerx(f, line_y):
+    """
+    Spillerens centrum x i det øjeblik bunden passerede line_y i denne
+    frame (bruges når kroppen er faldet helt igennem en platform).
+
+    Parametre:
+        f: Fighter der er faldet mindst sin egen højde
+        line_y: Platformens overkant
+    """
+    t = (line_y - f.prev_y - f.h) / (f.y - f.prev_y)
+    return f.prev_x + (f.x - f.prev_x) * t + f.w // 2
+
+
+def fall_line(platform):
+    """
+    Returnerer y værdien hvor en spiller er faldet ud af banen.
+
+    Parametre:
+        platform: Platform, pygame.Rect eller Stage
+    """
+    return platform.fall_y if type(platform) is Stage else platform.y
+
+
+def default_platform(width=WIDTH, height=HEIGHT):
+    """
+    Returnerer hovedplatformen med samme mål som i Bane.
+
+    Parametre:
+        width: Skærmens bredde i pixels
+        height: Skærmens højde i pixels
+    """
+    platformBredde = width * 0.7
+    return Platform((width - platformBredde) / 2, height * 0.75, platformBredde, 20)
+
+
+# Felter i et spiller-snapshot med deres struct koder (w, h og index ændrer sig ikke i en kamp)
+FIGHTER_FIELDS = (
+    ("x", "i"), ("y", "i"), ("prev_x", "i"), ("prev_y", "i"), ("speed_x", "d"), ("speed_y", "d"),
+    ("facing_right", "?"), ("on_ground", "?"), ("air_dash", "b"),
+    ("damage", "d"), ("points", "H"),
+    ("stunned", "?"), ("stun_time", "i"), ("is_dead", "?"), ("death_timer", "i"),
+    ("recovery_frames", "i"), ("invincible", "?"), ("invincible_timer", "i"),
+    ("can_dash", "?"), ("dash_timer", "i"), ("is_dashing", "?"), ("dash_direction", "b"),
+    ("is_attacking", "?"),
+    ("combo_timer", "i"), ("combo_count", "i"), ("last_attacker", "b"),
+    ("events", "B"),
+)
+FIGHTER_RECORD = struct.Struct("<" + "".join(code for _, code in FIGHTER_FIELDS))
+_FIGHTER_NAMES = tuple(name for name, _ in FIGHTER_FIELDS)
+_fighter_values = attrgetter(*_FIGHTER_NAMES)
+
+# Kampens tællere - seed, tick, runde, rundestart, respawn, rundenummer visning og udfald
+MATCH_RECORD = struct.Struct("<IiHi?i?ibb?b")
+NO_INDEX = -2  # Gemmes i stedet for None i et snapshot (som i replay.py)
+SEED_LIMIT = 2**32  # Seeds gemmes som uint32 (I) i snapshots, optagelser og netplay pakker
+
+
+class Fighter:
+    """
+    En spillers spilletilstand uden grafik. Kroppen gemmes som heltal
+    (x, y, w, h) ligesom i en pygame.Rect.
+    """
+    __slots__ = (
+        "x", "y", "w", "h", "prev_x", "prev_y",
+        "speed_x", "speed_y", "facing_right", "on_ground", "air_dash",
+        "damage", "points",
+        "stunned", "stun_time", "is_dead", "death_timer",
+        "recovery_frames", "invincible", "invincible_timer",
+        "can_dash", "dash_timer", "is_dashing", "dash_direction", "is_attacking",
+        "combo_timer", "combo_count", "last_attacker",
+        "index", "events", "rules",
+    )
+
+    def __init__(self, x, y, index=0, rules=None):
+        """
+        Parametre:
+            x, y: Startposition
+            index: Spillerens plads i kampen
+            rules: Kampens Rules (standard er konstanterne fra config.py)
+        """
+        self.rules = DEFAULT_RULES if rules is None else rules
+
+        # Kroppens position og størrelse
+        self.x = round_position(x)
+        self.y = round_position(y)
+        self.w = PLAYER_SIZE * 2
+        self.h = PLAYER_SIZE * 2
+        self.prev_x = self.x  # Positionen før sidste update (til swept kollision)
+        self.prev_y = self.y
+
+        # Bevægelses variabler
+        self.speed_x = 0
+        self.speed_y = 0
+        self.facing_right = True
+        self.on_ground = False
+        self.air_dash = self.rules.MAX_AIR_DASH
+
+        # Kamp statistikker
+        self.damage = 0
+        self.points = 0
+
+        # Status effekter
+        self.stunned = False
+        self.stun_time = 0
+        self.is_dead = False
+        self.death_timer = 0
+        self.recovery_frames = 0
+        self.invincible = False
+        self.invincible_timer = 0
+
+        # Dash mekanik
+        self.can_dash = True
+        self.dash_timer = 0
+        self.is_dashing = False
+        self.dash_direction = 1
+        self.is_attacking = False
+
+        # Combo system - last_attacker er angriberens index (-1 for ingen)
+        self.combo_timer = 0
+        self.combo_count = 0
+        self.last_attacker = -1
+
+        self.index = index  # Spillerens plads i kampen
+        self.events = 0  # Hændelser i denne frame (EVENT_JUMP, EVENT_HIT, EVENT_CONTACT)
+
+    def snapshot(self):
+        """Pakker spillets felter i FIGHTER_RECORD.size bytes (grafik er ikke med)"""
+        return FIGHTER_RECORD.pack(*_fighter_values(self))
+
+    def restore(self, data, offset=0):
+        """
+        Sætter spillets felter tilbage fra et snapshot.
+
+        Parametre:
+            data: Bytes fra snapshot() (eller et helt kamp-snapshot)
+            offset: Hvor spillerens felter starter i data
+        """
+        for name, value in zip(_FIGHTER_NAMES, FIGHTER_RECORD.unpack_from(data, offset)):
+            setattr(self, name, value)
+
+    @property
+    def centerx(self):
+        return self.x + self.w // 2
+
+    @property
+    def centery(self):
+        return self.y + self.h // 2
+
+
+def move(f, bits):
+    """
+    Anvender en frames input på en spiller (svarer til Spiller.move).
+
+    Parametre:
+        f: Fighter der skal bevæges
+        bits: Input bitfelt (INPUT_LEFT | INPUT_RIGHT | INPUT_JUMP | INPUT_DASH)
+    """
+    # Tjek for død tilstand
+    if f.is_dead:
+        return
+
+    # Håndter lammelsestilstand
+    if f.stunned:
+        f.stun_time -= 1
+        if f.stun_time <= 0:
+            f.stunned = False
+        return
+
+    rules = f.rules
+
+    # Normal bevægelse
+    if not f.is_dashing:
+        if not bits & (INPUT_LEFT | INPUT_RIGHT):
+            f.speed_x = 0
+        elif bits & INPUT_LEFT:
+            f.speed_x = -rules.MOVEMENT_SPEED
+            f.facing_right = False
+            f.dash_direction = -1
+        else:
+            f.speed_x = rules.MOVEMENT_SPEED
+            f.facing_right = True
+            f.dash_direction = 1
+
+        # Hop mekanik
+        if bits & INPUT_JUMP and f.on_ground:
+            f.speed_y = rules.JUMP_FORCE
+            f.on_ground = False
+            f.events |= EVENT_JUMP
+
+    # Opdater dash nedkøling (tæller også ned mens der dashes)
+    if not f.can_dash:
+        f.dash_timer -= 1
+        if f.dash_timer <= 0:
+            f.can_dash = True
+            f.dash_timer = 0
+
+    # Dash system
+    if bits & INPUT_DASH and f.can_dash and not f.is_dashing:
+        if f.on_ground or f.air_dash > 0:
+            start_dash(f)
+            if not f.on_ground:
+                f.air_dash -= 1
+
+    # Dash bevægelse
+    if f.is_dashing:
+        f.speed_x = rules.DASH_FORCE * f.dash_direction
+        f.dash_timer -= 1
+        if f.dash_timer <= 0:
+            stop_dash(f)
+
+    # Luftmodstand
+    if not f.on_ground:
+        f.speed_x *= rules.AIR_RESISTANCE
+
+
+def start_dash(f):
+    """Start et nyt dash"""
+    f.is_dashing = True
+    f.dash_timer = f.rules.DASH_LENGTH
+    f.can_dash = False
+    f.is_attacking = True
+
+
+def stop_dash(f):
+    """Stop det nuværende dash og start nedkølingen"""
+    f.is_dashing = False
+    f.is_attacking = False
+    f.dash_timer = f.rules.DASH_COOLDOWN
+    f.can_dash = False
+
+
+def update(f, platform):
+    """
+    Flytter spilleren en frame og håndterer platform kollision
+    (svarer til Spiller.update uden partikler).
+
+    Parametre:
+        f: Fighter der skal opdateres
+        platform: Platform eller pygame.Rect med x, y og width
+
+    Returnerer True hvis spilleren er død.
+    """
+    f.prev_x = f.x
+    f.prev_y = f.y
+
+    # En død spiller falder bare videre
+    if f.is_dead:
+        f.speed_y += f.rules.GRAVITY
+        f.y = round_position(f.y + f.speed_y)
+        return True
+
+    # Anvend tyngdekraft og opdater position
+    f.speed_y += f.rules.GRAVITY
+    f.x = round_position(f.x + f.speed_x)
+    f.y = round_position(f.y + f.speed_y)
+
+    # Kun begrænse horisontal bevægelse til verdenens grænser
+    if f.x < WORLD_LEFT_BOUNDARY:
+        f.x = WORLD_LEFT_BOUNDARY
+        f.speed_x = 0
+    elif f.x > WORLD_RIGHT_BOUNDARY - f.w:
+        f.x = WORLD_RIGHT_BOUNDARY - f.w
+        f.speed_x = 0
+
+    # Platform kollision (en bane med mange platforme slår op i sit indeks)
+    if type(platform) is Stage:
+        platform.land(f)
+    else:
+        platform_y = platform.y
+        if f.y + f.h > platform_y and f.y < platform_y:
+            if platform.x < f.x + f.w // 2 < platform.x + platform.width:
+                f.y = platform_y - f.h
+                f.speed_y = 0
+                f.on_ground = True
+                f.air_dash = f.rules.MAX_AIR_DASH
+        elif (f.prev_y + f.h <= platform_y <= f.y
+              and platform.x < crossing_centerx(f, platform_y) < platform.x + platform.width):
+            # Faldet helt igennem platformen i én frame - land hvor bunden passerede den
+            f.y = platform_y - f.h
+            f.speed_y = 0
+            f.on_ground = True
+            f.air_dash = f.rules.MAX_AIR_DASH
+        else:
+            f.on_ground = False
+
+    # Opdater tællere
+    if f.recovery_frames > 0:
+        f.recovery_frames -= 1
+
+    if f.invincible:
+        f.invincible_timer -= 1
+        if f.invincible_timer <= 0:
+            f.invincible = False
+
+    if f.combo_timer > 0:
+        f.combo_timer -= 1
+    else:
+        f.combo_count = 0
+
+    return False
+
+
+def apply_knockback(f, direction, force):
+    """
+    Skubber spilleren væk efter et hit (svarer til Spiller.apply_knockback).
+
+    Parametre:
+        f: Fighter der bliver ramt
+        direction: (x, y) retning for tilbageslaget
+        force: Tilbageslagets grundkraft
+    """
+    if f.invincible:
+        return
+
+    # Beregn tilbageslag med skade skalering
+    knockback_bonus = 1 + (f.damage / 75)
+    total_force = min(force * knockback_bonus, f.rules.MAX_KNOCKBACK)
+
+    # Anvend tilbageslag med fokus på horisontal bevægelse
+    f.speed_x = direction[0] * total_force * 2.0
+    f.speed_y = direction[1] * total_force - 3
+
+    # Stun baseret på skade og recovery frames
+    f.stunned = True
+    f.stun_time = int(8 * knockback_bonus)
+    f.recovery_frames = f.rules.RECOVERY_FRAMES
+    f.events |= EVENT_HIT
+
+
+def hit(attacker, target, direction):
+    """
+    Giver target skade, combo og knockback fra attacker.
+
+    Parametre:
+        attacker: Fighter der angriber
+        target: Fighter der bliver ramt
+        direction: 1 eller -1, retningen target skubbes i
+    """
+    dashing = attacker.is_dashing
+    rules = attacker.rules
+    force = rules.BASE_KNOCKBACK * (1.8 if dashing else 1)
+    force *= (1 + target.damage / 100)  # Jo mere skade, jo længere knockback
+
+    # Opdater combo system
+    if target.last_attacker == attacker.index:
+        target.combo_count += 1
+    else:
+        target.combo_count = 1
+    target.last_attacker = attacker.index
+    target.combo_timer = COMBO_TICKS
+
+    damage = rules.DAMAGE_AMOUNT * (rules.DASH_DAMAGE_BONUS if dashing else 1)
+    target.damage = min(target.damage + damage, rules.MAX_DAMAGE)
+    apply_knockback(target, (direction, -0.15), force)
+
+
+def contact_time(f1, f2):
+    """
+    Finder hvornår i denne frame spillernes centre første gang var
+    tættere end PLAYER_SIZE * 2, ud fra bevægelsen fra prev_x/prev_y til
+    x/y (swept test, så hurtige spillere ikke kan passere hinanden).
+
+    Parametre:
+        f1: Første Fighter
+        f2: Anden Fighter
+
+    Returnerer (t, afstand x ved t), hvor t er 0 hvis de allerede rørte
+    hinanden ved framens start og stadig gør ved framens slutning, eller
+    None hvis de ikke rørte hinanden. Skubbet fra hinanden afrundes, så
+    spillere der lige har stødt sammen ofte starter næste frame med en
+    pixels overlap - går de fra hinanden derfra, er det ikke en ny kontakt.
+    """
+    reach = PLAYER_SIZE * 2
+    start_x = (f1.prev_x + f1.w // 2) - (f2.prev_x + f2.w // 2)
+    start_y = (f1.prev_y + f1.h // 2) - (f2.prev_y + f2.h // 2)
+    c = start_x * start_x + start_y * start_y - reach * reach
+    if c < 0:
+        end_x = (f1.x + f1.w // 2) - (f2.x + f2.w // 2)
+        end_y = (f1.y + f1.h // 2) - (f2.y + f2.h // 2)
+        if end_x * end_x + end_y * end_y >= reach * reach:
+            return None  # Gik fra hinanden i løbet af framen
+        return 0, start_x
+    move_x = (f1.x - f1.prev_x) - (f2.x - f2.prev_x)
+    move_y = (f1.y - f1.prev_y) - (f2.y - f2.prev_y)
+    a = move_x * move_x + move_y * move_y
+    b = start_x * move_x + start_y * move_y
+    if a == 0 or b >= 0:
+        return None  # Ingen bevægelse mod hinanden
+    disc = b * b - a * c
+    if disc <= 0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    if t >= 1:
+        return None  # Først helt ved framens slutning (afstand præcis PLAYER_SIZE * 2)
+    return t, start_x + move_x * t
+
+
+def collide(f1, f2):
+    """
+    Håndterer kollision mellem to spillere (svarer til handle_collision
+    uden lyd). Testen er swept: rørte spillerne hinanden i løbet af
+    framen, tæller det som kontakt, og retningen er den side de ramte
+    hinanden fra. Er de passeret igennem hinanden, sættes x tilbage til
+    hvor de ramte (y er allerede afgjort af platformen).
+
+    Parametre:
+        f1: Første Fighter
+        f2: Anden Fighter
+
+    Returnerer True hvis spillerne rørte hinanden.
+    """
+    if f1.is_dead or f2.is_dead:
+        return False
+    reach = PLAYER_SIZE * 2
+    c1x = f1.x + f1.w // 2
+    c2x = f2.x + f2.w // 2
+    distance = math.hypot(c1x - c2x, (f1.y + f1.h // 2) - (f2.y + f2.h // 2))
+    contact = contact_time(f1, f2)
+    if contact is None:
+        if distance >= reach:
+            return False
+        contact = (0, c1x - c2x)  # Afrunding kan give overlap uden swept kontakt
+
+    t, contact_x = contact
+    if t == 0:
+        left_first = c1x < c2x  # Rørte allerede hinanden - brug den nuværende side
+    else:
+        left_first = contact_x < 0
+        if distance >= reach or left_first != (c1x < c2x):
+            # Passeret igennem hinanden - sæt dem tilbage hvor de ramte
+            f1.x = round_position(f1.prev_x + (f1.x - f1.prev_x) * t)
+            f2.x = round_position(f2.prev_x + (f2.x - f2.prev_x) * t)
+            c1x = f1.x + f1.w // 2
+            c2x = f2.x + f2.w // 2
+            distance = math.hypot(c1x - c2x, (f1.y + f1.h // 2) - (f2.y + f2.h // 2))
+
+    direction = 1 if left_first else -1
+    f1_force = abs(f1.speed_x) * (1.5 if f1.is_dashing else 1)
+    f2_force = abs(f2.speed_x) * (1.5 if f2.is_dashing else 1)
+    if (f1.is_dashing or f1_force > 2) and f2.recovery_frames == 0:
+        hit(f1, f2, direction)
+    if (f2.is_dashing or f2_force > 2) and f1.recovery_frames == 0:
+        hit(f2, f1, -direction)
+
+    f1.events |= EVENT_CONTACT
+    f2.events |= EVENT_CONTACT
+
+    # Skub spillerne fra hinanden så de ikke overlapper
+    overlap = reach - distance
+    if overlap > 0:
+        if left_first:
+            f1.x = round_position(f1.x - overlap / 2)
+            f2.x = round_position(f2.x + overlap / 2)
+        else:
+            f1.x = round_position(f1.x + overlap / 2)
+            f2.x = round_position(f2.x - overlap / 2)
+    return True
+
+
+def broadphase_pairs(fighters):
+    """
+    Finder de par af levende spillere der kan have rørt hinanden i denne
+    frame med et sweep-and-prune over x: hver spiller fylder det stykke
+    dens centrum har bevæget sig over (fra prev_x til x), stykkerne
+    sorteres efter venstre ende, og hver spiller sammenlignes kun med dem
+    til højre der starter tættere end PLAYER_SIZE * 2 (og er lige så tæt
+    lodret). Alle par som contact_time kan finde er med.
+
+    Parametre:
+        fighters: Liste med spillere
+
+    Returnerer parrene som (i, j) med i < j, sorteret efter index.
+    """
+    reach = PLAYER_SIZE * 2
+    spans = []
+    for i, f in enumerate(fighters):
+        if f.is_dead:
+            continue
+        half = f.w // 2
+        if f.prev_x <= f.x:
+            spans.append((f.prev_x + half, f.x + half, i))
+        else:
+            spans.append((f.x + half, f.prev_x + half, i))
+    spans.sort()
+
+    pairs = []
+    for a in range(len(spans)):
+        _, a_right, i = spans[a]
+        fi = fighters[i]
+        a_top = min(fi.y, fi.prev_y)
+        a_bottom = max(fi.y, fi.prev_y)
+        for b in range(a + 1, len(spans)):
+            b_left, _, j = spans[b]
+            if b_left - a_right >= reach:
+                break  # Resten starter endnu længere til højre
+            fj = fighters[j]
+            # Afstanden mellem de lodrette stykker (0 hvis de overlapper)
+            gap = max(min(fj.y, fj.prev_y) - a_bottom, a_top - max(fj.y, fj.prev_y), 0)
+            if gap < reach:
+                pairs.append((i, j) if i < j else (j, i))
+    pairs.sort()
+    return pairs
+
+
+def collide_all(fighters):
+    """
+    Håndterer kollisioner mellem vilkårligt mange spillere. Parrene fra
+    broadphase_pairs afgøres med collide() i fast rækkefølge efter index,
+    så resultatet ikke afhænger af sorteringen, og for to spillere svarer
+    det præcist til collide(f1, f2).
+
+    Parametre:
+        fighters: Liste med spillere (døde spillere springes over)
+
+    Returnerer antallet af par der rørte hinanden.
+    """
+    contacts = 0
+    for i, j in broadphase_pairs(fighters):
+        if collide(fighters[i], fighters[j]):
+            contacts += 1
+    return contacts
+
+
+def start_position(f):
+    """Nulstiller spillerens tilstand til starten af en runde"""
+    f.is_dead = False
+    f.death_timer = 0
+    f.damage = 0
+    f.combo_count = 0
+    f.combo_timer = 0
+    f.last_attacker = -1
+    f.speed_x = 0
+    f.speed_y = 0
+    f.stunned = False
+    f.stun_time = 0
+    f.is_dashing = False
+    f.can_dash = True
+    f.dash_timer = 0
+    f.air_dash = f.rules.MAX_AIR_DASH
+
+
+def spawn_points(platform):
+    """
+    Returnerer startpositionerne for de to spillere på platformen.
+
+    Parametre:
+        platform: Platform eller pygame.Rect
+    """
+    return [(platform.x + SPAWN_DISTANCE, platform.y - SPAWN_HEIGHT),
+            (platform.x + platform.width - SPAWN_DISTANCE, platform.y - SPAWN_HEIGHT)]
+
+
+def reset_fighters(fighters, platform):
+    """
+    Sætter spillerne tilbage til deres startpositioner (svarer til reset_round).
+
+    Parametre:
+        fighters: Liste med de to spillere
+        platform: Platform eller pygame.Rect
+    """
+    for f, (x, y) in zip(fighters, spawn_points(platform)):
+        f.x = round_position(x)
+        f.y = round_position(y)
+        start_position(f)
+
+
+def new_match_fighters(fighters, platform):
+    """
+    Sætter spillerne tilbage til samme tilstand som nyoprettede spillere på
+    startpositionerne (også point, retning og timere som reset_fighters
+    ikke rører), så en ny kamp i samme proces spiller præcis som en ny kamp
+    i en ny proces.
+
+    Parametre:
+        fighters: Liste med de to spillere
+        platform: Platform eller pygame.Rect
+    """
+    for f, (x, y) in zip(fighters, spawn_points(platform)):
+        f.restore(Fighter(x, y, f.index, f.rules).snapshot())
+
+
+class MatchState:
+    """
+    Hele kampens tilstand: spillerne, platformen og rundernes tællere.
+    Tider måles i frames (tick) i stedet for millisekunder. Seed bruges
+    ikke af reglerne, men styrer alle tilfældige valg i grafikken, så en
+    kamp kan gentages præcist.
+    """
+    __slots__ = (
+        "fighters", "platform", "seed", "tick", "round_num", "round_start_tick",
+        "waiting_for_respawn", "respawn_tick",
+        "showing_round_start", "round_start_display_tick",
+        "first_to_fall", "round_winner", "game_over", "winner", "rules",
+    )
+
+    def __init__(self, fighters=None, platform=None, seed=0, rules=None):
+        """
+        Parametre:
+            fighters: Spillerne (standard er to nye Fighter på startpositionerne)
+            platform: Platform eller Stage (standard er default_platform())
+            seed: Kampens seed
+            rules: Kampens Rules (standard er de første spilleres regler,
+                   ellers konstanterne fra config.py). Alle spillere får dem.
+        """
+        self.platform = platform if platform is not None else default_platform()
+        self.seed = seed
+        if rules is None:
+            rules = fighters[0].rules if fighters else DEFAULT_RULES
+        self.rules = rules
+        if fighters is None:
+            fighters = [Fighter(x, y, rules=rules) for x, y in spawn_points(self.platform)]
+        for index, f in enumerate(fighters):
+            f.index = index
+            f.rules = rules
+        self.fighters = fighters
+        if type(self.platform) is Stage:
+            self.platform.reset()  # En ny kamp på samme bane starter som en ny bane
+
+        self.tick = 0  # Antal simulerede frames
+        self.round_num = 1
+        self.round_start_tick = 0
+
+        # Respawn og rundestart
+        self.waiting_for_respawn = False
+        self.respawn_tick = 0
+        self.showing_round_start = False
+        self.round_start_display_tick = 0
+
+        # Rundens og kampens udfald
+        self.first_to_fall = None  # Index på den der faldt først
+        self.round_winner = None  # Index på rundens vinder, -1 ved uafgjort
+        self.game_over = False
+        self.winner = None  # Index på kampens vinder, -1 ved uafgjort
+
+    def time_left(self):
+        """Resterende tid af runden i sekunder"""
+        return max(0, ROUND_TICKS - (self.tick - self.round_start_tick)) / FRAME_RATE
+
+    def snapshot(self):
+        """
+        Pakker hele kampen i bytes: rundernes tællere og udfald efterfulgt
+        af et FIGHTER_RECORD per spiller (med point og skade). Platformen
+        er ikke med, da bevægelige platforme kun afhænger af tick.
+        """
+        header = MATCH_RECORD.pack(
+            self.seed, self.tick, self.round_num, self.round_start_tick,
+            self.waiting_for_respawn, self.respawn_tick,
+            self.showing_round_start, self.round_start_display_tick,
+            NO_INDEX if self.first_to_fall is None else self.first_to_fall,
+            NO_INDEX if self.round_winner is None else self.round_winner,
+            self.game_over,
+            NO_INDEX if self.winner is None else self.winner)
+        return header + b"".join([f.snapshot() for f in self.fighters])
+
+    def restore(self, data):
+        """
+        Sætter kampen tilbage til et snapshot fra snapshot().
+
+        Parametre:
+            data: Bytes fra snapshot() med samme antal spillere
+        """
+        if len(data) != MATCH_RECORD.size + FIGHTER_RECORD.size * len(self.fighters):
+            raise ValueError(f"Snapshot har {len(data)} bytes, passer ikke til {len(self.fighters)} spillere")
+        (self.seed, self.tick, self.round_num, self.round_start_tick,
+         self.waiting_for_respawn, self.respawn_tick,
+         self.showing_round_start, self.round_start_display_tick,
+         first_to_fall, round_winner, self.game_over, winner) = MATCH_RECORD.unpack_from(data)
+        self.first_to_fall = None if first_to_fall == NO_INDEX else first_to_fall
+        self.round_winner = None if round_winner == NO_INDEX else round_winner
+        self.winner = None if winner == NO_INDEX else winner
+
+        offset = MATCH_RECORD.size
+        for f in self.fighters:
+            f.restore(data, offset)
+            offset += FIGHTER_RECORD.size
+
+        # Bevægelige platforme står hvor step sidst satte dem
+        if type(self.platform) is Stage:
+            if self.tick > 0:
+                self.platform.advance(self.tick - 1)
+            else:
+                self.platform.reset()
+
+
+def award_round(state, winner):
+    """
+    Giver point for en afsluttet runde og tjekker om kampen er slut.
+
+    Parametre:
+        state: MatchState
+        winner: Index på vinderen eller -1 ved uafgjort
+    """
+    f1, f2 = state.fighters
+    if winner == 0:
+        f1.points += 1
+    elif winner == 1:
+        f2.points += 1
+    else:
+        f1.points += 1
+        f2.points += 1
+    state.round_winner = winner
+    state.waiting_for_respawn = True
+    state.respawn_tick = state.tick
+
+    # Tjek om spillet er slut
+    if f1.points >= MAX_POINTS or f2.points >= MAX_POINTS:
+        state.game_over = True
+        if f1.points > f2.points:
+            state.winner = 0
+        elif f2.points > f1.points:
+            state.winner = 1
+        else:
+            state.winner = -1
+
+
+def reset_round(state):
+    """
+    Starter en ny runde (svarer til reset_round i talhamain.main).
+
+    Parametre:
+        state: MatchState
+    """
+    reset_fighters(state.fighters, state.platform)
+    state.round_num += 1
+    state.round_start_tick = state.tick
+    state.round_winner = None
+    state.showing_round_start = True
+    state.round_start_display_tick = state.tick
+
+
+def step(state, inputs):
+    """
+    Simulerer én frame af kampen med samme rækkefølge som BATTLE i
+    talhamain.main: timeout, bevægelse, ring-out, opdatering, kollision,
+    rundeslut, respawn og rundestart.
+
+    Parametre:
+        state: MatchState der opdateres
+        inputs: Input bitfelter, et per spiller
+
+    Returnerer ROUND_RING_OUT eller ROUND_TIMEOUT når en runde slutter
+    i denne frame, ellers ROUND_CONTINUES.
+    """
+    if state.game_over:
+        return ROUND_CONTINUES
+
+    f1, f2 = state.fighters
+    platform = state.platform
+    tick = state.tick
+    result = ROUND_CONTINUES
+    if type(platform) is Stage:
+        platform.advance(tick)
+    fall_y = fall_line(platform)
+
+    # Tjek om tiden er udløbet - spilleren med mindst skade vinder
+    if (tick - state.round_start_tick >= ROUND_TICKS
+            and not state.waiting_for_respawn and not state.showing_round_start):
+        if f1.damage < f2.damage:
+            award_round(state, 0)
+        elif f2.damage < f1.damage:
+            award_round(state, 1)
+        else:
+            award_round(state, -1)
+        result = ROUND_TIMEOUT
+
+    if not state.showing_round_start:
+        f1.events = 0
+        f2.events = 0
+        if not f1.is_dead:
+            move(f1, inputs[0])
+        if not f2.is_dead:
+            move(f2, inputs[1])
+
+        # Tjek for fald i afgrunden
+        if not state.waiting_for_respawn:
+            if not f1.is_dead and f1.y > fall_y:
+                f1.is_dead = True
+                if state.first_to_fall is None:
+                    state.first_to_fall = 0
+            if not f2.is_dead and f2.y > fall_y:
+                f2.is_dead = True
+                if state.first_to_fall is None:
+                    state.first_to_fall = 1
+
+        if not f1.is_dead:
+            update(f1, platform)
+        if not f2.is_dead:
+            update(f2, platform)
+
+        if not f1.is_dead and not f2.is_dead:
+            collide(f1, f2)
+
+        # Tjek for rundens afslutning - den der faldt først taber
+        if not state.waiting_for_respawn and (f1.is_dead or f2.is_dead):
+            if state.first_to_fall is not None:
+                award_round(state, 1 - state.first_to_fall)
+            else:
+                award_round(state, 1 if f1.is_dead else 0)
+            state.first_to_fall = None
+            result = ROUND_RING_OUT
+
+    # Håndter respawn timing
+    if state.waiting_for_respawn and tick - state.respawn_tick >= RESPAWN_TICKS:
+        state.waiting_for_respawn = False
+        reset_round(state)
+
+    # Skjul rundenummeret når tiden er gået
+    if state.showing_round_start and tick - state.round_start_display_tick >= ROUND_START_TICKS:
+        state.showing_round_start = False
+
+    state.tick = tick + 1
+    return result
+
+
+def run_match(state, controllers, max_ticks=None):
+    """
+    Kører en kamp headless til den er slut.
+
+    Parametre:
+        state: MatchState der skal spilles
+        controllers: En funktion per spiller, controller(state, index) -> input bits
+        max_ticks: Valgfri grænse for antal frames
+
+    Returnerer den færdige MatchState.
+    """
+    c1, c2 = controllers
+    while not state.game_over:
+        if max_ticks is not None and state.tick >= max_ticks:
+            break
+        step(state, (c1(state, 0), c2(state, 1)))
+    return state
+
+
+if __name__ == "__main__":
+    # Lille hastighedstest: to spillere der løber mod hinanden og dasher
+    import random
+    import time
+
+    rng = random.Random(1)
+    schedule = [rng.randrange(16) for _ in range(4096)]
+
+    def random_bot(state, index):
+        return schedule[(state.tick * 7 + index * 131) & 4095]
+
+    state = MatchState()
+    start = time.perf_counter()
+    ticks = 0
+    while ticks < 200000:
+        if state.game_over:
+            state = MatchState()
+        step(state, (random_bot(state, 0), random_bot(state, 1)))
+        ticks += 1
+    elapsed = time.perf_counter() - start
+    print(f"{ticks / elapsed:,.0f} ticks/sekund")
@@ -0,0 +1,113 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Baner med flere platforme.
+
+Hver bane er en funktion der bygger platformene ud fra skærmens størrelse
+og returnerer (faste platforme, bevægelige platforme, spawn område). Uden
+spawn område starter spillerne over den første platform.
+"classic" er den oprindelige bane med én platform og giver en almindelig
+simulation.Platform, så reglerne kører præcis som før. De andre baner giver
+en simulation.Stage, hvor platformene slås op i et sorteret x-interval
+indeks, så det er lige billigt at finde jorden under en spiller uanset
+hvor mange platforme banen har.
+
+Vælg en bane når spillet startes:
+    python talhamain.py --stage floating
+"""
+import simulation
+
+STAGE_NAMES = ("classic", "floating", "stepped", "moving", "islands")
+
+PLATFORM_HEIGHT = 20
+FLOATING_HEIGHT = 14  # Svævende platforme er tyndere end hovedplatformen
+ISLAND_COUNT = 240  # Antal små platforme på "islands" (til at teste indekset)
+
+
+def main_platform(width, height):
+    """Hovedplatformen (samme mål som simulation.default_platform)"""
+    return simulation.default_platform(width, height)
+
+
+def floating(width, height):
+    """Hovedplatformen med tre svævende platforme over sig"""
+    main = main_platform(width, height)
+    size = width * 0.15
+    return [
+        main,
+        simulation.Platform(width * 0.25, main.y - 150, size, FLOATING_HEIGHT),
+        simulation.Platform(width * 0.75 - size, main.y - 150, size, FLOATING_HEIGHT),
+        simulation.Platform((width - size) / 2, main.y - 280, size, FLOATING_HEIGHT),
+    ], [], None
+
+
+def stepped(width, height):
+    """Fem trin der stiger mod midten"""
+    main = main_platform(width, height)
+    step = main.width / 5
+    rises = (0, 40, 80, 40, 0)
+    segments = [simulation.Platform(main.x + step * i, main.y - rise, step, PLATFORM_HEIGHT)
+                for i, rise in enumerate(rises)]
+    # Spillerne starter over de yderste trin ligesom på hovedplatformen
+    return segments, [], main
+
+
+def moving(width, height):
+    """Hovedplatformen med en platform der glider fra side til side og en der løfter"""
+    main = main_platform(width, height)
+    size = width * 0.15
+    return [main], [
+        simulation.MovingPlatform(main.x, main.y - 170, size, FLOATING_HEIGHT,
+                                  dx=main.width - size, period=480),
+        simulation.MovingPlatform((width - size) / 2, main.y - 60, size * 0.6, FLOATING_HEIGHT,
+                                  dy=-200, period=300),
+    ], None
+
+
+def islands(width, height):
+    """Hovedplatformen med mange små platforme i trapper over sig"""
+    main = main_platform(width, height)
+    size = main.width / 40
+    segments = [main]
+    for i in range(ISLAND_COUNT):
+        column = i % 40
+        row = i // 40
+        segments.append(simulation.Platform(main.x + column * size, main.y - 70 - row * 60 - (column % 4) * 12,
+                                            size * 0.8, FLOATING_HEIGHT))
+    return segments, [], None
+
+
+LAYOUTS = {
+    "floating": floating,
+    "stepped": stepped,
+    "moving": moving,
+    "islands": islands,
+}
+
+
+def make_stage(name="classic", width=simulation.WIDTH, height=simulation.HEIGHT):
+    """
+    Bygger en bane til simulationen.
+
+    Parametre:
+        name: Banens navn (se STAGE_NAMES)
+        width: Skærmens bredde i pixels
+        height: Skærmens højde i pixels
+
+    Returnerer en simulation.Platform for "classic", ellers en simulation.Stage.
+    """
+    if name == "classic":
+        return main_platform(width, height)
+    if name not in LAYOUTS:
+        raise ValueError(f"Ukendt bane: {name} (vælg mellem {', '.join(STAGE_NAMES)})")
+    segments, moving, spawn = LAYOUTS[name](width, height)
+    return simulation.Stage(segments, moving, spawn)
+
+
+def static_platforms(stage):
+    """Banens faste platforme (én for "classic")"""
+    return stage.segments if type(stage) is simulation.Stage else [stage]
+
+
+def moving_platforms(stage):
+    """Banens bevægelige platforme"""
+    return stage.moving if type(stage) is simulation.Stage else []
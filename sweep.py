@@ -0,0 +1,200 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Balance-sweep over regel-konstanterne uden grafik.
+
+Hver konstant får et interval (NAVN=start:stop:skridt, stop er med) eller
+en liste (NAVN=a,b,c), og alle kombinationer spilles som bot-mod-bot
+kampe med simulation.Rules, så hver kamp har sine egne regler i stedet
+for config.py's globale værdier. Kampene fordeles på en procespulje med
+én proces per kerne, og resultatet er en tabel med ring-out rate,
+gennemsnitlig rundelængde og timeout rate for hvert punkt.
+
+Eksempler:
+    python sweep.py BASE_KNOCKBACK=4:12:2 DASH_COOLDOWN=30,60,90
+    python sweep.py MAX_KNOCKBACK=20:40:10 --bots rusher keeper --games 20 --csv sweep.csv
+"""
+import argparse
+import csv
+import itertools
+import os
+import time
+from multiprocessing import Pool
+
+import simulation
+from bots import BOTS
+from tournament import play_match
+
+DEFAULT_BOTS = ("rusher", "keeper", "jumper")
+MAX_ROUNDS = 15  # Runder før en kamp stoppes (uafgjorte runder kan ellers fortsætte for evigt)
+
+# Konstanter i config.py der ikke indgår i reglerne
+NOT_RULES = {
+    "FRICTION": "FRICTION bruges ikke af reglerne (farten sættes til 0 når der ikke er input)",
+}
+
+
+def parse_number(text):
+    """Returnerer text som int hvis muligt, ellers som float"""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_parameter(text):
+    """
+    Læser et parameter-argument.
+
+    Parametre:
+        text: NAVN=start:stop:skridt eller NAVN=a,b,c
+
+    Returnerer (navn, liste af værdier).
+    """
+    name, separator, values = text.partition("=")
+    name = name.strip().upper()
+    if not separator or not values:
+        raise argparse.ArgumentTypeError(f"{text!r}: skriv NAVN=start:stop:skridt eller NAVN=a,b,c")
+    if name in NOT_RULES:
+        raise argparse.ArgumentTypeError(NOT_RULES[name])
+    if name not in simulation.RULE_NAMES:
+        raise argparse.ArgumentTypeError(f"{name} er ikke en regel-konstant "
+                                         f"(vælg mellem {', '.join(simulation.RULE_NAMES)})")
+    number = int if name in simulation.INTEGER_RULES else parse_number
+    try:
+        if ":" in values:
+            start, stop, step = (number(part) for part in values.split(":"))
+            if step <= 0 or stop < start:
+                raise argparse.ArgumentTypeError(f"{text!r}: intervallet skal have start <= stop og skridt > 0")
+            count = int((stop - start) / step + 1e-9) + 1
+            points = [start + i * step for i in range(count)]
+            if isinstance(step, float) or isinstance(start, float):
+                points = [round(value, 10) for value in points]  # Undgå 0.30000000000000004
+        else:
+            points = [number(part) for part in values.split(",")]
+    except ValueError:
+        kind = "heltal" if number is int else "tal"
+        raise argparse.ArgumentTypeError(f"{text!r}: værdierne skal være {kind}")
+    return name, points
+
+
+def play_point(job):
+    """
+    Spiller alle kampe for ét punkt i griddet. Køres i en arbejdsproces.
+
+    Parametre:
+        job: (punktets nummer, konstanter, bot_a, bot_b, seed, games)
+
+    Returnerer (punktets nummer, [kampe, uafgjorte, runder, ring-outs, timeouts, frames]).
+    """
+    index, values, bot_a, bot_b, seed, games = job
+    rules = simulation.Rules(**values)
+    totals = [0, 0, 0, 0, 0, 0]
+    for game in range(games):
+        left, right = (bot_b, bot_a) if game % 2 == 1 else (bot_a, bot_b)
+        winner, rounds = play_match(left, right, seed + game * 2, rules, MAX_ROUNDS)
+        totals[0] += 1
+        if winner not in (0, 1):
+            totals[1] += 1
+        for length, outcome, round_winner, damage_left, damage_right in rounds:
+            totals[2] += 1
+            if outcome == simulation.ROUND_TIMEOUT:
+                totals[4] += 1
+            else:
+                totals[3] += 1
+            totals[5] += length
+    return index, totals
+
+
+def make_jobs(points, names, games, seed):
+    """Ét job per punkt og bot-par (alle mod alle)"""
+    jobs = []
+    pairs = list(itertools.combinations(names, 2))
+    for index, values in enumerate(points):
+        for p, (bot_a, bot_b) in enumerate(pairs):
+            jobs.append((index, values, bot_a, bot_b, seed + p * 10007, games))
+    return jobs
+
+
+def result_rows(points, results):
+    """
+    Returnerer en række per punkt med konstanterne og de beregnede rater.
+
+    Parametre:
+        points: Liste af dicts med konstanterne
+        results: Summerne fra play_point per punkt
+    """
+    rows = []
+    for values, (matches, draws, rounds, ring_outs, timeouts, ticks) in zip(points, results):
+        row = dict(values)
+        row["kampe"] = matches
+        row["runder"] = rounds
+        row["ring_out_rate"] = ring_outs / rounds if rounds else 0.0
+        row["gns_længde_s"] = ticks / rounds / simulation.FRAME_RATE if rounds else 0.0
+        row["timeout_rate"] = timeouts / rounds if rounds else 0.0
+        row["uafgjort_rate"] = draws / matches if matches else 0.0
+        rows.append(row)
+    return rows
+
+
+def print_table(names, rows):
+    """Printer resultattabellen"""
+    widths = [max(len(name), 6) + 2 for name in names]
+    print()
+    print("".join(f"{name:>{width}}" for name, width in zip(names, widths))
+          + f"{'Runder':>8}{'Ring-out':>10}{'Gns. længde (s)':>17}{'Timeout':>9}{'Uafgj.':>8}")
+    for row in rows:
+        print("".join(f"{row[name]:>{width}}" for name, width in zip(names, widths))
+              + f"{row['runder']:>8}{row['ring_out_rate']:>9.1%} {row['gns_længde_s']:>17.1f}"
+              f"{row['timeout_rate']:>8.1%} {row['uafgjort_rate']:>7.1%}")
+
+
+def write_csv(path, rows):
+    """Gemmer resultattabellen som CSV"""
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balance-sweep over regel-konstanterne uden grafik")
+    parser.add_argument("parameters", nargs="+", type=parse_parameter, metavar="NAVN=INTERVAL",
+                        help="Konstant og værdier, f.eks. BASE_KNOCKBACK=4:12:2 eller DASH_COOLDOWN=30,60")
+    parser.add_argument("--bots", nargs="+", default=list(DEFAULT_BOTS), choices=list(BOTS),
+                        help="Bots der spiller mod hinanden i hvert punkt")
+    parser.add_argument("--games", type=int, default=10, help="Kampe per bot-par og punkt")
+    parser.add_argument("--seed", type=int, default=1, help="Seed til bottenes valg")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Antal arbejdsprocesser (standard er én per kerne)")
+    parser.add_argument("--csv", metavar="FIL", help="Gem resultaterne som CSV")
+    args = parser.parse_args()
+
+    names = list(dict.fromkeys(args.bots))
+    if len(names) < 2:
+        parser.error("der skal være mindst to forskellige bots")
+    grid = dict(args.parameters)  # Samme konstant to gange: den sidste gælder
+    constants = list(grid)
+    points = [dict(zip(constants, values)) for values in itertools.product(*grid.values())]
+
+    jobs = make_jobs(points, names, args.games, args.seed)
+    print(f"{len(points)} punkter, {len(jobs) * args.games} kampe")
+    results = [[0] * 6 for _ in points]
+    start = time.perf_counter()
+    with Pool(processes=args.workers) as pool:
+        for done, (index, totals) in enumerate(pool.imap_unordered(play_point, jobs), 1):
+            for i, value in enumerate(totals):
+                results[index][i] += value
+            print(f"\r  {done}/{len(jobs)} serier", end="", flush=True)
+    elapsed = time.perf_counter() - start
+    print()
+
+    rows = result_rows(points, results)
+    print_table(constants, rows)
+    if args.csv:
+        write_csv(args.csv, rows)
+        print(f"\nGemt i {args.csv}")
+    print(f"\nFærdig på {elapsed:.1f} sekunder med {args.workers} processer")
+
+
+if __name__ == "__main__":
+    main()
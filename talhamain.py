@@ -1,12 +1,21 @@
 # Af Talha og Azad (fælles kode stumper)
+import argparse
 import pygame
-import math
 import time
-import sys
-import os
+import random
 from config import *
-from talhaspiller import Spiller
+from talhaspiller import Spiller, read_input
 from bane2 import Bane
+from particles import ParticlePool
+import simulation
+import replay
+import assetloader
+import searchai
+import stages
+import textcache
+import hud
+from profiler import FrameProfiler, NullProfiler
+from dirtyrects import DirtyRenderer
 from main import Menu  # Tilføj denne import
 
 class GameState:
@@ -19,6 +28,75 @@ class GameState:
     ROUND_END = 3 # Runde afslutning
     GAME_OVER = 4 # Spil afslutning
 
+# Hændelser der betyder at vinduets indhold skal tegnes igen
+EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED)
+
+class SimClock:
+    """
+    Fast tidsskridt til simuleringen. Den målte tid lægges i en akkumulator,
+    og advance() fortæller hvor mange hele ticks der skal simuleres, så
+    spillets hastighed ikke afhænger af hvor hurtigt der tegnes. Et
+    langsomt billede giver flere ticks før næste billede (frame skip), og
+    et hurtigt billede giver ingen ticks, men tegnes interpoleret mellem de
+    to sidste ticks med alpha().
+    """
+    def __init__(self, tick_rate=FRAME_RATE, max_ticks=5):
+        """
+        Parametre:
+            tick_rate: Simulerings-ticks per sekund
+            max_ticks: Højeste antal ticks per billede (resten droppes, så et
+                       langsomt billede ikke giver en spiral af indhentning)
+        """
+        self.tick_time = 1 / tick_rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.last_time = None
+        self.dropped = 0  # Ticks der er droppet fordi et billede tog for lang tid
+
+    def reset(self):
+        """Glem den tid der er gået (f.eks. efter pause eller menu)"""
+        self.accumulator = 0.0
+        self.last_time = None
+
+    def advance(self):
+        """Returnerer antal ticks der skal simuleres siden sidste kald"""
+        now = time.perf_counter()
+        if self.last_time is not None:
+            self.accumulator += now - self.last_time
+        self.last_time = now
+        ticks = int(self.accumulator / self.tick_time)
+        self.accumulator -= ticks * self.tick_time
+        if ticks > self.max_ticks:
+            self.dropped += ticks - self.max_ticks
+            ticks = self.max_ticks
+            self.accumulator = 0.0
+        return ticks
+
+    def alpha(self):
+        """Returnerer hvor langt der er til næste tick (0-1), til interpolation af tegningen"""
+        return min(1.0, self.accumulator / self.tick_time)
+
+# Længste spring i pixels per tick der interpoleres (længere spring er respawn eller ny runde)
+INTERPOLATION_SNAP = 150
+
+def interpolate(previous, current, alpha):
+    """
+    Returnerer en position mellem to simulerings-ticks.
+    
+    Parametre:
+        previous: (x, y) ved forrige tick
+        current: (x, y) ved sidste tick
+        alpha: Hvor langt mellem de to ticks (0-1)
+    """
+    px, py = previous
+    x, y = current
+    if abs(x - px) > INTERPOLATION_SNAP or abs(y - py) > INTERPOLATION_SNAP:
+        return current
+    return (round(px + (x - px) * alpha), round(py + (y - py) * alpha))
+
+# Pointbjælken i toppen af skærmen (tegnes kun forfra når point eller ur ændrer sig)
+score_bar = hud.ScoreBar(WIDTH, MEDIUM_FONT, GRAY, (RED, BLUE), BLACK)
+
 def display_points(window, spiller1, spiller2, time_left):
     """
     Viser spillernes point og den resterende tid i toppen af skærmen.
@@ -28,20 +106,15 @@ def display_points(window, spiller1, spiller2, time_left):
         spiller1: Første spiller objekt
         spiller2: Anden spiller objekt
         time_left: Resterende tid i sekunder
+    
+    Returnerer bjælkens rektangel hvis den er tegnet forfra, ellers None.
     """
-    pygame.draw.rect(window, GRAY, (0, 0, WIDTH, 50))  # Tegner en grå rektangel som baggrund for pointvisning
     p1_text = f"{spiller1.name}: {spiller1.points}"  # Formaterer tekst til spiller 1's navn og point
     p2_text = f"{spiller2.name}: {spiller2.points}"  # Formaterer tekst til spiller 2's navn og point
-    font = pygame.font.Font(None, MEDIUM_FONT)  # Opretter en skrifttype til teksten
-    p1_render = font.render(p1_text, True, RED)  # Render tekst for spiller 1 i rød farve
-    p2_render = font.render(p2_text, True, BLUE)  # Render tekst for spiller 2 i blå farve
-    window.blit(p1_render, (20, 10))  # Tegner spiller 1's tekst på skærmen
-    window.blit(p2_render, (WIDTH - 20 - p2_render.get_width(), 10))  # Tegner spiller 2's tekst på skærmen
     minutes = int(time_left // 60)  # Beregner antal minutter tilbage
     seconds = int(time_left % 60)  # Beregner antal sekunder tilbage
     time_text = f"{minutes}:{seconds:02d}"  # Formaterer tidstekst
-    time_render = font.render(time_text, True, BLACK)  # Render tidstekst i sort farve
-    window.blit(time_render, (WIDTH//2 - time_render.get_width()//2, 10))  # Tegner tidstekst i midten af skærmen
+    return score_bar.draw(window, p1_text, p2_text, time_text)  # Bjælken tegnes kun forfra når teksterne ændrer sig
 
 def display_round_start(window, round_num):
     """
@@ -51,14 +124,9 @@ def display_round_start(window, round_num):
         window: Pygame vindue at tegne på
         round_num: Aktuelle rundenummer
     """
-    overlay = pygame.Surface((WIDTH, HEIGHT))  # Opretter et overlag til at dække hele skærmen
-    overlay.set_alpha(128)  # Sætter gennemsigtighed for overlaget
-    overlay.fill(BLACK)  # Fylder overlaget med sort farve
-    window.blit(overlay, (0, 0))  # Tegner overlaget på skærmen
-    font = pygame.font.Font(None, LARGE_FONT)  # Opretter en stor skrifttype til rundenummer
-    text = font.render(f"Runde {round_num}", True, WHITE)  # Render rundenummer tekst i hvid farve
-    text_rect = text.get_rect(center=(WIDTH//2, HEIGHT//2))  # Centrering af tekst på skærmen
-    window.blit(text, text_rect)  # Tegner rundenummer tekst på skærmen
+    hud.get_overlay((WIDTH, HEIGHT), (
+        (f"Runde {round_num}", LARGE_FONT, WHITE, (WIDTH//2, HEIGHT//2), "center"),  # Rundenummer tekst i hvid farve
+    ), dim=BLACK).draw(window)  # Mørkt lag og tekst fra cachen
 
 def display_winner(window, winner):
     """
@@ -68,16 +136,36 @@ def display_winner(window, winner):
         window: Pygame vindue at tegne på
         winner: Vinder-objektet med navn og farve
     """
-    overlay = pygame.Surface((WIDTH, HEIGHT))  # Opretter et overlag til at dække hele skærmen
-    overlay.set_alpha(128)  # Sætter gennemsigtighed for overlaget
-    overlay.fill(BLACK)  # Fylder overlaget med sort farve
-    window.blit(overlay, (0, 0))  # Tegner overlaget på skærmen
-    font = pygame.font.Font(None, LARGE_FONT)  # Opretter en stor skrifttype til vinder tekst
-    text = font.render(f"{winner.name} Wins!", True, GOLD)  # Render vinder tekst i guld farve
-    window.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2 - 50))  # Tegner vinder tekst på skærmen
-    font = pygame.font.Font(None, SMALL_FONT)  # Opretter en lille skrifttype til instruktioner
-    text = font.render("Tryk MELLEMRUM for at starte en ny kamp", True, WHITE)  # Render instruktioner i hvid farve
-    window.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2 + 50))  # Tegner instruktioner på skærmen
+    hud.get_overlay((WIDTH, HEIGHT), (
+        (f"{winner.name} Wins!", LARGE_FONT, GOLD, (WIDTH//2, HEIGHT//2 - 50), "midtop"),  # Vinder tekst i guld farve
+        ("Tryk MELLEMRUM for at starte en ny kamp", SMALL_FONT, WHITE, (WIDTH//2, HEIGHT//2 + 50), "midtop"),  # Instruktioner
+    ), dim=BLACK).draw(window)  # Mørkt lag og tekst fra cachen
+
+def display_pause(window):
+    """
+    Viser pause skærmen.
+    
+    Parametre:
+        window: Pygame vindue at tegne på
+    """
+    hud.get_overlay((WIDTH, HEIGHT), (
+        ("PAUSE", LARGE_FONT, BLACK, (WIDTH//2, HEIGHT//2 - 50), "midtop"),
+        ("Tryk ESC for at fortsætte", SMALL_FONT, BLACK, (WIDTH//2, HEIGHT//2 + 50), "midtop"),
+    )).draw(window)
+
+def wait_for_events(timeout):
+    """
+    Sover indtil der kommer en hændelse (højst timeout millisekunder) og
+    returnerer alle ventende hændelser. Bruges i stedet for at tegne ved
+    FRAME_RATE når intet bevæger sig.
+    
+    Parametre:
+        timeout: Længste ventetid i millisekunder
+    """
+    event = pygame.event.wait(timeout)
+    events = [] if event.type == pygame.NOEVENT else [event]
+    events.extend(pygame.event.get())
+    return events
 
 def handle_collision(spiller1, spiller2, punch_sound=None):
     """
@@ -88,46 +176,24 @@ def handle_collision(spiller1, spiller2, punch_sound=None):
         spiller2: Anden spiller objekt
         punch_sound: Lydefekt for kollision (valgfri)
     """
-    center1 = spiller1.get_center()  # Henter centrum af spiller 1
-    center2 = spiller2.get_center()  # Henter centrum af spiller 2
-    distance = math.dist(center1, center2)  # Beregner afstand mellem spillere
-    if distance < PLAYER_SIZE * 2 and not (spiller1.is_dead or spiller2.is_dead):  # Tjekker om spillere rører hinanden
+    if simulation.collide(spiller1, spiller2):  # Reglerne for skade, combo og knockback ligger i simulation.py
         if punch_sound:  # Hvis der er en lydeffekt tilgængelig
             punch_sound.play()  # Afspil lydeffekt
-        direction = 1 if center1[0] < center2[0] else -1  # Bestemmer retning baseret på position
-        spiller1_force = abs(spiller1.speed_x) * (1.5 if spiller1.is_dashing else 1)  # Beregner kraft for spiller 1
-        spiller2_force = abs(spiller2.speed_x) * (1.5 if spiller2.is_dashing else 1)  # Beregner kraft for spiller 2
-        if (spiller1.is_dashing or spiller1_force > 2) and spiller2.recovery_frames == 0:  # Tjekker om spiller 1 angriber
-            force = BASE_KNOCKBACK * (1.8 if spiller1.is_dashing else 1)  # Beregner knockback kraft
-            force *= (1 + spiller2.damage / 100)  # Øg kraft baseret på skadeprocent (jo mere skade, jo længere knockback)
-            if spiller1 == spiller2.last_attacker:  # Opdaterer combo system
-                spiller2.combo_count += 1
-            else:
-                spiller2.combo_count = 1
-            spiller2.last_attacker = spiller1
-            spiller2.combo_timer = 120
-            damage = DAMAGE_AMOUNT * (DASH_DAMAGE_BONUS if spiller1.is_dashing else 1)  # Beregner skade
-            spiller2.damage = min(spiller2.damage + damage, MAX_DAMAGE)  # Opdaterer skade
-            spiller2.apply_knockback((direction, -0.15), force)  # Anvender knockback
-        if (spiller2.is_dashing or spiller2_force > 2) and spiller1.recovery_frames == 0:  # Tjekker om spiller 2 angriber
-            force = BASE_KNOCKBACK * (1.8 if spiller2.is_dashing else 1)  # Beregner knockback kraft
-            force *= (1 + spiller1.damage / 100)  # Justerer kraft baseret på skade
-            if spiller2 == spiller1.last_attacker:  # Opdaterer combo system
-                spiller1.combo_count += 1
-            else:
-                spiller1.combo_count = 1
-            spiller1.last_attacker = spiller2
-            spiller1.combo_timer = 120
-            damage = DAMAGE_AMOUNT * (DASH_DAMAGE_BONUS if spiller2.is_dashing else 1)  # Beregner skade
-            spiller1.damage = min(spiller1.damage + damage, MAX_DAMAGE)  # Opdaterer skade
-            spiller1.apply_knockback((-direction, -0.15), force)  # Anvender knockback
-        overlap = PLAYER_SIZE * 2 - distance  # Beregner overlap for at undgå overlap
-        if center1[0] < center2[0]:  # Justerer positioner for at undgå overlap
-            spiller1.body.x -= overlap / 2
-            spiller2.body.x += overlap / 2
-        else:
-            spiller1.body.x += overlap / 2
-            spiller2.body.x -= overlap / 2
+    spiller1.spawn_effects()  # Tilføj hit partikler for spillere der blev ramt
+    spiller2.spawn_effects()
+
+def handle_collisions(spillere, punch_sound=None):
+    """
+    Håndterer kollisioner mellem vilkårligt mange spillere (alle mod alle).
+    
+    Parametre:
+        spillere: Liste med spiller objekter
+        punch_sound: Lydefekt for kollision (valgfri)
+    """
+    if simulation.collide_all(spillere) and punch_sound:  # Broadphase og regler ligger i simulation.py
+        punch_sound.play()  # Afspil lydeffekt én gang per frame
+    for spiller in spillere:
+        spiller.spawn_effects()  # Tilføj hit partikler for spillere der blev ramt
 
 def display_round_winner(window, winner_name, winner_color):
     """
@@ -138,18 +204,10 @@ def display_round_winner(window, winner_name, winner_color):
         winner_name: Vinderens navn
         winner_color: Vinderens farve
     """
-    overlay = pygame.Surface((WIDTH, HEIGHT))  # Opretter et overlag til at dække hele skærmen
-    overlay.set_alpha(128)  # Sætter gennemsigtighed for overlaget
-    overlay.fill(BLACK)  # Fylder overlaget med sort farve
-    window.blit(overlay, (0, 0))  # Tegner overlaget på skærmen
-    font = pygame.font.Font(None, LARGE_FONT)  # Opretter en stor skrifttype til vinder tekst
-    text = font.render(f"{winner_name} har vundet runden!", True, winner_color)  # Render vinder tekst i vinderens farve
-    text_rect = text.get_rect(center=(WIDTH//2, HEIGHT//2))  # Centrering af tekst på skærmen
-    window.blit(text, text_rect)  # Tegner vinder tekst på skærmen
-    font = pygame.font.Font(None, MEDIUM_FONT)  # Opretter en medium skrifttype til instruktioner
-    text = font.render("Tryk MELLEMRUM for næste runde", True, WHITE)  # Render instruktioner i hvid farve
-    text_rect = text.get_rect(center=(WIDTH//2, HEIGHT//2 + 50))  # Centrering af instruktioner
-    window.blit(text, text_rect)  # Tegner instruktioner på skærmen
+    hud.get_overlay((WIDTH, HEIGHT), (
+        (f"{winner_name} har vundet runden!", LARGE_FONT, winner_color, (WIDTH//2, HEIGHT//2), "center"),  # Vinder tekst i vinderens farve
+        ("Tryk MELLEMRUM for næste runde", MEDIUM_FONT, WHITE, (WIDTH//2, HEIGHT//2 + 50), "center"),  # Instruktioner i hvid farve
+    ), dim=BLACK).draw(window)  # Mørkt lag og tekst fra cachen
 
 def display_game_winner(window, winner_name, winner_color):
     """
@@ -160,111 +218,179 @@ def display_game_winner(window, winner_name, winner_color):
         winner_name: Vinderens navn
         winner_color: Vinderens farve
     """
-    overlay = pygame.Surface((WIDTH, HEIGHT))  # Opretter et overlag til at dække hele skærmen
-    overlay.set_alpha(128)  # Sætter gennemsigtighed for overlaget
-    overlay.fill(BLACK)  # Fylder overlaget med sort farve
-    window.blit(overlay, (0, 0))  # Tegner overlaget på skærmen
-    font = pygame.font.Font(None, LARGE_FONT)  # Opretter en stor skrifttype til vinder tekst
-    winner_text = font.render(f"{winner_name} vandt spillet!", True, winner_color)  # Render vinder tekst i vinderens farve
-    text_rect = winner_text.get_rect(center=(WIDTH//2, HEIGHT//2 - 50))  # Centrering af vinder tekst
-    window.blit(winner_text, text_rect)  # Tegner vinder tekst på skærmen
-    font = pygame.font.Font(None, MEDIUM_FONT)  # Opretter en medium skrifttype til valgmuligheder
-    new_game_text = font.render("Tryk MELLEMRUM for nyt spil", True, WHITE)  # Render tekst for nyt spil i hvid farve
-    menu_text = font.render("Tryk ESC for hovedmenu", True, WHITE)  # Render tekst for hovedmenu i hvid farve
-    new_game_rect = new_game_text.get_rect(center=(WIDTH//2, HEIGHT//2 + 50))  # Centrering af nyt spil tekst
-    menu_rect = menu_text.get_rect(center=(WIDTH//2, HEIGHT//2 + 100))  # Centrering af hovedmenu tekst
-    window.blit(new_game_text, new_game_rect)  # Tegner nyt spil tekst på skærmen
-    window.blit(menu_text, menu_rect)  # Tegner hovedmenu tekst på skærmen
+    hud.get_overlay((WIDTH, HEIGHT), (
+        (f"{winner_name} vandt spillet!", LARGE_FONT, winner_color, (WIDTH//2, HEIGHT//2 - 50), "center"),  # Vinder tekst i vinderens farve
+        ("Tryk MELLEMRUM for nyt spil", MEDIUM_FONT, WHITE, (WIDTH//2, HEIGHT//2 + 50), "center"),  # Tekst for nyt spil i hvid farve
+        ("Tryk ESC for hovedmenu", MEDIUM_FONT, WHITE, (WIDTH//2, HEIGHT//2 + 100), "center"),  # Tekst for hovedmenu i hvid farve
+    ), dim=BLACK).draw(window)  # Mørkt lag og tekst fra cachen
 
-def main():
+def start_match(seed, rng, bane, spillere, particles):
+    """
+    Gør spillere, partikler og bane klar til en ny kamp i samme proces
+    (vindue, mixer og indlæste lyde beholdes).
+    
+    Parametre:
+        seed: Den nye kamps seed
+        rng: Kampens tilfældighedsgenerator (deles af spillere og bane)
+        bane: Banen
+        spillere: Spillerne
+        particles: Den fælles partikelpulje
+    
+    Returnerer den nye kamps MatchState.
+    """
+    rng.seed(seed)
+    bane.invalidateStaticLayer()  # Græs og partikler i afgrunden tegnes om fra det nye seed, som ved start
+    simulation.new_match_fighters(spillere, bane.stage)  # Også point og timere
+    particles.clear()
+    return simulation.MatchState(spillere, bane.stage, seed)
+
+def main(seed=None, profile=False, profile_csv=None, dirty_rects=False, stage="classic", render_rate=RENDER_RATE):
     """
     Hovedspilsløkke og initialisering af spillet.
+    
+    Parametre:
+        seed: Seed til kampens tilfældighedsgenerator (valgfri, ellers tilfældig)
+        profile: Mål tiden for hver fase i hvert billede (F3 viser grafen)
+        profile_csv: Fil hvor hver frames tider skrives (slår også profilering til)
+        dirty_rects: Tegn og opdater kun de dele af skærmen der ændrer sig under kampen
+        stage: Banens platforme (se stages.STAGE_NAMES)
+        render_rate: Højeste antal billeder per sekund under kampen (0 for
+                     ubegrænset). Simuleringen kører altid med FRAME_RATE ticks.
     """
+    started = time.perf_counter()  # Til tiden til første billede
     pygame.init()
     pygame.font.init()
     pygame.mixer.init()  # Initialiser mixer til menu lyde
     
-    # Indlæs lydeffekter
-    try:
-        punch_sound = pygame.mixer.Sound("assets/punch.mp3")
-        punch_sound.set_volume(0.4)  # Sæt lydstyrke til 40%
-    except:
-        print("Advarsel: Kunne ikke indlæse punch.mp3")
-        punch_sound = None
+    # Lydeffekter afkodes i baggrunden mens det første billede tegnes
+    assets = assetloader.AssetLoader()
+    assets.load_sound("punch", "assets/punch.mp3", 0.4)  # Sæt lydstyrke til 40%
     
     window = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Sumo Battle!")
     
+    # Alle tilfældige valg i kampen kommer fra én seedet generator
+    if seed is None:
+        seed = random.randrange(simulation.SEED_LIMIT)
+    rng = random.Random(seed)
+    
     # Opret menu
-    menu = Menu(WIDTH, HEIGHT)
+    menu = Menu(WIDTH, HEIGHT, random.Random(seed), assets)
     
     # Opret den japansk-inspirerede bane først
-    bane = Bane(WIDTH, HEIGHT)
+    bane = Bane(WIDTH, HEIGHT, rng, stage)
+    
+    # Fælles partikelpulje til begge spillere
+    particles = ParticlePool()
     
     # Opret spillere med faste startpositioner - brug platform fra banen
-    platform = bane.platformSegments[0]  # Hent platformen fra banen
+    platform = bane.stage  # Hent platformen (eller banens platforme) fra banen
     spiller1 = Spiller(platform.x + SPAWN_DISTANCE, 
-                      platform.y - SPAWN_HEIGHT, RED, "Rød Spiller")
+                      platform.y - SPAWN_HEIGHT, RED, "Rød Spiller", rng, particles)
     spiller2 = Spiller(platform.x + platform.width - SPAWN_DISTANCE, 
-                      platform.y - SPAWN_HEIGHT, BLUE, "Blå Spiller")
+                      platform.y - SPAWN_HEIGHT, BLUE, "Blå Spiller", rng, particles)
+    
+    # Kampens tilstand (runder, respawn og point) - tiden måles i simulerings-ticks
+    match = simulation.MatchState([spiller1, spiller2], platform, seed)
+    sim_clock = SimClock(FRAME_RATE)
+    previous = [(spiller1.x, spiller1.y), (spiller2.x, spiller2.y)]  # Positioner ved forrige tick (til interpolation)
+    recorder = replay.InputRecorder(seed, stage)  # Optager input så kampen kan afspilles igen
     
     clock = pygame.time.Clock()
     running = True
     
+    # Tidsmåling af hver fase i billedet (gør ingenting uden profilering)
+    if profile or profile_csv:
+        profiler = FrameProfiler(profile_csv)
+        profiler.instrument()
+    else:
+        profiler = NullProfiler()
+    
+    # Dirty-rect tegning af kampen (valgfri)
+    renderer = DirtyRenderer(window) if dirty_rects else None
+    
     # Spiltilstand - start med MENU i stedet for BATTLE
     state = GameState.MENU
-    round_num = 1
-    round_start_time = time.time()
+    time_left = match.time_left()
     
-    # Tilføj disse variabler for respawn timing
-    RESPAWN_DELAY = 1500  # 1.5 sekunder i millisekunder
-    respawn_timer = 0
-    waiting_for_respawn = False
+    def save_recording():
+        """
+        Gemmer kampens input, så den kan afspilles igen med replay.py.
+        """
+        nonlocal recorder
+        if recorder is not None and recorder.inputs:
+            try:
+                recorder.save(match)
+            except OSError as e:
+                print(f"Advarsel: Kunne ikke gemme optagelse: {e}")
+        recorder = None
     
-    # Tilføj disse variabler for visning af rundestart
-    ROUND_START_DELAY = 2000  # 2 sekunder til at vise rundenummer
-    round_start_display_timer = 0
-    showing_round_start = False
+    def new_match():
+        """
+        Starter en ny kamp med et nyt seed og nulstillede spillere.
+        """
+        nonlocal match, seed, recorder, previous
+        save_recording()
+        seed = random.randrange(simulation.SEED_LIMIT)
+        match = start_match(seed, rng, bane, [spiller1, spiller2], particles)
+        recorder = replay.InputRecorder(seed, stage)
+        previous = [(spiller1.x, spiller1.y), (spiller2.x, spiller2.y)]
+        sim_clock.reset()
     
-    def reset_round():
+    def simulate_tick(inputs):
         """
-        Nulstiller runden ved at genstarte spillernes positioner og tilstand.
+        Kører én fast simulerings-tick og opdaterer partikler og lyd.
+        
+        Parametre:
+            inputs: Input bitfelter for de to spillere
         """
-        nonlocal showing_round_start, round_start_display_timer, round_winner
-        spiller1.body.x = platform.x + SPAWN_DISTANCE  # Nulstiller spiller 1's x-position
-        spiller1.body.y = platform.y - SPAWN_HEIGHT  # Nulstiller spiller 1's y-position
-        spiller2.body.x = platform.x + platform.width - SPAWN_DISTANCE  # Nulstiller spiller 2's x-position
-        spiller2.body.y = platform.y - SPAWN_HEIGHT  # Nulstiller spiller 2's y-position
-        spiller1.start_position()  # Nulstiller spiller 1's startposition
-        spiller2.start_position()  # Nulstiller spiller 2's startposition
-        spiller1.is_dead = False  # Nulstiller spiller 1's død tilstand
-        spiller2.is_dead = False  # Nulstiller spiller 2's død tilstand
-        round_winner = None  # Nulstiller rundevinder
-        showing_round_start = True  # Sætter til at vise rundestart
-        round_start_display_timer = pygame.time.get_ticks()  # Gemmer nuværende tid for rundestart display
-    
-    # Hold styr på hvem der faldt først
-    first_to_fall = None
-    # Hold styr på vinderen af den aktuelle runde
-    round_winner = None
+        nonlocal previous
+        round_num = match.round_num
+        previous = [(spiller1.x, spiller1.y), (spiller2.x, spiller2.y)]
+        recorder.record(inputs)
+        simulation.step(match, inputs)
+        if spiller1.events & simulation.EVENT_CONTACT:
+            assets.play("punch")  # Spillerne ramte hinanden (hvis lyden er indlæst)
+        if match.round_num != round_num:
+            particles.clear()  # Ny runde - fjern gamle partikler
+        elif not match.showing_round_start:
+            particles.update()
+        spiller1.spawn_effects()
+        spiller2.spawn_effects()
+    
+    cpu = None  # searchai.SearchAI når Blå Spiller styres af computeren
+    still_frame = None  # Tilstanden hvis stillbillede allerede er vist (pause og slutskærm)
     
     while running:
+        dirty_frame = False  # Sættes når billedet er tegnet med dirty-rects
+        redraw = True  # Slettes når et stillbillede allerede er vist
+        
         if state == GameState.MENU:
-            window.fill((0, 0, 0))
-            menu.draw(window)
+            # Kun baggrundens cirkler bevæger sig, så menuen tegnes ved MENU_FRAME_RATE
+            still_frame = None
+            menu.draw(window, FRAME_RATE / MENU_FRAME_RATE)  # Cirklerne flytter sig lige så hurtigt som ved FRAME_RATE
+            profiler.lap("hud")
             
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                     
                 action = menu.handle_input(event)
-                if action == "Start Game":
+                if action in ("Start Game", "Play vs CPU"):
                     state = GameState.BATTLE
-                    pygame.mixer.music.stop()  # Stop menu musik
+                    sim_clock.reset()  # Tiden i menuen tæller ikke med i kampen
+                    assets.stop_music()  # Stop menu musik
+                    if action == "Play vs CPU" and cpu is None:
+                        cpu = searchai.SearchAI(platform, index=1, seed=seed, rules=match.rules)  # CPU styrer Blå Spiller
+                    elif action == "Start Game" and cpu is not None:
+                        cpu.close()  # To spillere ved tastaturet
+                        cpu = None
                 elif action == "Quit":
                     running = False
+            profiler.lap("events")
                     
         elif state == GameState.BATTLE:
+            still_frame = None
             # Håndter almindelige spilhændelser først
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -272,191 +398,202 @@ def main():
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         state = GameState.MENU
-                        pygame.mixer.music.play(-1)  # Genoptag menu musik
+                        assets.play_music()  # Genoptag menu musik
                     elif event.key == pygame.K_p:
                         state = GameState.PAUSE
+                    elif event.key == pygame.K_F3:
+                        profiler.toggle_graph()
             
-            now = time.time()
-            # Konverter ROUND_TIME fra minutter til sekunder ved beregning
-            time_left = max(0, (ROUND_TIME * 60) - (now - round_start_time))
-            current_time = pygame.time.get_ticks()
+            # Læs tasterne én gang per billede - de gælder for alle ticks i billedet
+            keys = pygame.key.get_pressed()
+            inputs = (read_input(keys, pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s),
+                      read_input(keys, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN))
+            profiler.lap("events")
             
-            # Tjek om tiden er udløbet
-            if time_left <= 0 and not waiting_for_respawn and not showing_round_start:
-                waiting_for_respawn = True
-                respawn_timer = current_time
-                
-                # Afgør vinderen baseret på skade
-                if spiller1.damage < spiller2.damage:
-                    # Spiller 1 vinder (mindst skade)
-                    spiller1.points += 1
-                    round_winner = "red"
-                    display_round_winner(window, "Rød Spiller", RED)
-                elif spiller2.damage < spiller1.damage:
-                    # Spiller 2 vinder (mindst skade)
-                    spiller2.points += 1
-                    round_winner = "blue"
-                    display_round_winner(window, "Blå Spiller", BLUE)
-                else:
-                    # Uafgjort - begge får et point
-                    spiller1.points += 1
-                    spiller2.points += 1
-                    round_winner = "tie"
-                    display_round_winner(window, "Uafgjort!", WHITE)
-                
-                # Tjek om spillet er slut
-                if spiller1.points >= MAX_POINTS or spiller2.points >= MAX_POINTS:
-                    state = GameState.GAME_OVER
-                    winner_name = "Rød Spiller" if spiller1.points > spiller2.points else "Blå Spiller"
-                    winner_color = RED if spiller1.points > spiller2.points else BLUE
-                    display_game_winner(window, winner_name, winner_color)
+            # Kør de simulerings-ticks der er gået siden sidste billede
+            if state == GameState.BATTLE:
+                for _ in range(sim_clock.advance()):
+                    if cpu is not None:
+                        # CPU'en venter aldrig på sine arbejdsprocesser, så den kan spørges hver tick
+                        inputs = (inputs[0], cpu.next_input(match, inputs[0]))
+                    simulate_tick(inputs)
+                    if match.game_over:
+                        state = GameState.GAME_OVER
+                        save_recording()
+                        break
+            else:
+                sim_clock.reset()  # Pause og menu stopper kampens ur
+            
+            time_left = match.time_left()
+            profiler.lap("sim")
             
-            # Tegn banen med spillernes skadeprocent
-            bane.draw(window, spiller1, spiller2)
+            # Tegn mellem de to sidste ticks, så bevægelsen er jævn ved mere end FRAME_RATE billeder
+            alpha = sim_clock.alpha() if state == GameState.BATTLE else 1.0
+            position1 = interpolate(previous[0], (spiller1.x, spiller1.y), alpha)
+            position2 = interpolate(previous[1], (spiller2.x, spiller2.y), alpha)
             
-            # Opdater kun spillere hvis ikke viser rundestart
-            if not showing_round_start:
-                # Opdater spillere
-                if not spiller1.is_dead:
-                    spiller1.move(pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s)
-                if not spiller2.is_dead:
-                    spiller2.move(pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+            # Overlag der dækker hele skærmen tegnes altid med den fulde tegning
+            dirty_frame = (renderer is not None and not match.showing_round_start
+                           and not match.waiting_for_respawn)
+            
+            if dirty_frame:
+                # Kopier baggrunden tilbage under sidste billedes spillere og partikler
+                background, changed = bane.updateBackground(window, spiller1, spiller2)
+                renderer.begin(background, changed)
+                for rect in bane.drawMovingPlatforms(window, alpha):
+                    renderer.add(rect)
+                profiler.lap("bane")
                 
-                # Tjek for fald i afgrunden
-                if not waiting_for_respawn:  # Tjek kun for fald hvis runden ikke er slut
-                    if not spiller1.is_dead and spiller1.body.top > platform.y:  # Hvis spiller er under platformen
-                        spiller1.is_dead = True
-                        if first_to_fall is None:
-                            first_to_fall = 1
-                    
-                    if not spiller2.is_dead and spiller2.body.top > platform.y:  # Hvis spiller er under platformen
-                        spiller2.is_dead = True
-                        if first_to_fall is None:
-                            first_to_fall = 2
+                # Tegn spillere og husk hvor der er tegnet
+                renderer.add(particles.draw(window, alpha=alpha))
+                renderer.add(spiller1.draw(window, position1))
+                renderer.add(spiller2.draw(window, position2))
+                profiler.lap("fighters")
                 
-                # Opdater spillere
-                if not spiller1.is_dead:
-                    spiller1.update(platform)
-                if not spiller2.is_dead:
-                    spiller2.update(platform)
+                # Bjælken tegnes altid, men opdateres kun på skærmen når den er ændret
+                renderer.add(display_points(window, spiller1, spiller2, time_left))
+            else:
+                # Tegn banen med spillernes skadeprocent
+                bane.draw(window, spiller1, spiller2, alpha)
+                profiler.lap("bane")
                 
-                # Håndter kollisioner hvis begge spillere er i live
-                if not spiller1.is_dead and not spiller2.is_dead:
-                    handle_collision(spiller1, spiller2, punch_sound)
+                # Tegn spillere
+                particles.draw(window, alpha=alpha)
+                spiller1.draw(window, position1)
+                spiller2.draw(window, position2)
+                profiler.lap("fighters")
                 
-                # Tjek for rundens afslutning
-                if not waiting_for_respawn and (spiller1.is_dead or spiller2.is_dead):
-                    waiting_for_respawn = True
-                    respawn_timer = current_time
-                    
-                    # Tildel point baseret på hvem der faldt først
-                    if first_to_fall == 1:  # Rød faldt først, Blå vinder
-                        spiller2.points += 1
-                        round_winner = "blue"
-                        display_round_winner(window, "Blå Spiller", BLUE)
-                    elif first_to_fall == 2:  # Blå faldt først, Rød vinder
-                        spiller1.points += 1
-                        round_winner = "red"
-                        display_round_winner(window, "Rød Spiller", RED)
-                    else:  # Hvis ingen er faldet endnu, men nogen er død
-                        if spiller1.is_dead:  # Rød er død, Blå vinder
-                            spiller2.points += 1
-                            round_winner = "blue"
-                            display_round_winner(window, "Blå Spiller", BLUE)
-                        else:  # Blå er død, Rød vinder
-                            spiller1.points += 1
-                            round_winner = "red"
-                            display_round_winner(window, "Rød Spiller", RED)
-                    
-                    # Nulstil first_to_fall til næste runde men behold styr på hvem der vandt
-                    first_to_fall = None
-                    
-                    # Tjek om spillet er slut
-                    if spiller1.points >= MAX_POINTS or spiller2.points >= MAX_POINTS:
-                        state = GameState.GAME_OVER
-                        winner_name = "Rød Spiller" if spiller1.points > spiller2.points else "Blå Spiller"
-                        winner_color = RED if spiller1.points > spiller2.points else BLUE
-                        display_game_winner(window, winner_name, winner_color)
-            
-            # Håndter respawn timing
-            if waiting_for_respawn and current_time - respawn_timer >= RESPAWN_DELAY:
-                waiting_for_respawn = False
-                round_num += 1
-                round_start_time = time.time()
-                reset_round()
-            
-            # Tegn spillere
-            spiller1.draw(window)
-            spiller2.draw(window)
-            
-            # Tegn UI ovenpå
-            display_points(window, spiller1, spiller2, time_left)
+                # Tegn UI ovenpå
+                display_points(window, spiller1, spiller2, time_left)
             
             # Vis rundestart display
-            if showing_round_start:
-                display_round_start(window, round_num)
-                if current_time - round_start_display_timer >= ROUND_START_DELAY:
-                    showing_round_start = False
+            if match.showing_round_start:
+                display_round_start(window, match.round_num)
             
             # Hvis venter på respawn, fortsæt med at vise vinder besked
-            elif waiting_for_respawn:
-                if round_winner == "blue":
+            elif match.waiting_for_respawn:
+                if match.round_winner == 1:
                     display_round_winner(window, "Blå Spiller", BLUE)
-                elif round_winner == "red":
+                elif match.round_winner == 0:
                     display_round_winner(window, "Rød Spiller", RED)
+                else:
+                    display_round_winner(window, "Uafgjort!", WHITE)
+            profiler.lap("hud")
         
         elif state == GameState.GAME_OVER:
-            # Tegn banen som baggrund
-            bane.draw(window)
-            spiller1.draw(window)
-            spiller2.draw(window)
-            display_points(window, spiller1, spiller2, time_left)
-            winner_name = "Rød Spiller" if spiller1.points > spiller2.points else "Blå Spiller"
-            winner_color = RED if spiller1.points > spiller2.points else BLUE
-            display_game_winner(window, winner_name, winner_color)
+            # Intet bevæger sig, så billedet tegnes én gang og der ventes på input
+            if still_frame != state:
+                # Tegn banen som baggrund
+                bane.draw(window)
+                profiler.lap("bane")
+                particles.draw(window)
+                spiller1.draw(window)
+                spiller2.draw(window)
+                profiler.lap("fighters")
+                display_points(window, spiller1, spiller2, time_left)
+                winner_name = "Rød Spiller" if spiller1.points > spiller2.points else "Blå Spiller"
+                winner_color = RED if spiller1.points > spiller2.points else BLUE
+                display_game_winner(window, winner_name, winner_color)
+                profiler.lap("hud")
+                still_frame = state
+                events = pygame.event.get()  # Billedet skal vises før der ventes
+            else:
+                redraw = False
+                events = wait_for_events(IDLE_TIMEOUT)
             
             # Tjek for nyt spil eller returner til menu
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type in EXPOSE_EVENTS:
+                    still_frame = None  # Vinduet skal tegnes igen
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE:
-                        # Ryd ressourcer
-                        pygame.mixer.music.stop()
-                        pygame.quit()
-                        # Genstart spillet
-                        python = sys.executable
-                        os.execl(python, python, *sys.argv)
+                        # Ny kamp i samme proces - vindue, mixer og indlæste lyde beholdes
+                        restart_started = time.perf_counter()
+                        new_match()
+                        state = GameState.BATTLE
+                        profiler.restart = time.perf_counter() - restart_started
                     elif event.key == pygame.K_ESCAPE:
                         # Returner til hovedmenu
                         state = GameState.MENU
-                        spiller1.points = 0
-                        spiller2.points = 0
-                        reset_round()
-                        round_num = 1
-                        round_start_time = time.time()
-                        pygame.mixer.music.play(-1)  # Genoptag menu musik
+                        new_match()
+                        assets.play_music()  # Genoptag menu musik
+            profiler.lap("events")
         
         elif state == GameState.PAUSE:
-            # Tegn banen som baggrund for pause skærm
-            bane.draw(window)
-            spiller1.draw(window)
-            spiller2.draw(window)
-            display_points(window, spiller1, spiller2, time_left)
-            
-            # Vis pause skærm
-            font = pygame.font.Font(None, LARGE_FONT)
-            text = font.render("PAUSE", True, BLACK)
-            window.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2 - 50))
+            # Kampen står stille, så billedet tegnes én gang og der ventes på input
+            if still_frame != state:
+                # Tegn banen som baggrund for pause skærm
+                bane.draw(window)
+                profiler.lap("bane")
+                particles.draw(window)
+                spiller1.draw(window)
+                spiller2.draw(window)
+                profiler.lap("fighters")
+                display_points(window, spiller1, spiller2, time_left)
+                
+                # Vis pause skærm (uden mørkt lag)
+                display_pause(window)
+                profiler.lap("hud")
+                still_frame = state
+                events = pygame.event.get()  # Billedet skal vises før der ventes
+            else:
+                redraw = False
+                events = wait_for_events(IDLE_TIMEOUT)
             
-            font = pygame.font.Font(None, SMALL_FONT)
-            text = font.render("Tryk ESC for at fortsætte", True, BLACK)
-            window.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2 + 50))
+            for event in events:
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type in EXPOSE_EVENTS:
+                    still_frame = None  # Vinduet skal tegnes igen
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    state = GameState.BATTLE
+                    sim_clock.reset()  # Tiden i pausen tæller ikke med i kampen
+            profiler.lap("events")
         
-        pygame.display.update()
-        clock.tick(FRAME_RATE)
+        if dirty_frame:
+            renderer.add(profiler.draw(window))
+            renderer.present()
+        elif redraw:
+            profiler.draw(window)
+            pygame.display.update()
+            if renderer is not None:
+                renderer.invalidate()  # Næste dirty-rect billede starter med hele skærmen
+        if profiler.first_frame is None:
+            profiler.first_frame = time.perf_counter() - started
+        assets.poll()  # Menumusikken indlæses efter det første billede
+        profiler.lap("display")
+        if state == GameState.BATTLE:
+            clock.tick(render_rate)  # Simuleringen følger sit eget ur, så billedhastigheden er fri
+        else:
+            clock.tick(MENU_FRAME_RATE if state == GameState.MENU else FRAME_RATE)
+        profiler.lap("wait")
+        profiler.end_frame(state)
     
+    save_recording()
+    if cpu is not None:
+        cpu.close()
+    if profile or profile_csv:
+        print(profiler.summary())
+        print(f"droppede ticks: {sim_clock.dropped}")
+    profiler.close()
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Sumo Slammers")
+    parser.add_argument("--seed", type=int, default=None, help="Seed til kampen (standard er tilfældig)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Mål tiden for hver fase i hvert billede (F3 viser grafen)")
+    parser.add_argument("--profile-csv", default=None, metavar="FIL",
+                        help="Skriv hver frames tider til en CSV fil")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="Tegn og opdater kun de dele af skærmen der ændrer sig under kampen")
+    parser.add_argument("--stage", default="classic", choices=stages.STAGE_NAMES,
+                        help="Banens platforme")
+    parser.add_argument("--render-rate", type=int, default=RENDER_RATE, metavar="FPS",
+                        help=f"Højeste billedhastighed under kampen, 0 for ubegrænset (standard {RENDER_RATE})")
+    args = parser.parse_args()
+    if args.seed is not None and not 0 <= args.seed < simulation.SEED_LIMIT:
+        parser.error(f"--seed skal være mellem 0 og {simulation.SEED_LIMIT - 1}")
+    main(args.seed, args.profile, args.profile_csv, args.dirty_rects, args.stage, args.render_rate)
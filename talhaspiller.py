@@ -4,333 +4,264 @@ import pygame
 from config import *
 import random
 import math
+import simulation
+import textcache
+from particles import ParticlePool
 
-class Spiller:
-    def __init__(self, x, y, color, name):
-        # Grundlæggende spiller attributter
-        self.body = pygame.Rect(x, y, PLAYER_SIZE*2, PLAYER_SIZE*2)
+def read_input(keys, left, right, jump, dash):
+    """
+    Omsætter de trykkede taster til simuleringens input bitfelt.
+    
+    Parametre:
+        keys: Resultatet af pygame.key.get_pressed()
+        left, right, jump, dash: Tasterne for spilleren
+    """
+    bits = 0
+    if keys[left]:
+        bits |= simulation.INPUT_LEFT
+    if keys[right]:
+        bits |= simulation.INPUT_RIGHT
+    if keys[jump]:
+        bits |= simulation.INPUT_JUMP
+    if keys[dash]:
+        bits |= simulation.INPUT_DASH
+    return bits
+
+TRAIL_LENGTH = 3  # Antal skygger i dash trail
+COOLDOWN_RADIUS = 15
+COOLDOWN_STEPS = 64  # Antal færdigtegnede trin i nedkølings-ringen
+
+class FighterSprites:
+    """
+    Færdigtegnede sprites for en spillerfarve: krop (med retningsindikator),
+    dash trail skygger og nedkølings-ringen i COOLDOWN_STEPS trin. Alt
+    tegnes én gang, så Spiller.draw kun består af blits.
+    """
+    def __init__(self, color, width, height):
+        """
+        Parametre:
+            color: Spillerens farve
+            width, height: Kroppens størrelse
+        """
+        self.color = color
+        rgb = color[:3]
+        
+        # Krop for hver retning: body[False] vender mod venstre, body[True] mod højre
+        self.body = []
+        for facing_right in (False, True):
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.ellipse(surface, color, (0, 0, width, height))
+            direction_x = width // 2 + (10 if facing_right else -10)
+            pygame.draw.circle(surface, BLACK, (direction_x, height // 2), 5)
+            self.body.append(_finish(surface))
+        
+        # Skygger til dash trail der fader ud
+        self.trail = []
+        for i in range(TRAIL_LENGTH):
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.ellipse(surface, (*rgb, 100 - i * 30), (0, 0, width, height))
+            self.trail.append(_finish(surface))
+        
+        # Klar indikator: baggrundscirkel med fyldt cirkel i spillerens farve
+        surface = self._ring_background()
+        pygame.draw.circle(surface, color, (COOLDOWN_RADIUS, COOLDOWN_RADIUS), COOLDOWN_RADIUS - 2)
+        self.ready = _finish(surface)
+        
+        self.cooldown = [None] * COOLDOWN_STEPS  # Tegnes første gang et trin bruges
+
+    def _ring_background(self):
+        size = COOLDOWN_RADIUS * 2 + 1
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(surface, (50, 50, 50), (COOLDOWN_RADIUS, COOLDOWN_RADIUS), COOLDOWN_RADIUS)
+        return surface
+
+    def cooldown_frame(self, progress):
+        """
+        Returnerer nedkølings-ringen for det nærmeste trin.
+        
+        Parametre:
+            progress: Hvor langt nedkølingen er (0 til 1)
+        """
+        step = int(progress * (COOLDOWN_STEPS - 1) + 0.5)
+        step = max(0, min(COOLDOWN_STEPS - 1, step))
+        frame = self.cooldown[step]
+        if frame is None:
+            frame = self._ring_background()
+            diameter = COOLDOWN_RADIUS * 2
+            angle = step / (COOLDOWN_STEPS - 1) * 360
+            
+            # Udfyldt arc: en halvgennemsigtig cirkel maskeret af en arc
+            arc = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+            pygame.draw.circle(arc, (*self.color[:3], 128),
+                               (COOLDOWN_RADIUS, COOLDOWN_RADIUS), COOLDOWN_RADIUS)
+            mask = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+            pygame.draw.arc(mask, (255, 255, 255, 255), (0, 0, diameter, diameter),
+                            0, math.radians(angle), COOLDOWN_RADIUS)
+            arc.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+            frame.blit(arc, (0, 0))
+            frame = _finish(frame)
+            self.cooldown[step] = frame
+        return frame
+
+def _finish(surface):
+    """Konverterer til skærmens pixelformat hvis der er et vindue"""
+    if pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
+_sprites = {}
+
+def get_sprites(color, width, height):
+    """
+    Returnerer de delte sprites for en spillerfarve og størrelse.
+    
+    Parametre:
+        color: Spillerens farve
+        width, height: Kroppens størrelse
+    """
+    key = (color, width, height)
+    sprites = _sprites.get(key)
+    if sprites is None:
+        sprites = FighterSprites(color, width, height)
+        _sprites[key] = sprites
+    return sprites
+
+def clear_sprites():
+    """Tømmer sprite cachen (f.eks. efter pygame.quit)"""
+    _sprites.clear()
+
+class Spiller(simulation.Fighter):
+    """
+    Spiller med grafik og tastatur. Selve spillereglerne ligger i
+    simulation.py, så de også kan køres uden pygame.
+    """
+    __slots__ = ("color", "name", "owns_particles", "particles", "rng")
+
+    def __init__(self, x, y, color, name, rng=None, particles=None):
+        # Grundlæggende spiller attributter (position, hastighed, skade osv.)
+        simulation.Fighter.__init__(self, x, y)
         self.color = color
         self.name = name
         
-        # Bevægelses variabler
-        self.speed_x = 0  # Hastighed på x-aksen
-        self.speed_y = 0  # Hastighed på y-aksen
-        self.facing_right = True  # Retningsindikator
-        self.on_ground = False  # Markør for jordkontakt
-        self.air_dash = MAX_AIR_DASH  # Antal luftdash tilgængelige
-        
-        # Kamp statistikker
-        self.damage = 0  # Akkumuleret skade
-        self.points = 0  # Pointtæller
-        self.combo = 0  # Combo tæller
-        self.last_hit_time = 0  # Tidspunkt for sidste træffer
-        
-        # Status effekter
-        self.stunned = False  # Lammelsestilstand
-        self.stun_time = 0  # Varighed af lammelse
-        self.is_dead = False  # Livstilstand
-        self.death_timer = 0  # Nedtælling efter død
-        self.recovery_frames = 0  # Genopretningsperiode
-        self.invincible = False  # Udødelighed
-        self.invincible_timer = 0  # Varighed af udødelighed
-        
-        # Dash mekanik
-        self.can_dash = True  # Dash tilgængelighed
-        self.dash_timer = 0  # Dash varighed/nedkøling
-        self.is_dashing = False  # Dash tilstand
-        self.dash_direction = 1  # Dash retning
-        self.is_attacking = False  # Angrebstilstand
-        
-        # Combo system
-        self.combo_timer = 0  # Øg combo hvis man bliver ramt flere gange hurtigt
-        self.combo_count = 0  # Tæller antal gange man har været i combo
-        self.last_attacker = None  # Gemmes hvem der remt sidste gange
-        
-        # Partikel system
-        self.particles = []  # Liste til partikler
+        # Partikel system - en delt pulje opdateres og tegnes af ejeren (spilløkken)
+        self.owns_particles = particles is None
+        self.particles = ParticlePool() if particles is None else particles
+        self.rng = rng if rng is not None else random.Random()  # Kampens seedede tilfældighedsgenerator
+
+    @property
+    def body(self):
+        """Spillerens krop som pygame.Rect (kun til tegning)"""
+        return pygame.Rect(self.x, self.y, self.w, self.h)
     
     def move(self, left, right, jump, dash):
-        # Tjek for død tilstand
-        if self.is_dead:
-            return
-            
-        # Håndter lammelsestilstand
-        if self.stunned:
-            self.stun_time -= 1
-            if self.stun_time <= 0:
-                self.stunned = False
-            return
-            
-        # Hent tastatur input
+        # Hent tastatur input og omsæt det til bitfelt
         keys = pygame.key.get_pressed()
-        
-        # Normal bevægelse
-        if not self.is_dashing:
-            # Nulstil vandret hastighed hvis ingen bevægelsestaster er trykket
-            if not keys[left] and not keys[right]:
-                self.speed_x = 0
-            elif keys[left]:
-                self.speed_x = -MOVEMENT_SPEED
-                self.facing_right = False
-                self.dash_direction = -1
-            elif keys[right]:
-                self.speed_x = MOVEMENT_SPEED
-                self.facing_right = True
-                self.dash_direction = 1
-                
-            # Hop mekanik
-            if keys[jump] and self.on_ground:   # Hvis hoppetasten trykkes og spilleren er på jorden:
-                self.speed_y = JUMP_FORCE   # Giv spilleren opadgående kraft (negativ værdi)
-                self.on_ground = False     # Spilleren er nu i luften
-                self.add_jump_effect()     # Ekstra funktion som spiller hop-effekt
-        
-        # Opdater dash nedkøling
-        if not self.can_dash:
-            self.dash_timer -= 1
-            if self.dash_timer <= 0:
-                self.can_dash = True
-                self.dash_timer = 0
-        
-        # Dash system
-        if keys[dash] and self.can_dash and not self.is_dashing:
-            if self.on_ground or self.air_dash > 0:
-                self.start_dash()
-                if not self.on_ground:
-                    self.air_dash -= 1
-        
-        # Dash bevægelse
-        if self.is_dashing:
-            self.speed_x = DASH_FORCE * self.dash_direction
-            self.dash_timer -= 1
-            if self.dash_timer <= 0:
-                self.stop_dash()
-        
-        # Luftmodstand
-        if not self.on_ground:
-            self.speed_x *= AIR_RESISTANCE
+        simulation.move(self, read_input(keys, left, right, jump, dash))
+        self.spawn_effects()
     
     def start_dash(self):
         """Start a new dash"""
-        self.is_dashing = True
-        self.dash_timer = DASH_LENGTH
-        self.can_dash = False
-        self.is_attacking = True
+        simulation.start_dash(self)
     
     def stop_dash(self):
         """Stop the current dash"""
-        self.is_dashing = False
-        self.is_attacking = False
-        # Starter nedkølingstiden for dash
-        self.dash_timer = DASH_COOLDOWN
-        self.can_dash = False
+        simulation.stop_dash(self)
     
     def update(self, platform):
-        # Hvis spilleren allerede er død, fortsæt med at være død og ikke opdater position
-        if self.is_dead:
-            self.speed_y += GRAVITY  # Tyngdekraft tilføjes til lodret hastighed
-            self.body.y += self.speed_y # Spilleren rykkes nedad eller opad afhængig af hastighed
-            return True  # For at holde spilleren død
-        
-        # Anvend tyngdekraft
-        self.speed_y += GRAVITY
-        
-        # Opdater position
-        self.body.x += self.speed_x
-        self.body.y += self.speed_y
-        
-        # Kun begrænse horisontal bevægelse til verdenens grænser
-        if self.body.x < WORLD_LEFT_BOUNDARY:
-            self.body.x = WORLD_LEFT_BOUNDARY
-            self.speed_x = 0
-        elif self.body.x > WORLD_RIGHT_BOUNDARY - self.body.width:
-            self.body.x = WORLD_RIGHT_BOUNDARY - self.body.width
-            self.speed_x = 0
-        
-        # Platform kollision
-        if self.body.bottom > platform.y and self.body.top < platform.y:     # Hvis spillerens bund er over platformen og toppen er under platformen:
-            if platform.x < self.body.centerx < platform.x + platform.width:   # Hvis spillerens midte er mellem platformens venstre og højre kant:
-                self.body.bottom = platform.y   # Juster position så spilleren står på platform
-                self.speed_y = 0                # Sæt lodret hastighed til 0
-                self.on_ground = True          # Spilleren er nu på jorden
-                self.air_dash = MAX_AIR_DASH    # Reset luftdash
-        else:
-            self.on_ground = False             # Spilleren er ikke på jorden
+        # Hvis spilleren allerede er død, fortsæt med at være død og ikke opdater partikler
+        if simulation.update(self, platform):
+            return True
         
-        # Opdater tæller (recovery frames)
-        if self.recovery_frames > 0:     # Hvis recovery frames er større end 0:
-            self.recovery_frames -= 1    # Reducer recovery frames
-        
-        if self.invincible:
-            self.invincible_timer -= 1
-            if self.invincible_timer <= 0:
-                self.invincible = False
-        
-        # Hvis der stadig er tid tilbage på comboen, reducer den
-        if self.combo_timer > 0:     # Hvis timeren er større end 0:
-            self.combo_timer -= 1    # Reducer timeren
-        else:                       # Ellers:
-            self.combo_count = 0     # Sæt combo tæller til 0, hvis timeren er udløbet
-        
-        # Opdater partikler
-        self.update_particles()
+        # Opdater partikler (en delt pulje opdateres af spilløkken)
+        if self.owns_particles:
+            self.update_particles()
         
         return False
     
     def apply_knockback(self, direction, force):     # Hvis spilleren bliver ramt:
-        if self.invincible:                          # Spilleren er midlertidigt immun
-            return  
-            
-        # Beregn tilbageslag med skade skalering
-        knockback_bonus = 1 + (self.damage / 75)  # Hurtigere skalering
-        total_force = min(force * knockback_bonus, MAX_KNOCKBACK)   
-        
-        # Anvend tilbageslag med fokus på horisontal bevægelse
-        self.speed_x = direction[0] * total_force * 2.0  # Horisontal bevægelse
-        self.speed_y = direction[1] * total_force - 3      # Lodret bevægelse
-        
-        # Stun baseret på skade
-        self.stunned = True
-        self.stun_time = int(8 * knockback_bonus)
-        
-        # Giver recovery frames
-        self.recovery_frames = RECOVERY_FRAMES  # Spilleren får et lille vindue hvor de ikke kan rammes igen
-        
-        # Tilføj hit effekt
-        self.add_hit_effect()
+        simulation.apply_knockback(self, direction, force)
+        self.spawn_effects()
+
+    def spawn_effects(self):
+        """Tilføj partikler for de hændelser simuleringen har meldt"""
+        if self.events & simulation.EVENT_JUMP:
+            self.add_jump_effect()
+        if self.events & simulation.EVENT_HIT:
+            self.add_hit_effect()
+        self.events = 0
     
     def add_hit_effect(self):
         # Tilføj partikler ved hit
-        for _ in range(5):
-            self.particles.append({
-                'pos': [self.body.centerx, self.body.centery],
-                'vel': [random.uniform(-5, 5), random.uniform(-5, 5)],
-                'timer': 10,
-                'color': self.color
-            })
+        self.particles.emit(self.centerx, self.centery, 5, (-5, 5), (-5, 5), 10, self.color, self.rng)
     
     def add_jump_effect(self):
         # Tilføj hop effekt
-        for _ in range(3):
-            self.particles.append({
-                'pos': [self.body.centerx, self.body.bottom],
-                'vel': [random.uniform(-2, 2), random.uniform(0, 2)],
-                'timer': 5,
-                'color': GRAY
-            })
+        self.particles.emit(self.centerx, self.y + self.h, 3, (-2, 2), (0, 2), 5, GRAY, self.rng)
     
     def update_particles(self):
-        # Opdater alle partikler
-        for particle in self.particles[:]:
-            particle['pos'][0] += particle['vel'][0]
-            particle['pos'][1] += particle['vel'][1]
-            particle['timer'] -= 1
-            if particle['timer'] <= 0:
-                self.particles.remove(particle)
+        # Opdater alle partikler (vektoriseret i puljen)
+        self.particles.update()
     
-    def draw(self, window):
+    def draw(self, window, position=None):
+        """
+        Tegner spilleren med dash trail, skade tekst og nedkølings-ring.
+        
+        Parametre:
+            window: Overfladen der tegnes på
+            position: (x, y) kroppen tegnes ved (standard er simuleringens
+                      position, spilløkken giver en interpoleret position)
+        
+        Returnerer rektanglet der er tegnet på (bruges af dirty-rect tegningen).
+        """
+        sprites = get_sprites(self.color, self.w, self.h)
+        x, y = (self.x, self.y) if position is None else position
+        centerx = x + self.w // 2
+
+        # Området der tegnes på - starter med kroppen
+        dirty = pygame.Rect(x, y, self.w, self.h)
+
         # Tegn dash effekt når man dasher
         if self.is_dashing:
-            # Tegn motion blur/dash trail
-            for i in range(3):
-                alpha = 100 - i * 30  # Fade out trail
-                trail_offset = -self.dash_direction * i * 20
-                trail_rect = self.body.copy()
-                trail_rect.x += trail_offset
-                
-                # Opret en overflade for den semi-transparente trail
-                trail_surface = pygame.Surface((trail_rect.width, trail_rect.height), pygame.SRCALPHA)
-                trail_color = (*self.color[:3], alpha)
-                pygame.draw.ellipse(trail_surface, trail_color, 
-                                  (0, 0, trail_rect.width, trail_rect.height))
-                window.blit(trail_surface, trail_rect)
+            # Tegn motion blur/dash trail (den første skygge ligger under kroppen og ses ikke)
+            for i in range(1, TRAIL_LENGTH):
+                dirty.union_ip(window.blit(sprites.trail[i], (x - self.dash_direction * i * 20, y)))
 
-        # Tegn partikler
-        for particle in self.particles:
-            alpha = int(255 * (particle['timer'] / 10))
-            color = (*particle['color'][:3], alpha)
-            pygame.draw.circle(window, color, 
-                             [int(particle['pos'][0]), int(particle['pos'][1])], 3)
-        
-        # Tegn spiller
-        pygame.draw.ellipse(window, self.color, self.body)
+        # Tegn partikler (en delt pulje tegnes af spilløkken)
+        if self.owns_particles:
+            particles = self.particles.draw(window)
+            if particles is not None:
+                dirty.union_ip(particles)
         
-        # Tegn retningsindikator
-        direction_x = self.body.centerx + (10 if self.facing_right else -10)
-        pygame.draw.circle(window, BLACK, (direction_x, self.body.centery), 5)
+        # Tegn spiller med retningsindikator
+        window.blit(sprites.body[self.facing_right], (x, y))
         
         # Tegn skade tekst
         damage_text = f"{int(self.damage)}%"
         if self.combo_count > 1:
             damage_text += f" x{self.combo_count}"
         
-        # Tilføj outline til tekst for bedre synlighed
-        font = pygame.font.Font(None, MEDIUM_FONT)
-        text = font.render(damage_text, True, BLACK)
-        text_outline = font.render(damage_text, True, WHITE)
-        text_rect = text.get_rect(center=(self.body.centerx, self.body.top - 30))
-        
-        # Tegn outline først og tekst derefter
-        for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1)]:
-            window.blit(text_outline, (text_rect.x + dx, text_rect.y + dy))
-        window.blit(text, text_rect)
+        # Tegn teksten med outline fra det delte tegnatlas (ingen rendering per frame)
+        dirty.union_ip(textcache.get_atlas(MEDIUM_FONT, BLACK, WHITE).draw(
+            window, damage_text, center=(centerx, y - 30)))
         
-        # Tegn dash nedkøling indikator
-        cooldown_radius = 15
-        cooldown_y = self.body.top - 60  # Position over skade tekst
-        
-        # Tegn baggrundscirkel
-        pygame.draw.circle(window, (50, 50, 50), (self.body.centerx, cooldown_y), cooldown_radius)
-        
-        if not self.can_dash:
-            # Beregn cooldown progress (0 til 1)
-            progress = self.dash_timer / DASH_COOLDOWN
-            
-            # Tegn arc til at vise cooldown (fuld ud som cooldown fortsætter)
-            angle = progress * 360  # Konverter progress til grader
-            
-            # Tegn udfyldt arc
-            surface = pygame.Surface((cooldown_radius * 2, cooldown_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surface, (*self.color[:3], 128), 
-                             (cooldown_radius, cooldown_radius), cooldown_radius)
-            
-            # Opret masken for arc
-            mask = pygame.Surface((cooldown_radius * 2, cooldown_radius * 2), pygame.SRCALPHA)
-            pygame.draw.arc(mask, (255, 255, 255, 255),
-                          (0, 0, cooldown_radius * 2, cooldown_radius * 2),
-                          0, math.radians(angle), cooldown_radius)
-            
-            # Anvend masken til surfacen
-            surface.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-            window.blit(surface, 
-                       (self.body.centerx - cooldown_radius, 
-                        cooldown_y - cooldown_radius))
+        # Tegn dash nedkøling indikator over skade teksten
+        if self.can_dash:
+            ring = sprites.ready
         else:
-            # Tegn r indikator
-            pygame.draw.circle(window, self.color, 
-                             (self.body.centerx, cooldown_y), cooldown_radius - 2)
+            ring = sprites.cooldown_frame(self.dash_timer / self.rules.DASH_COOLDOWN)
+        dirty.union_ip(window.blit(ring, (centerx - COOLDOWN_RADIUS, y - 60 - COOLDOWN_RADIUS)))
+        return dirty
     
     def get_center(self):
-        return (self.body.centerx, self.body.centery)
+        return (self.centerx, self.centery)
     
     def has_fallen(self):
         """Tjek om spilleren er faldet i void"""
         # Betragt faldet hvis spilleren er langt under platformen
-        return self.body.top > HEIGHT - (HEIGHT * 0.2)  # Øget void område
+        return self.y > HEIGHT - (HEIGHT * 0.2)  # Øget void område
     
     def start_position(self):
         """Sæt spillerens position til start"""
-        self.is_dead = False
-        self.death_timer = 0
-        self.damage = 0
-        self.combo_count = 0 #
-        self.combo_timer = 0
-        self.last_attacker = None
-        self.speed_x = 0
-        self.speed_y = 0
-        self.stunned = False
-        self.stun_time = 0
-        self.is_dashing = False
-        self.can_dash = True
-        self.dash_timer = 0
-        self.air_dash = MAX_AIR_DASH
-        self.particles = [] 
\ No newline at end of file
+        simulation.start_position(self)
+        if self.owns_particles:
+            self.particles.clear()
@@ -0,0 +1,192 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Fælles skrifttyper og cache til tekst.
+
+- get_font(size) opretter hver skrifttype én gang.
+- render_text(...) husker færdigt renderede tekster i en LRU cache med
+  nøglen (tekst, størrelse, farve, outline).
+- get_atlas(...) giver et tegnatlas til tal der skifter hele tiden (skade
+  og ur), så de bygges af færdige tegn i stedet for at blive renderet
+  forfra hver frame.
+"""
+from collections import OrderedDict
+
+import pygame
+
+TEXT_CACHE_SIZE = 256  # Antal tekster der huskes før de ældste smides ud
+ATLAS_CHARS = "0123456789%:x -"  # Tegn der ligger i atlasset
+
+# Diagonale forskydninger til outline (samme som Spiller.draw brugte)
+OUTLINE_OFFSETS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+_fonts = {}
+_texts = OrderedDict()
+_atlases = {}
+
+
+def get_font(size, path=None):
+    """
+    Returnerer en delt skrifttype.
+
+    Parametre:
+        size: Skriftstørrelse
+        path: Sti til en font fil (None for pygames standard font)
+    """
+    key = (path, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(path, size)
+        _fonts[key] = font
+    return font
+
+
+def _with_outline(text, outline):
+    """
+    Samler tekst og outline i én overflade, 1 pixel større i hver side.
+    """
+    width, height = text.get_size()
+    surface = pygame.Surface((width + 2, height + 2), pygame.SRCALPHA)
+    for dx, dy in OUTLINE_OFFSETS:
+        surface.blit(outline, (1 + dx, 1 + dy))
+    surface.blit(text, (1, 1))
+    return surface
+
+
+def render_text(text, size, color, outline=None):
+    """
+    Returnerer en renderet tekst fra cachen (renderer den kun første gang).
+
+    Parametre:
+        text: Teksten
+        size: Skriftstørrelse
+        color: Tekstens farve
+        outline: Farve på outline (None for ingen). Med outline er overfladen
+                 1 pixel større i hver side end teksten.
+    """
+    key = (text, size, color, outline)
+    surface = _texts.get(key)
+    if surface is not None:
+        _texts.move_to_end(key)
+        return surface
+
+    font = get_font(size)
+    surface = font.render(text, True, color)
+    if outline is not None:
+        surface = _with_outline(surface, font.render(text, True, outline))
+    _texts[key] = surface
+    if len(_texts) > TEXT_CACHE_SIZE:
+        _texts.popitem(last=False)
+    return surface
+
+
+class TextAtlas:
+    """
+    Færdigrenderede tegn i én overflade. Tekster der kun består af
+    atlassets tegn tegnes som en række blits uden at rendere noget.
+    """
+
+    def __init__(self, size, color, outline=None, chars=ATLAS_CHARS):
+        """
+        Parametre:
+            size: Skriftstørrelse
+            color: Tekstens farve
+            outline: Farve på outline (None for ingen)
+            chars: Tegn der skal ligge i atlasset
+        """
+        font = get_font(size)
+        self.size = size
+        self.color = color
+        self.outline = outline
+        self.height = font.get_height()
+        glyphs = [font.render(char, True, color) for char in chars]
+        width = sum(glyph.get_width() for glyph in glyphs)
+
+        # Alle tegn lægges ved siden af hinanden i én overflade
+        self.surface = pygame.Surface((max(width, 1), self.height), pygame.SRCALPHA)
+        self.outline_surface = None
+        if outline is not None:
+            self.outline_surface = pygame.Surface((max(width, 1), self.height), pygame.SRCALPHA)
+        self.areas = {}
+        x = 0
+        for char, glyph in zip(chars, glyphs):
+            self.surface.blit(glyph, (x, 0))
+            if outline is not None:
+                self.outline_surface.blit(font.render(char, True, outline), (x, 0))
+            self.areas[char] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+
+    def width(self, text):
+        """Bredden af teksten i pixels"""
+        return sum(self.areas[char].width for char in text)
+
+    def draw(self, window, text, center=None, topleft=None):
+        """
+        Tegner teksten. Tegn der ikke er i atlasset tegnes via render_text.
+
+        Parametre:
+            window: Overfladen der tegnes på
+            text: Teksten
+            center: Tekstens centrum (brug enten center eller topleft)
+            topleft: Tekstens øverste venstre hjørne
+
+        Returnerer rektanglet teksten dækker (inklusive outline).
+        """
+        areas = self.areas
+        if any(char not in areas for char in text):
+            surface = render_text(text, self.size, self.color, self.outline)
+            pad = 1 if self.outline is not None else 0
+            rect = surface.get_rect()
+            if center is not None:
+                rect.center = center
+            else:
+                rect.topleft = (topleft[0] - pad, topleft[1] - pad)
+            window.blit(surface, rect)
+            return rect
+
+        width = self.width(text)
+        if center is not None:
+            x = center[0] - width // 2
+            y = center[1] - self.height // 2
+        else:
+            x, y = topleft
+
+        # Outline først for hele teksten, derefter selve teksten ovenpå
+        if self.outline_surface is not None:
+            for dx, dy in OUTLINE_OFFSETS:
+                cursor = x + dx
+                for char in text:
+                    area = areas[char]
+                    window.blit(self.outline_surface, (cursor, y + dy), area)
+                    cursor += area.width
+        cursor = x
+        for char in text:
+            area = areas[char]
+            window.blit(self.surface, (cursor, y), area)
+            cursor += area.width
+
+        pad = 1 if self.outline is not None else 0
+        return pygame.Rect(x - pad, y - pad, width + 2 * pad, self.height + 2 * pad)
+
+
+def get_atlas(size, color, outline=None):
+    """
+    Returnerer et delt tegnatlas for størrelse, farve og outline.
+
+    Parametre:
+        size: Skriftstørrelse
+        color: Tekstens farve
+        outline: Farve på outline (None for ingen)
+    """
+    key = (size, color, outline)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = TextAtlas(size, color, outline)
+        _atlases[key] = atlas
+    return atlas
+
+
+def clear():
+    """Tømmer alle caches (f.eks. efter pygame.quit)"""
+    _fonts.clear()
+    _texts.clear()
+    _atlases.clear()
@@ -0,0 +1,281 @@
+# Af Talha og Azad (fælles kode stumper)
+"""
+Turneringer mellem bots uden grafik.
+
+Hver serie spilles headless med simulation.py (samme regler som
+talhamain.main: først til MAX_POINTS, timeout afgøres på mindst skade og
+den der falder først taber runden). Serierne fordeles på en procespulje
+med én proces per kerne, og resultaterne samles i tabeller efterhånden
+som de kommer tilbage.
+
+Eksempler:
+    python tournament.py --bots rusher keeper jumper random --games 20
+    python tournament.py --format swiss --rounds 4 --games 10
+"""
+import argparse
+import os
+import time
+from multiprocessing import Pool
+
+import simulation
+from bots import BOTS, make_bot
+
+
+def play_match(bot_a, bot_b, seed, rules=None, max_rounds=None):
+    """
+    Spiller én kamp mellem to bots.
+
+    Parametre:
+        bot_a: Navn på botten i venstre side (spiller 1)
+        bot_b: Navn på botten i højre side (spiller 2)
+        seed: Seed til bottenes tilfældige valg
+        rules: simulation.Rules for kampen (None for config.py's værdier)
+        max_rounds: Kampen stoppes uafgjort efter så mange runder (None for ingen grænse)
+
+    Returnerer (winner, rounds), hvor winner er 0, 1 eller -1 ved uafgjort og
+    rounds er en liste af (længde i frames, udfald, vinder, skade 1, skade 2).
+    """
+    state = simulation.MatchState(rules=rules)
+    controller_a = make_bot(bot_a, seed)
+    controller_b = make_bot(bot_b, seed + 1)
+    rounds = []
+    while not state.game_over:
+        result = simulation.step(state, (controller_a(state, 0), controller_b(state, 1)))
+        if result != simulation.ROUND_CONTINUES:
+            f1, f2 = state.fighters
+            rounds.append((state.tick - state.round_start_tick, result,
+                           state.round_winner, f1.damage, f2.damage))
+            if max_rounds is not None and len(rounds) >= max_rounds and not state.game_over:
+                return -1, rounds
+    return state.winner, rounds
+
+
+def play_series(job):
+    """
+    Spiller en serie kampe mellem to bots med skiftende sider.
+    Køres i en arbejdsproces.
+
+    Parametre:
+        job: (bot_a, bot_b, seed, games)
+
+    Returnerer (bot_a, bot_b, games), hvor games er en liste af
+    (vinder navn eller None, runder set fra bot_a og bot_b).
+    """
+    bot_a, bot_b, seed, games = job
+    results = []
+    for game in range(games):
+        swapped = game % 2 == 1
+        left, right = (bot_b, bot_a) if swapped else (bot_a, bot_b)
+        winner, rounds = play_match(left, right, seed + game * 2)
+        names = (left, right)
+        winner_name = names[winner] if winner in (0, 1) else None
+        # Omregn runderne så de altid ses fra bot_a's side
+        normalized = []
+        for length, outcome, round_winner, damage_left, damage_right in rounds:
+            if round_winner in (0, 1):
+                round_winner_name = names[round_winner]
+            else:
+                round_winner_name = None
+            damage_a, damage_b = (damage_right, damage_left) if swapped else (damage_left, damage_right)
+            normalized.append((length, outcome, round_winner_name, damage_a, damage_b))
+        results.append((winner_name, normalized))
+    return bot_a, bot_b, results
+
+
+class BotStats:
+    """Samlet statistik for én bot"""
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0
+        self.score = 0.0  # Swiss point (serie sejr = 1, uafgjort = 0.5)
+        self.rounds = 0
+        self.round_ticks = 0
+        self.ring_outs = 0
+        self.timeouts = 0
+        self.damage_taken = 0.0
+        self.damage_dealt = 0.0
+        self.opponents = {}  # Modstander -> [sejre, kampe]
+
+    def win_rate(self):
+        return self.wins / self.games if self.games else 0.0
+
+
+class Tournament:
+    """Holder styr på resultaterne og printer tabellerne"""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.stats = {name: BotStats() for name in self.names}
+        self.played = set()  # Par der allerede har mødt hinanden (til Swiss)
+
+    def add_series(self, bot_a, bot_b, games):
+        """
+        Lægger resultatet af en serie til statistikken.
+
+        Parametre:
+            bot_a, bot_b: Bottenes navne
+            games: Resultatet fra play_series
+        """
+        self.played.add(frozenset((bot_a, bot_b)))
+        a, b = self.stats[bot_a], self.stats[bot_b]
+        series = {bot_a: 0, bot_b: 0}
+        for winner, rounds in games:
+            for stats, name in ((a, bot_a), (b, bot_b)):
+                stats.games += 1
+                if winner is None:
+                    stats.draws += 1
+                elif winner == name:
+                    stats.wins += 1
+                else:
+                    stats.losses += 1
+            if winner is not None:
+                series[winner] += 1
+            a.opponents.setdefault(bot_b, [0, 0])
+            b.opponents.setdefault(bot_a, [0, 0])
+            a.opponents[bot_b][1] += 1
+            b.opponents[bot_a][1] += 1
+            if winner == bot_a:
+                a.opponents[bot_b][0] += 1
+            elif winner == bot_b:
+                b.opponents[bot_a][0] += 1
+
+            for length, outcome, round_winner, damage_a, damage_b in rounds:
+                for stats, taken, dealt in ((a, damage_a, damage_b), (b, damage_b, damage_a)):
+                    stats.rounds += 1
+                    stats.round_ticks += length
+                    stats.damage_taken += taken
+                    stats.damage_dealt += dealt
+                    if outcome == simulation.ROUND_TIMEOUT:
+                        stats.timeouts += 1
+                    else:
+                        stats.ring_outs += 1
+
+        if series[bot_a] > series[bot_b]:
+            a.score += 1
+        elif series[bot_b] > series[bot_a]:
+            b.score += 1
+        else:
+            a.score += 0.5
+            b.score += 0.5
+        return series
+
+    def print_tables(self, swiss=False):
+        """Printer sejrsrate-, runde- og skadetabellerne"""
+        order = sorted(self.names, key=lambda name: (-self.stats[name].score if swiss else 0,
+                                                     -self.stats[name].win_rate()))
+        width = max(len(name) for name in self.names) + 2
+
+        print()
+        header = f"{'Bot':<{width}}{'Kampe':>7}{'Sejre':>7}{'Tab':>7}{'Uafgj.':>8}{'Sejrsrate':>11}"
+        if swiss:
+            header += f"{'Point':>8}"
+        print(header)
+        for name in order:
+            s = self.stats[name]
+            line = f"{name:<{width}}{s.games:>7}{s.wins:>7}{s.losses:>7}{s.draws:>8}{s.win_rate():>10.1%} "
+            if swiss:
+                line += f"{s.score:>7.1f}"
+            print(line)
+
+        print()
+        print(f"{'Bot':<{width}}{'Runder':>8}{'Gns. længde (s)':>17}{'Ring-out':>10}{'Timeout':>9}")
+        for name in order:
+            s = self.stats[name]
+            mean_length = s.round_ticks / s.rounds / simulation.FRAME_RATE if s.rounds else 0.0
+            ring_out = s.ring_outs / s.rounds if s.rounds else 0.0
+            timeout = s.timeouts / s.rounds if s.rounds else 0.0
+            print(f"{name:<{width}}{s.rounds:>8}{mean_length:>17.1f}{ring_out:>9.1%} {timeout:>8.1%}")
+
+        print()
+        print(f"{'Bot':<{width}}{'Gns. skade taget':>18}{'Gns. skade givet':>18}")
+        for name in order:
+            s = self.stats[name]
+            taken = s.damage_taken / s.rounds if s.rounds else 0.0
+            dealt = s.damage_dealt / s.rounds if s.rounds else 0.0
+            print(f"{name:<{width}}{taken:>17.1f}%{dealt:>17.1f}%")
+
+        # Sejrsrate mod hver modstander (række mod kolonne)
+        print()
+        print(f"{'':<{width}}" + "".join(f"{name[:8]:>9}" for name in order))
+        for name in order:
+            cells = []
+            for other in order:
+                record = self.stats[name].opponents.get(other)
+                cells.append(f"{record[0] / record[1]:>9.0%}" if record else f"{'-':>9}")
+            print(f"{name:<{width}}" + "".join(cells))
+
+
+def round_robin_jobs(names, games, seed):
+    """Alle mod alle - én serie per par"""
+    jobs = []
+    for i, bot_a in enumerate(names):
+        for bot_b in names[i + 1:]:
+            jobs.append((bot_a, bot_b, seed + len(jobs) * 10007, games))
+    return jobs
+
+
+def swiss_pairings(tournament, round_index, games, seed):
+    """
+    Parrer bots med samme point, og undgår omkampe hvis det er muligt.
+    Ved et ulige antal får den lavest placerede en bye og et point.
+    """
+    order = sorted(tournament.names, key=lambda name: (-tournament.stats[name].score,
+                                                       -tournament.stats[name].win_rate(), name))
+    jobs = []
+    if len(order) % 2 == 1:
+        bye = order.pop()
+        tournament.stats[bye].score += 1
+        print(f"  {bye} har bye")
+    while order:
+        bot_a = order.pop(0)
+        partner = next((other for other in order
+                        if frozenset((bot_a, other)) not in tournament.played), order[0])
+        order.remove(partner)
+        jobs.append((bot_a, partner, seed + (round_index * 1000 + len(jobs)) * 10007, games))
+    return jobs
+
+
+def run_jobs(pool, tournament, jobs):
+    """Kører serierne i puljen og lægger resultaterne til efterhånden som de bliver færdige"""
+    for bot_a, bot_b, games in pool.imap_unordered(play_series, jobs):
+        series = tournament.add_series(bot_a, bot_b, games)
+        print(f"  {bot_a} {series[bot_a]} - {series[bot_b]} {bot_b}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bot-mod-bot turnering uden grafik")
+    parser.add_argument("--bots", nargs="+", default=list(BOTS), choices=list(BOTS),
+                        help="Bots der deltager")
+    parser.add_argument("--format", choices=("roundrobin", "swiss"), default="roundrobin",
+                        help="Turneringsformat")
+    parser.add_argument("--games", type=int, default=10, help="Kampe per serie")
+    parser.add_argument("--rounds", type=int, default=3, help="Antal Swiss runder")
+    parser.add_argument("--seed", type=int, default=1, help="Seed til bottenes valg")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Antal arbejdsprocesser (standard er én per kerne)")
+    args = parser.parse_args()
+
+    names = list(dict.fromkeys(args.bots))
+    if len(names) < 2:
+        parser.error("der skal være mindst to forskellige bots")
+
+    tournament = Tournament(names)
+    start = time.perf_counter()
+    with Pool(processes=args.workers) as pool:
+        if args.format == "roundrobin":
+            run_jobs(pool, tournament, round_robin_jobs(names, args.games, args.seed))
+        else:
+            for round_index in range(args.rounds):
+                print(f"Runde {round_index + 1}")
+                run_jobs(pool, tournament, swiss_pairings(tournament, round_index, args.games, args.seed))
+    elapsed = time.perf_counter() - start
+
+    tournament.print_tables(swiss=args.format == "swiss")
+    print(f"\nFærdig på {elapsed:.1f} sekunder med {args.workers} processer")
+
+
+if __name__ == "__main__":
+    main()